@@ -0,0 +1,8 @@
+"""
+Offline benchmarks for the OnTask plugin.
+
+The benchmarks run against the test settings, so they do not need an Open edX
+installation. Run them from the repository root, e.g.:
+
+    python -m benchmarks.edxapp_wrapper_overhead
+"""
@@ -0,0 +1,193 @@
+"""
+Benchmark of the data summaries over a synthetic course.
+
+It serves a `benchmarks.synthetic_course.SyntheticCourse` of the given size
+through the edxapp_wrapper backend settings, and reports, for the enrollment
+snapshot, the course outline and each data summary, the best time of the
+repeats, the number of backend queries and the peak Python memory measured
+with `tracemalloc`. The completion and grade summaries use the vectorized
+builders when pandas is installed, `--no-vectorized` measures the pure-Python
+ones. `--memory-budget` sets `ONTASK_DATA_SUMMARY_MEMORY_BUDGET`, so the
+columns over it are spilled to disk.
+
+The results can be saved with `--output` and compared with a previous run
+with `--compare`, e.g. to measure a change between two commits:
+
+    git checkout main && python -m benchmarks.data_summaries --output main.json
+    git checkout my-branch && python -m benchmarks.data_summaries --compare main.json
+
+Usage:
+
+    python -m benchmarks.data_summaries [--learners 1000] [--units 50] [--components-per-unit 3]
+        [--chunk-size 1000] [--query-latency 0] [--repeat 3] [--no-vectorized] [--memory-budget MIB]
+        [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import json
+import os
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "platform_plugin_ontask.settings.test")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.test.utils import override_settings  # noqa: E402
+
+from benchmarks.synthetic_course import COURSE_KEY, SyntheticCourse, use_course  # noqa: E402
+from platform_plugin_ontask.data_summary.backends.completion import UnitCompletionDataSummary  # noqa: E402
+from platform_plugin_ontask.data_summary.backends.grade import ComponentGradeDataSummary  # noqa: E402
+from platform_plugin_ontask.data_summary.backends.user import UserDataSummary  # noqa: E402
+from platform_plugin_ontask.data_summary.enrollments import get_enrollment_snapshot  # noqa: E402
+from platform_plugin_ontask.data_summary.outline import clear_course_outline, get_course_outline  # noqa: E402
+from platform_plugin_ontask.data_summary.vectorized import pandas  # noqa: E402
+
+SYNTHETIC_BACKEND = "benchmarks.synthetic_course"
+BACKEND_SETTINGS = (
+    "PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND",
+    "PLATFORM_PLUGIN_ONTASK_ENROLLMENTS_BACKEND",
+    "PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND",
+    "PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND",
+)
+DATA_SUMMARY_CLASSES = (UserDataSummary, UnitCompletionDataSummary, ComponentGradeDataSummary)
+
+
+def get_course_outline_uncached():
+    """
+    Build the course outline, without the cached one.
+    """
+    clear_course_outline(COURSE_KEY)
+    return get_course_outline(COURSE_KEY)
+
+
+def measure(course: SyntheticCourse, function, repeat: int, memory: bool) -> dict:
+    """
+    Measure the best time, the queries and the peak memory of a function.
+    """
+    timings = []
+    for _ in range(repeat):
+        queries = sum(course.queries.values())
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        queries = sum(course.queries.values()) - queries
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        function()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {"seconds": min(timings), "queries": queries, "peak_memory": peak_memory}
+
+
+def run(args: argparse.Namespace) -> dict:
+    """
+    Run the benchmark and return the results of each measured function.
+    """
+    course = SyntheticCourse(
+        args.learners,
+        args.units,
+        components_per_unit=args.components_per_unit,
+        query_latency=args.query_latency / 1000,
+    )
+    use_course(course)
+    results = {}
+    with override_settings(
+        ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE=args.chunk_size,
+        ONTASK_DATA_SUMMARY_VECTORIZED=args.vectorized,
+        ONTASK_DATA_SUMMARY_MEMORY_BUDGET=None if args.memory_budget is None else int(args.memory_budget * 2**20),
+        **{setting: SYNTHETIC_BACKEND for setting in BACKEND_SETTINGS},
+    ):
+        enrollments = get_enrollment_snapshot(str(COURSE_KEY))
+        results["enrollments"] = {
+            "rows": len(enrollments),
+            "columns": None,
+            **measure(course, lambda: get_enrollment_snapshot(str(COURSE_KEY)), args.repeat, args.memory),
+        }
+        results["course outline"] = {
+            "rows": len(get_course_outline_uncached().units),
+            "columns": None,
+            **measure(course, get_course_outline_uncached, args.repeat, args.memory),
+        }
+        for data_summary_class in DATA_SUMMARY_CLASSES:
+            data_frame = data_summary_class(str(COURSE_KEY), enrollments).get_data_summary()
+            results[data_summary_class.__name__] = {
+                "rows": len(data_frame.get("user_id", ())),
+                "columns": len(data_frame),
+                **measure(
+                    course,
+                    lambda cls=data_summary_class: cls(str(COURSE_KEY), enrollments).get_data_summary(),
+                    args.repeat,
+                    args.memory,
+                ),
+            }
+    return results
+
+
+def format_change(value, previous) -> str:
+    """
+    Format the relative change of a value from a previous run.
+    """
+    if value is None or not previous:
+        return ""
+    return f" ({(value - previous) / previous:+.0%})"
+
+
+def main():
+    """
+    Run the benchmark and print the time, queries and memory of each data summary.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--learners", type=int, default=1000, help="Enrolled learners.")
+    parser.add_argument("--units", type=int, default=50, help="Units of the course.")
+    parser.add_argument("--components-per-unit", type=int, default=3, help="Problems of each unit.")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE.")
+    parser.add_argument("--query-latency", type=float, default=0, help="Milliseconds added to each query.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of measurements, the best one is reported.")
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="Skip the tracemalloc run.")
+    parser.add_argument(
+        "--no-vectorized", dest="vectorized", action="store_false", help="Use the pure-Python builders."
+    )
+    parser.add_argument(
+        "--memory-budget", type=float, help="ONTASK_DATA_SUMMARY_MEMORY_BUDGET in MiB, spill the columns over it."
+    )
+    parser.add_argument("--output", help="Save the parameters and results to a JSON file.")
+    parser.add_argument("--compare", help="Show the changes from the results of a JSON file.")
+    args = parser.parse_args()
+
+    results = run(args)
+    previous = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as compare_file:
+            previous = json.load(compare_file)["results"]
+
+    builders = "vectorized" if args.vectorized and pandas is not None else "pure-Python"
+    print(
+        f"{args.learners} learners, {args.units} units, {args.units * args.components_per_unit} problems, "
+        f"query chunks of {args.chunk_size}, {builders} builders"
+        + ("" if args.memory_budget is None else f", memory budget of {args.memory_budget} MiB")
+    )
+    print(f"{'measure':<28} {'rows':>7} {'columns':>8} {'seconds':>16} {'queries':>8} {'peak MiB':>16}")
+    for name, result in results.items():
+        previous_result = previous.get(name, {})
+        seconds = f"{result['seconds']:.3f}{format_change(result['seconds'], previous_result.get('seconds'))}"
+        peak_memory = ""
+        if result["peak_memory"] is not None:
+            peak_memory = f"{result['peak_memory'] / 2**20:.1f}" + format_change(
+                result["peak_memory"], previous_result.get("peak_memory")
+            )
+        print(
+            f"{name:<28} {result['rows']:>7} {result['columns'] or '-':>8} {seconds:>16} "
+            f"{result['queries']:>8} {peak_memory:>16}"
+        )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump({"parameters": vars(args), "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Micro-benchmark of the per-call overhead of the edxapp_wrapper shims.
+
+It compares resolving the backend module on every call, as the wrappers used
+to do, with the cached resolution of `edxapp_wrapper.registry`.
+
+Usage:
+
+    python -m benchmarks.edxapp_wrapper_overhead [--calls 100000] [--repeat 5]
+"""
+
+import argparse
+import os
+import timeit
+from importlib import import_module
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "platform_plugin_ontask.settings.test")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.conf import settings  # noqa: E402
+
+from platform_plugin_ontask.edxapp_wrapper.courseware import get_student_module_grades  # noqa: E402
+
+
+def get_student_module_grades_uncached(*args, **kwargs):
+    """
+    Resolve the backend on every call, as the wrappers did before the registry.
+    """
+    backend_function = settings.PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND
+    backend = import_module(backend_function)
+
+    return backend.get_student_module_grades(*args, **kwargs)
+
+
+def main():
+    """
+    Run the benchmark and print the per-call time of each variant.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000, help="Calls per measurement.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of measurements, the best one is reported.")
+    args = parser.parse_args()
+
+    variants = {
+        "import_module per call": get_student_module_grades_uncached,
+        "registry": get_student_module_grades,
+    }
+    results = {}
+    for name, function in variants.items():
+        timings = timeit.repeat(lambda f=function: f(None, []), number=args.calls, repeat=args.repeat)
+        results[name] = min(timings) / args.calls * 1e9
+
+    for name, nanoseconds in results.items():
+        print(f"{name:<24} {nanoseconds:10.1f} ns/call")
+    speedup = results["import_module per call"] / results["registry"]
+    print(f"{'speedup':<24} {speedup:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Synthetic course served through the edxapp_wrapper backend settings.
+
+The module implements the functions of the modulestore, enrollments,
+completion and courseware backends over a `SyntheticCourse`, so the data
+summaries can be run offline, at any size, by pointing the
+`PLATFORM_PLUGIN_ONTASK_*_BACKEND` settings to it:
+
+```python
+
+use_course(SyntheticCourse(learners=10000, units=200))
+with override_settings(PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND="benchmarks.synthetic_course", ...):
+    UnitCompletionDataSummary(str(COURSE_KEY)).get_data_summary()
+
+```
+
+Each call of a backend function that runs a query in the real backends is
+counted in `SyntheticCourse.queries`. The completion and grade rows are
+generated when they are read, from a fixed number of learner profiles, so
+large courses do not have to be held in memory.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from django.dispatch import Signal
+from opaque_keys.edx.keys import CourseKey
+from xblock.completable import XBlockCompletionMode
+
+COURSE_KEY = CourseKey.from_string("course-v1:OnTask+Benchmark+2024")
+SUBSECTIONS_PER_SECTION = 4
+UNITS_PER_SUBSECTION = 5
+GRADES = (0.0, 0.5, 1.0)
+
+CompletionService = object
+get_score = object
+
+_course = None
+
+
+class SyntheticBlock:
+    """Block of the synthetic course tree, with the attributes read by the course outline."""
+
+    def __init__(self, usage_key, display_name: str, completion_mode: str, children: list | None = None):
+        """
+        Initialize the block.
+
+        Args:
+            usage_key (UsageKey): The usage key.
+            display_name (str): The display name.
+            completion_mode (str): The `XBlockCompletionMode` of the block.
+            children (list, optional): The child blocks.
+        """
+        self.usage_key = usage_key
+        self.scope_ids = SimpleNamespace(usage_id=usage_key)
+        self.display_name_with_default = display_name
+        self.completion_mode = completion_mode
+        self.children = children or []
+
+    def get_children(self) -> list:
+        """Get the child blocks."""
+        return self.children
+
+
+class SyntheticCourse:
+    """
+    Course outline, enrollments, completions and grades of a synthetic course.
+
+    The course has `units` units of `components_per_unit` problems each, in
+    sections of 4 subsections of 5 units. Every learner follows one of
+    `profiles` random profiles: a learner has completed all the problems of
+    the first units of the course, up to a random point, and has a grade in
+    each completed problem with a probability of `grade_rate`.
+    """
+
+    def __init__(
+        self,
+        learners: int,
+        units: int,
+        *,
+        components_per_unit: int = 3,
+        grade_rate: float = 0.5,
+        profiles: int = 64,
+        query_latency: float = 0,
+        seed: int = 0,
+    ):
+        """
+        Initialize the course.
+
+        Args:
+            learners (int): The number of enrolled learners.
+            units (int): The number of units.
+            components_per_unit (int): The number of problems of each unit.
+            grade_rate (float): The share of the completed problems with a grade.
+            profiles (int): The number of distinct learner profiles.
+            query_latency (float): Seconds added to each query, to simulate
+                the database round trip.
+            seed (int): The random seed.
+        """
+        rng = random.Random(seed)
+        self.learners = learners
+        self.query_latency = query_latency
+        self.queries = Counter()
+        self.component_keys = []
+        units_blocks = []
+        for unit_number in range(units):
+            components = []
+            for _ in range(components_per_unit):
+                usage_key = COURSE_KEY.make_usage_key("problem", f"{rng.getrandbits(128):032x}")
+                self.component_keys.append(usage_key)
+                components.append(
+                    SyntheticBlock(usage_key, f"Problem {len(self.component_keys)}", XBlockCompletionMode.COMPLETABLE)
+                )
+            units_blocks.append(
+                SyntheticBlock(
+                    COURSE_KEY.make_usage_key("vertical", f"{rng.getrandbits(128):032x}"),
+                    f"Unit {unit_number + 1}",
+                    XBlockCompletionMode.AGGREGATOR,
+                    components,
+                )
+            )
+        self.root = SyntheticBlock(
+            COURSE_KEY.make_usage_key("course", "course"),
+            "Benchmark course",
+            XBlockCompletionMode.AGGREGATOR,
+            self.group_blocks(units_blocks),
+        )
+        self.root.course_version = seed
+
+        self.completion_profiles = []
+        self.grade_profiles = []
+        for _ in range(profiles):
+            completed = self.component_keys[: int(rng.random() * len(self.component_keys))]
+            self.completion_profiles.append(completed)
+            self.grade_profiles.append(
+                [(usage_key, rng.choice(GRADES)) for usage_key in completed if rng.random() < grade_rate]
+            )
+
+    @staticmethod
+    def group_blocks(units: list[SyntheticBlock]) -> list[SyntheticBlock]:
+        """
+        Group the units in subsections and sections.
+
+        Args:
+            units (list[SyntheticBlock]): The units.
+
+        Returns:
+            list[SyntheticBlock]: The sections.
+        """
+        subsections = [
+            SyntheticBlock(
+                COURSE_KEY.make_usage_key("sequential", f"sequential_{start:05d}"),
+                f"Subsection {start // UNITS_PER_SUBSECTION + 1}",
+                XBlockCompletionMode.AGGREGATOR,
+                units[start:start + UNITS_PER_SUBSECTION],
+            )
+            for start in range(0, len(units), UNITS_PER_SUBSECTION)
+        ]
+        return [
+            SyntheticBlock(
+                COURSE_KEY.make_usage_key("chapter", f"chapter_{start:05d}"),
+                f"Section {start // SUBSECTIONS_PER_SECTION + 1}",
+                XBlockCompletionMode.AGGREGATOR,
+                subsections[start:start + SUBSECTIONS_PER_SECTION],
+            )
+            for start in range(0, len(subsections), SUBSECTIONS_PER_SECTION)
+        ]
+
+    @property
+    def blocks(self) -> int:
+        """The number of problems of the course."""
+        return len(self.component_keys)
+
+    def query(self, name: str) -> None:
+        """
+        Count a query of a backend function, and wait for the query latency.
+
+        Args:
+            name (str): The backend function name.
+        """
+        self.queries[name] += 1
+        if self.query_latency:
+            time.sleep(self.query_latency)
+
+
+def use_course(course: SyntheticCourse) -> None:
+    """
+    Serve a synthetic course from the backend functions of this module.
+
+    Args:
+        course (SyntheticCourse): The course.
+    """
+    global _course  # pylint: disable=global-statement
+    _course = course
+
+
+class SignalHandler:
+    """Modulestore signals of the synthetic backend."""
+
+    course_published = Signal()
+
+
+class SyntheticModulestore:
+    """Modulestore of the synthetic course."""
+
+    def get_course(self, course_key, depth=None):  # pylint: disable=unused-argument
+        """Get the root block of the synthetic course."""
+        _course.query("get_course")
+        return _course.root
+
+
+def modulestore():
+    """modulestore backend."""
+    return SyntheticModulestore()
+
+
+def update_item(*args, **kwargs):
+    """update_item backend."""
+    return True
+
+
+def get_enrolled_users(course_id, user_ids=None):  # pylint: disable=unused-argument
+    """get_enrolled_users backend."""
+    _course.query("get_enrolled_users")
+    return [
+        (user_id, f"learner{user_id}@example.com", f"learner{user_id}", True)
+        for user_id in range(1, _course.learners + 1)
+        if user_ids is None or user_id in user_ids
+    ]
+
+
+def get_block_completions(course_key, user_ids):  # pylint: disable=unused-argument
+    """get_block_completions backend."""
+    _course.query("get_block_completions")
+    profiles = _course.completion_profiles
+    for user_id in user_ids:
+        for block_key in profiles[user_id % len(profiles)]:
+            yield user_id, block_key
+
+
+def get_student_module_grades(course_key, user_ids):  # pylint: disable=unused-argument
+    """get_student_module_grades backend."""
+    _course.query("get_student_module_grades")
+    profiles = _course.grade_profiles
+    for user_id in user_ids:
+        for module_state_key, grade in profiles[user_id % len(profiles)]:
+            yield user_id, module_state_key, grade
+
+
+def completion_tracking_enabled():
+    """completion_tracking_enabled backend."""
+    return True
+
+
+def get_users_with_completions_since(*args, **kwargs):
+    """get_users_with_completions_since backend."""
+    return []
+
+
+def get_users_with_student_modules_since(*args, **kwargs):
+    """get_users_with_student_modules_since backend."""
+    return []
+
+
+def get_users_with_enrollment_changes_since(*args, **kwargs):
+    """get_users_with_enrollment_changes_since backend."""
+    return []
@@ -0,0 +1,75 @@
+"""
+Benchmark of the encodings of the table upload requests.
+
+It merges a synthetic data frame in the local OnTask stand-in of
+`test_utils.ontask_server`, with each combination of streaming and
+compression, and reports the request time and the bytes sent.
+
+Usage:
+
+    python -m benchmarks.upload_encoding [--users 20000] [--columns 100] [--level 6]
+"""
+
+import argparse
+import os
+import random
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "platform_plugin_ontask.settings.test")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from django.test.utils import override_settings  # noqa: E402
+
+from platform_plugin_ontask.client import OnTaskClient  # noqa: E402
+from platform_plugin_ontask.data_summary.frame import BooleanColumn, ColumnarDataFrame  # noqa: E402
+from test_utils.ontask_server import OnTaskServer  # noqa: E402
+
+
+def build_data_frame(users: int, columns: int) -> ColumnarDataFrame:
+    """
+    Build a completion-like data frame with random values.
+    """
+    random.seed(0)
+    data_frame = ColumnarDataFrame(range(1, users + 1))
+    for column in range(columns):
+        data_frame.add_column(
+            f"Section {column // 10}> Subsection> Unit {column} {column:05x} Completed",
+            BooleanColumn(random.random() < 0.6 for _ in range(users)),
+        )
+    return data_frame
+
+
+def main():
+    """
+    Run the benchmark and print the time and size of each encoding.
+    """
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20000, help="Rows of the data frame.")
+    parser.add_argument("--columns", type=int, default=100, help="Columns of the data frame.")
+    parser.add_argument("--level", type=int, default=None, help="Compression level.")
+    args = parser.parse_args()
+
+    data_frame = build_data_frame(args.users, args.columns)
+    variants = {
+        "json": {},
+        "json + gzip": {"ONTASK_UPLOAD_COMPRESSION": "gzip"},
+        "streaming": {"ONTASK_UPLOAD_STREAMING": True},
+        "streaming + gzip": {"ONTASK_UPLOAD_STREAMING": True, "ONTASK_UPLOAD_COMPRESSION": "gzip"},
+    }
+    print(f"{'encoding':<20} {'seconds':>8} {'sent (KiB)':>12} {'body (KiB)':>12}")
+    with OnTaskServer(keep_payloads=False) as server:
+        workflow_id = server.create_workflow(user_ids=range(1, args.users + 1))
+        for name, overrides in variants.items():
+            with override_settings(ONTASK_UPLOAD_COMPRESSION_LEVEL=args.level, ONTASK_API_TIMEOUT=300, **overrides):
+                start = time.perf_counter()
+                OnTaskClient(server.url, "api-key").merge_table(workflow_id, data_frame)
+                seconds = time.perf_counter() - start
+            request = server.requests[-1]
+            print(f"{name:<20} {seconds:8.2f} {request.wire_size / 1024:12.1f} {request.body_size / 1024:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
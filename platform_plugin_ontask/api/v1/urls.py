@@ -9,4 +9,5 @@ app_name = "platform_plugin_ontask"
 urlpatterns = [
     path("workflow/", views.OnTaskWorkflowAPIView.as_view(), name="workflow"),
     path("table/", views.OnTaskTableAPIView.as_view(), name="table"),
+    path("table/sync/", views.OnTaskSyncJobAPIView.as_view(), name="table-sync"),
 ]
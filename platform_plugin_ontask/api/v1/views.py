@@ -12,8 +12,8 @@ from rest_framework.views import APIView
 
 from platform_plugin_ontask.api.utils import get_api_auth_token, get_course_block, get_course_key, get_workflow_id
 from platform_plugin_ontask.client import OnTaskClient
+from platform_plugin_ontask.data_summary.enrollments import get_enrollment_snapshot
 from platform_plugin_ontask.edxapp_wrapper.authentication import BearerAuthenticationAllowInactiveUser
-from platform_plugin_ontask.edxapp_wrapper.enrollments import get_user_enrollments
 from platform_plugin_ontask.edxapp_wrapper.modulestore import update_item
 from platform_plugin_ontask.exceptions import (
     APIAuthTokenNotSetError,
@@ -21,6 +21,8 @@ from platform_plugin_ontask.exceptions import (
     CustomInvalidKeyError,
     WorkflowIDNotSetError,
 )
+from platform_plugin_ontask.jobs import SyncJob
+from platform_plugin_ontask.sync import SYNC_QUEUED, finish_sync, request_sync, set_table_initialized
 from platform_plugin_ontask.tasks import upload_dataframe_to_ontask_task
 
 log = logging.getLogger(__name__)
@@ -66,7 +68,9 @@ class OnTaskWorkflowAPIView(APIView):
         Handle POST requests to create a new OnTask workflow for the course.
 
         The workflow ID is stored in the Other Course Settings of the course.
-        A table is created in the workflow with the enrollment data.
+        A table is created in the workflow with the enrollment data, and
+        recorded as initialized when it has rows, so the first sync merges its
+        data frames in it directly.
 
         Arguments:
             request (Request): The HTTP request object.
@@ -95,10 +99,10 @@ class OnTaskWorkflowAPIView(APIView):
             course_block.other_course_settings["ONTASK_WORKFLOW_ID"] = workflow_id
             update_item(CourseKey.from_string(course_id), course_block, request.user.id)
 
-            enrollments = get_user_enrollments(course_id)
+            enrollments = get_enrollment_snapshot(course_id)
             data_frame = {"user_id": {}}
-            for index, enrollment in enumerate(enrollments):
-                data_frame["user_id"][index] = enrollment.user.id
+            for index, user in enumerate(enrollments):
+                data_frame["user_id"][index] = user.id
 
             update_table_response = ontask_client.update_table(workflow_id, data_frame)
 
@@ -111,6 +115,9 @@ class OnTaskWorkflowAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+            if enrollments:
+                set_table_initialized(workflow_id)
+
             return Response(status=status.HTTP_201_CREATED)
         except (CustomInvalidKeyError, CourseNotFoundError, APIAuthTokenNotSetError) as error:
             return Response(data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
@@ -137,7 +144,10 @@ class OnTaskTableAPIView(APIView):
 
         * PUT platform-plugin-ontask/{course_id}/api/v1/table/
 
-            * 200: The course data is uploaded to OnTask successfully.
+            * 200: The course data upload is requested. The `status` of the
+                response is `queued` if a sync was queued, `coalesced` if a
+                sync of the course was already queued, or `running` if a sync
+                is running and a follow-up sync will be queued when it ends.
 
             * 400:
                 * The supplied course_id key is not valid.
@@ -157,7 +167,12 @@ class OnTaskTableAPIView(APIView):
         """
         Handle PUT requests to upload the course data to OnTask.
 
-        The course data is uploaded to the OnTask table in the workflow.
+        The course data is uploaded to the OnTask table in the workflow. If the
+        `ONTASK_INCREMENTAL_SYNC` setting is enabled, only the users that changed
+        since the last sync are uploaded.
+
+        Only one sync of a course is queued or running at a time, concurrent
+        requests are coalesced with it.
 
         Arguments:
             _ (Request): The HTTP request object.
@@ -171,9 +186,98 @@ class OnTaskTableAPIView(APIView):
             api_auth_token = get_api_auth_token(course_block)
             workflow_id = get_workflow_id(course_block)
 
-            upload_dataframe_to_ontask_task.delay(course_id, workflow_id, api_auth_token)
-
-            return Response(status=status.HTTP_200_OK)
+            sync_status = request_sync(course_id)
+            if sync_status == SYNC_QUEUED:
+                SyncJob.create(course_id)
+                try:
+                    upload_dataframe_to_ontask_task.delay(
+                        course_id,
+                        workflow_id,
+                        api_auth_token,
+                        incremental=getattr(settings, "ONTASK_INCREMENTAL_SYNC", False),
+                    )
+                except Exception:
+                    finish_sync(course_id)
+                    raise
+
+            return Response(data={"status": sync_status}, status=status.HTTP_200_OK)
 
         except (CustomInvalidKeyError, CourseNotFoundError, APIAuthTokenNotSetError, WorkflowIDNotSetError) as error:
             return Response(data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class OnTaskSyncJobAPIView(APIView):
+    """
+    API view for the progress of the OnTask table syncs.
+
+    `Use Cases`:
+
+        * GET: Get the progress of the last sync of the course data to OnTask.
+
+    `Example Requests`:
+
+        * GET platform-plugin-ontask/{course_id}/api/v1/table/sync/
+
+            * Path Parameters:
+
+                * course_id (str): The unique identifier for the course (required).
+
+    `Example Response`:
+
+        * GET platform-plugin-ontask/{course_id}/api/v1/table/sync/
+
+            * 200: The sync job of the course, e.g.:
+
+                {
+                    "course_id": "course-v1:edX+DemoX+Demo_Course",
+                    "status": "running",
+                    "queued_at": "2024-09-01T10:00:00+00:00",
+                    "started_at": "2024-09-01T10:00:01+00:00",
+                    "finished_at": null,
+                    "elapsed_seconds": 12.5,
+                    "summaries": {
+                        "UnitCompletionDataSummary": {
+                            "rows": 20000,
+                            "columns": 301,
+                            "compute_seconds": 8.1,
+                            "upload_seconds": 3.9,
+                            "chunks_uploaded": 3,
+                            "chunks_failed": 0,
+                            "errors": []
+                        }
+                    },
+                    "errors": []
+                }
+
+            * 400: The supplied course_id key is not valid.
+
+            * 404: The course data was never synced.
+    """
+
+    authentication_classes = (
+        JwtAuthentication,
+        BearerAuthenticationAllowInactiveUser,
+        SessionAuthenticationAllowInactiveUser,
+    )
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, _, course_id: str) -> Response:
+        """
+        Handle GET requests to get the progress of the last sync of the course.
+
+        Arguments:
+            _ (Request): The HTTP request object.
+            course_id (str): The course ID.
+
+        Returns:
+            Response: The response object.
+        """
+        try:
+            get_course_key(course_id)
+        except CustomInvalidKeyError as error:
+            return Response(data={"error": str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = SyncJob.get(course_id)
+        if job is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        return Response(data=job.to_dict(), status=status.HTTP_200_OK)
@@ -3,12 +3,15 @@ platform_plugin_ontask Django application initialization.
 """
 
 from django.apps import AppConfig
+from django.conf import settings
 
 try:
     from openedx.core.constants import COURSE_ID_PATTERN
 except ImportError:
     COURSE_ID_PATTERN = object
 
+CMS_ROOT_URLCONF = "cms.urls"
+
 
 class PlatformPluginOntaskConfig(AppConfig):
     """
@@ -38,3 +41,37 @@ class PlatformPluginOntaskConfig(AppConfig):
             },
         },
     }
+
+    def ready(self):
+        """
+        Connect the signal receivers of the plugin.
+
+        The completion and score receivers are only connected in the LMS,
+        where the learners complete the blocks and get their scores.
+        """
+        # pylint: disable=import-outside-toplevel
+        from celery.signals import celeryd_after_setup
+        from django.db.models.signals import post_save
+
+        from platform_plugin_ontask.edxapp_wrapper.completion import get_block_completion_model
+        from platform_plugin_ontask.edxapp_wrapper.courseware import get_problem_weighted_score_changed_signal
+        from platform_plugin_ontask.edxapp_wrapper.modulestore import get_course_published_signal
+        from platform_plugin_ontask.receivers import (
+            block_completion_saved_handler,
+            course_published_handler,
+            problem_weighted_score_changed_handler,
+            worker_started_handler,
+        )
+
+        get_course_published_signal().connect(course_published_handler, dispatch_uid="ontask_course_published")
+        celeryd_after_setup.connect(worker_started_handler, dispatch_uid="ontask_worker_started")
+        if settings.ROOT_URLCONF == CMS_ROOT_URLCONF:
+            return
+        post_save.connect(
+            block_completion_saved_handler,
+            sender=get_block_completion_model(),
+            dispatch_uid="ontask_block_completion_saved",
+        )
+        get_problem_weighted_score_changed_signal().connect(
+            problem_weighted_score_changed_handler, dispatch_uid="ontask_problem_weighted_score_changed"
+        )
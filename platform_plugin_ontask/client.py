@@ -1,6 +1,167 @@
 """OnTask API client."""
 
+from __future__ import annotations
+
+import logging
+import os
+import time
+from typing import Callable, Iterable, Mapping
+
 import requests
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from platform_plugin_ontask.data_summary.frame import data_frame_to_dict
+from platform_plugin_ontask.encoding import CompressedStream, JSONStream, compress, dumps
+from platform_plugin_ontask.metrics import measure_stage
+from platform_plugin_ontask.utils import chunked
+
+log = logging.getLogger(__name__)
+
+ROWS_CHUNK_MODE = "rows"
+COLUMNS_CHUNK_MODE = "columns"
+HTTP_SETTINGS_PREFIX = "ONTASK_HTTP_"
+RETRY_STATUS_CODES = (502, 503, 504)
+# The table PUTs are retried by `OnTaskClient._send_chunk`, so the session only
+# retries them on connection errors, when the request was not sent.
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS - {"PUT"}
+
+_sessions = {}
+
+
+def get_session() -> requests.Session:
+    """
+    Get the pooled HTTP session of the current process.
+
+    The session keeps the connections to OnTask alive, so they are reused
+    across requests, clients and tasks of the same worker process. A new
+    session is created after a fork, since connections cannot be shared
+    between processes.
+
+    Returns:
+        requests.Session: The session.
+    """
+    pid = os.getpid()
+    session = _sessions.get(pid)
+    if session is None:
+        _sessions.clear()
+        session = _sessions[pid] = create_session()
+    return session
+
+
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session configured with the `ONTASK_HTTP_*` settings.
+
+    Returns:
+        requests.Session: The session.
+    """
+    retry = Retry(
+        total=getattr(settings, "ONTASK_HTTP_MAX_RETRIES", 3),
+        backoff_factor=getattr(settings, "ONTASK_HTTP_BACKOFF_FACTOR", 0.5),
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, "ONTASK_HTTP_POOL_CONNECTIONS", 10),
+        pool_maxsize=getattr(settings, "ONTASK_HTTP_POOL_MAXSIZE", 10),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not getattr(settings, "ONTASK_HTTP_KEEP_ALIVE", True):
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_connection_stats() -> dict:
+    """
+    Get the connection reuse counters of the session of the current process.
+
+    Returns:
+        dict: The number of requests sent, of connections opened, and of
+            requests that reused an open connection.
+    """
+    num_requests = num_connections = 0
+    session = _sessions.get(os.getpid())
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for pool_key in pools.keys():
+                pool = pools[pool_key]
+                num_requests += pool.num_requests
+                num_connections += pool.num_connections
+    return {
+        "requests": num_requests,
+        "connections": num_connections,
+        "reused": num_requests - num_connections,
+    }
+
+
+@receiver(setting_changed)
+def clear_sessions(setting: str, **kwargs) -> None:
+    """
+    Discard the sessions when one of the `ONTASK_HTTP_*` settings changes.
+
+    Args:
+        setting (str): The name of the changed setting.
+    """
+    if setting.startswith(HTTP_SETTINGS_PREFIX):
+        _sessions.clear()
+
+
+def iter_row_chunks(data_frame: Mapping, chunk_size: int, key_column: str) -> Iterable[dict]:
+    """
+    Split a data frame in chunks of rows.
+
+    Each chunk has all the columns of the data frame, but only the values of
+    a range of rows. A data frame without rows is a single chunk with its empty
+    columns, so it is still sent like an unchunked data frame.
+
+    Args:
+        data_frame (Mapping): The data frame to split.
+        chunk_size (int): Maximum number of rows per chunk.
+        key_column (str): The column with one value per row.
+
+    Returns:
+        Iterable[dict]: The data frame chunks.
+    """
+    if not data_frame[key_column]:
+        yield {column_name: {} for column_name in data_frame}
+    for indexes in chunked(data_frame[key_column], chunk_size):
+        yield {
+            column_name: {index: column[index] for index in indexes if index in column}
+            for column_name, column in data_frame.items()
+        }
+
+
+def iter_column_chunks(data_frame: Mapping, chunk_size: int, key_column: str) -> Iterable[dict]:
+    """
+    Split a data frame in chunks of columns.
+
+    Each chunk has the key column, so it can be merged on it, and a group of
+    the other columns.
+
+    Args:
+        data_frame (Mapping): The data frame to split.
+        chunk_size (int): Maximum number of columns per chunk, besides the key column.
+        key_column (str): The column used to merge the chunks.
+
+    Returns:
+        Iterable[dict]: The data frame chunks.
+    """
+    column_names = [column_name for column_name in data_frame if column_name != key_column]
+    if not column_names:
+        yield {key_column: data_frame[key_column]}
+    for column_names_chunk in chunked(column_names, chunk_size):
+        chunk = {key_column: data_frame[key_column]}
+        chunk.update((column_name, data_frame[column_name]) for column_name in column_names_chunk)
+        yield chunk
 
 
 class OnTaskClient:
@@ -8,19 +169,27 @@ class OnTaskClient:
 
     MERGE_COLUMN = "user_id"
     MERGE_TYPE = "outer"
+    DEFAULT_TIMEOUT = 5
+    DEFAULT_CHUNK_SIZE = 5000
+    DEFAULT_CHUNK_TIMEOUT = 60
+    DEFAULT_CHUNK_RETRIES = 2
+    CHUNK_RETRY_BACKOFF = 1
 
-    def __init__(self, api_url: str, api_key: str):
+    def __init__(self, api_url: str, api_key: str, timeout: float | None = None):
         """
         Initialize the OnTask client.
 
         Arguments:
             api_url (str): The OnTask API URL.
             api_key (str): The OnTask API key.
+            timeout (float, optional): The request timeout in seconds. Defaults
+                to the `ONTASK_API_TIMEOUT` setting.
         """
         self.api_url = api_url
         self.api_key = api_key
         self.headers = {"Authorization": f"Token {self.api_key}"}
-        self.timeout = 5
+        self.timeout = timeout or getattr(settings, "ONTASK_API_TIMEOUT", self.DEFAULT_TIMEOUT)
+        self.session = get_session()
 
     def create_workflow(self, course_id: str) -> requests.Response:
         """
@@ -32,38 +201,40 @@ class OnTaskClient:
         Returns:
             requests.Response: The response object.
         """
-        return requests.post(
+        return self.session.post(
             url=f"{self.api_url}/workflow/workflows/",
             json={"name": course_id},
             headers=self.headers,
             timeout=self.timeout,
         )
 
-    def update_table(self, workflow_id: str, data_frame: dict) -> requests.Response:
+    def update_table(self, workflow_id: str, data_frame: Mapping, timeout: float | None = None) -> requests.Response:
         """
         Update an OnTask table.
 
         Arguments:
             workflow_id (str): The workflow ID.
-            data_frame (dict): The data frame to update.
+            data_frame (Mapping): The data frame to update.
+            timeout (float, optional): The request timeout in seconds.
 
         Returns:
             requests.Response: The response object.
         """
-        return requests.put(
+        return self._put_table(
+            operation="update",
             url=f"{self.api_url}/table/{workflow_id}/ops/",
-            json={"data_frame": data_frame},
-            headers=self.headers,
-            timeout=self.timeout,
+            payload={"data_frame": data_frame},
+            timeout=timeout or self.timeout,
         )
 
-    def merge_table(self, workflow_id: str, data_frame: dict) -> requests.Response:
+    def merge_table(self, workflow_id: str, data_frame: Mapping, timeout: float | None = None) -> requests.Response:
         """
         Merge a data frame in an OnTask table.
 
         Arguments:
             workflow_id (str): The workflow ID.
-            data_frame (dict): The data frame to merge.
+            data_frame (Mapping): The data frame to merge.
+            timeout (float, optional): The request timeout in seconds.
 
         Returns:
             requests.Response: The response object.
@@ -74,9 +245,172 @@ class OnTaskClient:
             "right_on": self.MERGE_COLUMN,
             "src_df": data_frame,
         }
-        return requests.put(
+        return self._put_table(
+            operation="merge",
             url=f"{self.api_url}/table/{workflow_id}/merge/",
-            json=merge_dict,
-            headers=self.headers,
-            timeout=self.timeout,
+            payload=merge_dict,
+            timeout=timeout or self.timeout,
         )
+
+    def _put_table(self, operation: str, url: str, payload: dict, timeout: float) -> requests.Response:
+        """
+        Send a table payload, with its data frame encoded as JSON.
+
+        If the `ONTASK_UPLOAD_STREAMING` setting is enabled, the payload is
+        encoded incrementally while it is sent, with chunked transfer encoding.
+        Otherwise the whole payload is encoded before sending it.
+
+        If the `ONTASK_UPLOAD_COMPRESSION` setting is set, the body is
+        compressed with `gzip` or `zstd`, at the `ONTASK_UPLOAD_COMPRESSION_LEVEL`
+        level, and sent with the matching `Content-Encoding` header.
+
+        The encoding of the body and the request are measured as the
+        `serialize` and `request` stages, with the size of the JSON body and
+        of the body sent, see `platform_plugin_ontask.metrics`. A streamed body
+        is encoded while it is sent, so it only has a `request` stage.
+
+        Arguments:
+            operation (str): `merge` or `update`, the tag of the stages.
+            url (str): The table endpoint URL.
+            payload (dict): The request payload, with a data frame.
+            timeout (float): The request timeout in seconds.
+
+        Returns:
+            requests.Response: The response object.
+        """
+        tags = {"operation": operation}
+        streaming = getattr(settings, "ONTASK_UPLOAD_STREAMING", False)
+        compression = getattr(settings, "ONTASK_UPLOAD_COMPRESSION", None)
+        level = getattr(settings, "ONTASK_UPLOAD_COMPRESSION_LEVEL", None)
+        headers = {**self.headers, "Content-Type": "application/json"}
+        if compression:
+            headers["Content-Encoding"] = compression
+
+        if streaming:
+            body = JSONStream(payload)
+            wire_body = CompressedStream(body, compression, level) if compression else body
+        else:
+            with measure_stage("serialize", tags=tags) as stage:
+                body = dumps(
+                    {
+                        key: data_frame_to_dict(value) if isinstance(value, Mapping) else value
+                        for key, value in payload.items()
+                    }
+                )
+                wire_body = compress(body, compression, level) if compression else body
+                stage.values.update(payload_bytes=len(body), wire_bytes=len(wire_body))
+
+        with measure_stage("request", tags=tags) as stage:
+            response = self.session.put(url=url, data=wire_body, headers=headers, timeout=timeout)
+            stage.fields["status_code"] = response.status_code
+            stage.values.update(
+                payload_bytes=body.size if streaming else len(body),
+                wire_bytes=wire_body.size if streaming else len(wire_body),
+            )
+        return response
+
+    def merge_table_in_chunks(
+        self,
+        workflow_id: str,
+        data_frame: Mapping,
+        *,
+        mode: str | None = None,
+        chunk_size: int | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        on_chunk: Callable[[requests.Response, float], None] | None = None,
+        initialize: bool = False,
+    ) -> requests.Response:
+        """
+        Merge a data frame in an OnTask table, one chunk at a time.
+
+        The data frame is split by row ranges or by groups of columns, and each
+        chunk is merged on the `user_id` column with its own request, so only
+        one chunk is serialized at a time. If the table is empty, the first
+        chunk is used to initialize it: directly if `initialize` is set, or
+        after the merge of the first chunk is rejected otherwise.
+
+        The upload stops at the first chunk that fails after all its retries.
+
+        Arguments:
+            workflow_id (str): The workflow ID.
+            data_frame (Mapping): The data frame to merge.
+            mode (str, optional): `rows` or `columns`. Defaults to the
+                `ONTASK_UPLOAD_CHUNK_MODE` setting.
+            chunk_size (int, optional): Rows or columns per chunk. Defaults to
+                the `ONTASK_UPLOAD_CHUNK_SIZE` setting.
+            timeout (float, optional): The timeout of each chunk request.
+                Defaults to the `ONTASK_UPLOAD_CHUNK_TIMEOUT` setting.
+            retries (int, optional): Retries of each chunk request. Defaults to
+                the `ONTASK_UPLOAD_CHUNK_RETRIES` setting.
+            on_chunk (callable, optional): Called with the final response of
+                each chunk and the seconds spent sending it.
+            initialize (bool): Whether the table is known to be empty, to send
+                the first chunk as a table update.
+
+        Returns:
+            requests.Response: The response of the last chunk request.
+        """
+        mode = mode or getattr(settings, "ONTASK_UPLOAD_CHUNK_MODE", None) or ROWS_CHUNK_MODE
+        chunk_size = chunk_size or getattr(settings, "ONTASK_UPLOAD_CHUNK_SIZE", self.DEFAULT_CHUNK_SIZE)
+        timeout = timeout or getattr(settings, "ONTASK_UPLOAD_CHUNK_TIMEOUT", self.DEFAULT_CHUNK_TIMEOUT)
+        if retries is None:
+            retries = getattr(settings, "ONTASK_UPLOAD_CHUNK_RETRIES", self.DEFAULT_CHUNK_RETRIES)
+
+        iter_chunks = iter_column_chunks if mode == COLUMNS_CHUNK_MODE else iter_row_chunks
+        response = None
+        for chunk_number, chunk in enumerate(iter_chunks(data_frame, chunk_size, self.MERGE_COLUMN)):
+            started = time.monotonic()
+            send = self.update_table if chunk_number == 0 and initialize else self.merge_table
+            response = self._send_chunk(send, workflow_id, chunk, timeout=timeout, retries=retries)
+            if chunk_number == 0 and is_empty_table_response(response):
+                log.info("Workflow appears empty, initializing the table with the first chunk.")
+                response = self._send_chunk(self.update_table, workflow_id, chunk, timeout=timeout, retries=retries)
+            if on_chunk is not None:
+                on_chunk(response, time.monotonic() - started)
+            if not response.ok:
+                log.error(f"Chunk {chunk_number} could not be uploaded: {response.text}")
+                break
+        return response
+
+    def _send_chunk(self, send, workflow_id: str, chunk: dict, *, timeout: float, retries: int) -> requests.Response:
+        """
+        Send a chunk, retrying on connection errors and server errors.
+
+        The session does not retry the PUT requests on server errors, so each
+        chunk is sent at most `retries + 1` times.
+
+        Arguments:
+            send (callable): `merge_table` or `update_table`.
+            workflow_id (str): The workflow ID.
+            chunk (dict): The data frame chunk.
+            timeout (float): The request timeout in seconds.
+            retries (int): Number of retries.
+
+        Returns:
+            requests.Response: The response object.
+        """
+        attempt = 0
+        while True:
+            try:
+                response = send(workflow_id, chunk, timeout=timeout)
+                if response.status_code < 500 or attempt >= retries:
+                    return response
+            except requests.RequestException:
+                if attempt >= retries:
+                    raise
+            time.sleep(self.CHUNK_RETRY_BACKOFF * 2**attempt)
+            attempt += 1
+
+
+def is_empty_table_response(response: requests.Response) -> bool:
+    """
+    Check whether OnTask rejected a merge because the table is empty.
+
+    Arguments:
+        response (requests.Response): The merge response.
+
+    Returns:
+        bool: Whether the workflow table is empty.
+    """
+    return response.status_code == 400 and "non-empty table" in response.text
@@ -1,16 +1,69 @@
 """Base class for data summary."""
 
+from __future__ import annotations
+
+import inspect
 from abc import ABC, abstractmethod
 
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser, get_enrollment_snapshot
+
 
 class DataSummary(ABC):
     """Interface for data summary."""
 
     USER_ID_COLUMN_NAME = "user_id"
 
-    def __init__(self, course_id: str):
+    def __init__(self, course_id: str, enrollments: list[EnrolledUser] | None = None):
+        """
+        Initialize the data summary.
+
+        Args:
+            course_id (str): The course ID.
+            enrollments (list[EnrolledUser], optional): The enrollment snapshot
+                shared by the data summaries of a sync. If it is not provided,
+                it is fetched on first use.
+        """
         self.course_id = course_id
+        self._enrollments = enrollments
+
+    @classmethod
+    def create(cls, course_id: str, enrollments: list[EnrolledUser]) -> DataSummary:
+        """
+        Create the data summary of an enrollment snapshot.
+
+        Data summaries that override `__init__` with only the course ID are
+        created with it, and given the snapshot afterwards, so their
+        `self.enrollments` is still the snapshot of the sync.
+
+        Args:
+            course_id (str): The course ID.
+            enrollments (list[EnrolledUser]): The enrollment snapshot.
+
+        Returns:
+            DataSummary: The data summary.
+        """
+        try:
+            inspect.signature(cls).bind(course_id, enrollments)
+        except TypeError:
+            data_summary = cls(course_id)
+            data_summary._enrollments = enrollments
+            return data_summary
+        return cls(course_id, enrollments)
+
+    @property
+    def enrollments(self) -> list[EnrolledUser]:
+        """The users enrolled in the course."""
+        if self._enrollments is None:
+            self._enrollments = get_enrollment_snapshot(self.course_id)
+        return self._enrollments
 
     @abstractmethod
     def get_data_summary(self):
-        """Get the data summary."""
+        """
+        Get the data summary.
+
+        Returns:
+            Mapping: A data frame keyed by column name, with the user ID
+                column, such as a `ColumnarDataFrame` or a dict of
+                `{column: {row_index: value}}`.
+        """
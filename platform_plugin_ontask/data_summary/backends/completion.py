@@ -1,13 +1,15 @@
 """Data summary for completion data."""
 
-from collections import defaultdict
+from __future__ import annotations
 
 from opaque_keys.edx.keys import CourseKey
 
 from platform_plugin_ontask.data_summary.backends.base import DataSummary
-from platform_plugin_ontask.edxapp_wrapper.completion import CompletionService
-from platform_plugin_ontask.edxapp_wrapper.enrollments import get_user_enrollments
-from platform_plugin_ontask.utils import get_course_units
+from platform_plugin_ontask.data_summary.columns import ColumnNamer, shorten
+from platform_plugin_ontask.data_summary.frame import BooleanColumn, ColumnarDataFrame
+from platform_plugin_ontask.data_summary.lookups import CompletionLookup
+from platform_plugin_ontask.data_summary.outline import OutlineUnit, get_course_outline
+from platform_plugin_ontask.data_summary.vectorized import get_unit_completion_columns, is_vectorized_enabled
 
 
 class UnitCompletionDataSummary(DataSummary):
@@ -22,8 +24,14 @@ class UnitCompletionDataSummary(DataSummary):
 
     1. Get the course key from the course ID.
     2. Get all the enrollments for the course.
-    3. Get all the course units for the course.
-    4. Create a dictionary with the unit completion data summary.
+    3. Get all the course units from the cached course outline.
+    4. Compute the column name of each unit.
+    5. Load the completions of all the enrolled users in bulk.
+    6. Create a columnar data frame with one boolean column per unit.
+
+    If pandas is installed, steps 5 and 6 use the vectorized builder of
+    `platform_plugin_ontask.data_summary.vectorized`, unless the
+    `ONTASK_DATA_SUMMARY_VECTORIZED` setting is disabled.
 
     Example result:
 
@@ -54,7 +62,7 @@ class UnitCompletionDataSummary(DataSummary):
     SUBSECTION_NAME_LENGTH = 12
     SECTION_NAME_LENGTH = 12
 
-    def get_unit_name(self, block_id, unit_name, subsection_name, section_name) -> str:
+    def get_unit_name(self, block_id, unit_name, subsection_name, section_name, full_block_id=False) -> str:
         """
         Returns a string with a mix of the original location values.
 
@@ -63,46 +71,67 @@ class UnitCompletionDataSummary(DataSummary):
             unit_name (str): The unit name.
             subsection_name (str): The subsection name.
             section_name (str): The section name.
+            full_block_id (bool): Whether to use the full block ID instead of
+                its last characters.
 
         Returns:
             str: A formatted string with the shortened values.
         """
-
-        def shorten(value, length):
-            """Shorten the string to the specified length."""
-            return value[:length-5] + '..' + value[-3:] if len(value) > length else value
-
-        short_block_id = block_id[-self.UNIQUE_KEY_LENGTH:]
+        short_block_id = block_id if full_block_id else block_id[-self.UNIQUE_KEY_LENGTH:]
         short_unit_name = shorten(unit_name, self.UNIT_NAME_LENGTH)
         short_subsection_name = shorten(subsection_name, self.SUBSECTION_NAME_LENGTH)
         short_section_name = shorten(section_name, self.SECTION_NAME_LENGTH)
 
         return f"{short_section_name}> {short_subsection_name}> {short_unit_name} {short_block_id} Completed"
 
-    def get_data_summary(self) -> dict:
+    def get_column_names(self, course_units: tuple[OutlineUnit, ...]) -> list[str]:
+        """
+        Get the unique column name of each unit.
+
+        Args:
+            course_units (tuple[OutlineUnit, ...]): The units of the course.
+
+        Returns:
+            list[str]: The column names, in the order of the units.
+        """
+        column_namer = ColumnNamer(reserved=[self.USER_ID_COLUMN_NAME])
+        return [
+            column_namer.add(
+                unit.usage_key,
+                self.get_unit_name(unit.block_id, unit.display_name, unit.subsection_name, unit.section_name),
+                fallback=self.get_unit_name(
+                    unit.block_id, unit.display_name, unit.subsection_name, unit.section_name, full_block_id=True
+                ),
+            )
+            for unit in course_units
+        ]
+
+    def get_data_summary(self) -> ColumnarDataFrame:
         """
         Get the unit completion data summary.
 
         Returns:
-            data_frame (dict): A dataframe with the unit completion data summary
+            data_frame (ColumnarDataFrame): A dataframe with the unit completion data summary
         """
         course_key = CourseKey.from_string(self.course_id)
-        enrollments = get_user_enrollments(self.course_id)
-        course_units = list(get_course_units(course_key))
-
-        data_frame = defaultdict(dict)
-        for index, enrollment in enumerate(enrollments):
-            completion_service = CompletionService(enrollment.user, course_key)
-            data_frame[self.USER_ID_COLUMN_NAME][index] = enrollment.user.id
-            for unit, subsection_name, section_name in course_units:
-                column_name = self.get_unit_name(
-                    unit.usage_key.block_id,
-                    unit.display_name_with_default,
-                    subsection_name,
-                    section_name,
-                )
-                data_frame[column_name][index] = (
-                    completion_service.vertical_is_complete(unit)
-                )
+        course_units = get_course_outline(course_key).units
+        user_ids = [user.id for user in self.enrollments]
+        data_frame = ColumnarDataFrame(user_ids, self.USER_ID_COLUMN_NAME)
+        column_names = self.get_column_names(course_units)
+
+        if is_vectorized_enabled():
+            columns = get_unit_completion_columns(course_key, user_ids, [unit.leaf_keys for unit in course_units])
+            for column_name, column in zip(column_names, columns):
+                data_frame.add_column(column_name, column)
+            return data_frame
+
+        completion_lookup = CompletionLookup(
+            course_key, {unit.usage_key: unit.leaf_keys for unit in course_units}
+        ).load(user_ids)
+        for column_name, unit in zip(column_names, course_units):
+            data_frame.add_column(
+                column_name,
+                BooleanColumn(completion_lookup.vertical_is_complete(user_id, unit.usage_key) for user_id in user_ids),
+            )
 
         return data_frame
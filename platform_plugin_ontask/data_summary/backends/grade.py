@@ -1,13 +1,16 @@
 """Data summary for grade data."""
 
-from collections import defaultdict
+from __future__ import annotations
 
 from opaque_keys.edx.keys import CourseKey
 
 from platform_plugin_ontask.data_summary.backends.base import DataSummary
-from platform_plugin_ontask.edxapp_wrapper.courseware import get_score
-from platform_plugin_ontask.edxapp_wrapper.enrollments import get_user_enrollments
-from platform_plugin_ontask.utils import get_course_components
+from platform_plugin_ontask.data_summary.columns import ColumnNamer, shorten
+from platform_plugin_ontask.data_summary.frame import ColumnarDataFrame, FloatColumn
+from platform_plugin_ontask.data_summary.lookups import ScoreLookup, get_query_chunk_size
+from platform_plugin_ontask.data_summary.outline import OutlineComponent, get_course_outline
+from platform_plugin_ontask.data_summary.vectorized import get_component_grade_columns, is_vectorized_enabled
+from platform_plugin_ontask.utils import chunked
 
 
 class ComponentGradeDataSummary(DataSummary):
@@ -22,8 +25,14 @@ class ComponentGradeDataSummary(DataSummary):
 
     1. Get the course key from the course ID.
     2. Get all the enrollments for the course.
-    3. Get all the course components for the course.
-    4. Create a dictionary with the component grade data summary.
+    3. Get all the course components from the cached course outline.
+    4. Compute the column name of each component.
+    5. Load the grades of the enrolled users in bulk, one chunk of users at a time.
+    6. Create a columnar data frame with one float column per component.
+
+    If pandas is installed, steps 5 and 6 use the vectorized builder of
+    `platform_plugin_ontask.data_summary.vectorized`, unless the
+    `ONTASK_DATA_SUMMARY_VECTORIZED` setting is disabled.
 
     Example result:
 
@@ -54,51 +63,78 @@ class ComponentGradeDataSummary(DataSummary):
     COMPONENT_NAME_LENGTH = 20
     UNIT_NAME_LENGTH = 16
 
-    def get_component_name(self, block_id, component_name, unit_blockid, unit_name) -> str:
+    def get_component_name(self, block_id, component_name, unit_blockid, unit_name, full_block_id=False) -> str:
         """
         Returns a string with a mix of the original location values.
 
         Returns:
             str: A formatted string with the shortened values.
         """
-
-        def shorten(value, length):
-            """Shorten the string to the specified length."""
-            return value[:length-5] + '..' + value[-3:] if len(value) > length else value
-
-        short_block_id = block_id[-self.UNIQUE_KEY_LENGTH:]
+        short_block_id = block_id if full_block_id else block_id[-self.UNIQUE_KEY_LENGTH:]
         short_component_name = shorten(component_name, self.COMPONENT_NAME_LENGTH)
         short_unit_blockid = unit_blockid[-self.UNIQUE_KEY_LENGTH:]
         short_unit_name = shorten(unit_name, self.UNIT_NAME_LENGTH)
 
         return f"{short_unit_name}({short_unit_blockid})> {short_component_name} {short_block_id} Grade"
 
-    def get_data_summary(self) -> dict:
+    def get_column_names(self, course_components: tuple[OutlineComponent, ...]) -> list[str]:
+        """
+        Get the unique column name of each component.
+
+        Args:
+            course_components (tuple[OutlineComponent, ...]): The components
+                of the course.
+
+        Returns:
+            list[str]: The column names, in the order of the components.
+        """
+        column_namer = ColumnNamer(reserved=[self.USER_ID_COLUMN_NAME])
+        return [
+            column_namer.add(
+                component.usage_key,
+                self.get_component_name(
+                    component.block_id, component.display_name, component.unit_block_id, component.unit_name
+                ),
+                fallback=self.get_component_name(
+                    component.block_id,
+                    component.display_name,
+                    component.unit_block_id,
+                    component.unit_name,
+                    full_block_id=True,
+                ),
+            )
+            for component in course_components
+        ]
+
+    def get_data_summary(self) -> ColumnarDataFrame:
         """
         Get the component completion data summary.
 
         Returns:
-            data_frame (dict): A dataframe with the component completion data summary
+            data_frame (ColumnarDataFrame): A dataframe with the component completion data summary
         """
         course_key = CourseKey.from_string(self.course_id)
-        enrollments = get_user_enrollments(self.course_id)
-        course_components = list(get_course_components(course_key))
-
-        data_frame = defaultdict(dict)
-        for index, enrollment in enumerate(enrollments):
-            user_id = enrollment.user.id
-            data_frame[self.USER_ID_COLUMN_NAME][index] = user_id
-            for component, unit_blockid, unit_name in course_components:
-                usage_key = component.usage_key
-                student_module = get_score(user_id, usage_key)
-                grade = student_module.grade if student_module and student_module.grade is not None else 0
-
-                column_name = self.get_component_name(
-                    component.usage_key.block_id,
-                    component.display_name_with_default,
-                    unit_blockid,
-                    unit_name,
-                )
-                data_frame[column_name][index] = grade
+        course_components = get_course_outline(course_key).components
+        user_ids = [user.id for user in self.enrollments]
+        component_keys = [component.usage_key for component in course_components]
+        data_frame = ColumnarDataFrame(user_ids, self.USER_ID_COLUMN_NAME)
+        column_names = self.get_column_names(course_components)
+
+        if is_vectorized_enabled():
+            columns = get_component_grade_columns(course_key, user_ids, component_keys)
+            for column_name, column in zip(column_names, columns):
+                data_frame.add_column(column_name, column)
+            return data_frame
+
+        # The grades are indexed one query chunk of users at a time, so only
+        # the compact columns grow with the course.
+        columns = [FloatColumn() for _ in course_components]
+        for user_ids_chunk in chunked(user_ids, get_query_chunk_size()):
+            score_lookup = ScoreLookup(course_key, component_keys).load(user_ids_chunk)
+            for column, component_key in zip(columns, component_keys):
+                for user_id in user_ids_chunk:
+                    column.append(score_lookup.get_grade(user_id, component_key))
+        for column_name, column in zip(column_names, columns):
+            data_frame.add_column(column_name, column)
 
         return data_frame
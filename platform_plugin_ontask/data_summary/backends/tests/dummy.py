@@ -1,6 +1,10 @@
 """Dummy data summary for testing purposes."""
 
+import os
+import time
+
 from platform_plugin_ontask.data_summary.backends.base import DataSummary
+from platform_plugin_ontask.data_summary.frame import ColumnarDataFrame, ObjectColumn
 
 
 class DummyDataSummary(DataSummary):
@@ -21,3 +25,61 @@ class DummyDataSummary(DataSummary):
             "block_id_e1d8b56763fe48fbb935f9619220ab53_dummy": {"0": True},
         }
         return data_frame
+
+
+class SlowDummyDataSummary(DataSummary):
+    """Dummy data summary that takes a while to compute, for testing purposes."""
+
+    def get_data_summary(self) -> dict:
+        """
+        Get a dummy data summary after a short delay.
+
+        Returns:
+            dict: A dummy data summary.
+        """
+        time.sleep(0.1)
+        return {
+            "user_id": {"0": 1},
+            "slow_column": {"0": "slow"},
+        }
+
+
+class CourseOnlyDummyDataSummary(DataSummary):
+    """Dummy data summary that is initialized with only the course ID, for testing purposes."""
+
+    def __init__(self, course_id: str):
+        """
+        Initialize the data summary.
+
+        Args:
+            course_id (str): The course ID.
+        """
+        super().__init__(course_id)
+
+    def get_data_summary(self) -> dict:
+        """
+        Get a dummy data summary of the enrolled users.
+
+        Returns:
+            dict: A dummy data summary.
+        """
+        return {"user_id": {str(index): user.id for index, user in enumerate(self.enrollments)}}
+
+
+class ProcessDummyDataSummary(DataSummary):
+    """Dummy data summary with the ID of the process that computed each row, for testing purposes."""
+
+    def get_data_summary(self) -> ColumnarDataFrame:
+        """
+        Get a dummy data summary of the enrolled users after a short delay.
+
+        The delay keeps each pool process busy, so each range of users is
+        computed by a different process.
+
+        Returns:
+            ColumnarDataFrame: A dummy data summary.
+        """
+        time.sleep(0.1)
+        data_frame = ColumnarDataFrame(user.id for user in self.enrollments)
+        data_frame.add_column("pid", ObjectColumn(os.getpid() for _ in self.enrollments))
+        return data_frame
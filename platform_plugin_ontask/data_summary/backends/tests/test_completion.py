@@ -3,7 +3,11 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+from django.test.utils import override_settings
+
 from platform_plugin_ontask.data_summary.backends.completion import UnitCompletionDataSummary
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser
+from platform_plugin_ontask.data_summary.outline import CourseOutline, OutlineUnit
 
 
 class TestUnitCompletionDataSummary(TestCase):
@@ -11,26 +15,28 @@ class TestUnitCompletionDataSummary(TestCase):
 
     def setUp(self):
         self.course_id = "course-v1:edunext+ontask+demo"
-        self.user = Mock(id=1, email="john@doe.com", username="john_doe")
-        self.enrollment = Mock(user=self.user)
+        self.user = EnrolledUser(id=1, email="john@doe.com", username="john_doe", is_active=True)
         self.block_id = "9c56d"
-        self.unit = Mock(usage_key=Mock(block_id=self.block_id), display_name_with_default="Unit 1")
-
-    @patch("platform_plugin_ontask.data_summary.backends.completion.get_user_enrollments")
-    @patch("platform_plugin_ontask.data_summary.backends.completion.get_course_units")
-    @patch("platform_plugin_ontask.data_summary.backends.completion.CompletionService")
-    def test_get_data_summary(
-        self, mock_completion_service: Mock, mock_get_course_units: Mock, mock_get_user_enrollments: Mock
-    ):
-        mock_get_user_enrollments.return_value = [self.enrollment]
-        mock_get_course_units.return_value = [(self.unit, "fake_subsection_name", "fake_section_name")]
-        mock_completion_service = mock_completion_service.return_value
-        mock_completion_service.vertical_is_complete.return_value = True
-
-        completion_data_summary = UnitCompletionDataSummary(self.course_id)
+        self.unit = OutlineUnit(
+            usage_key="unit",
+            block_id=self.block_id,
+            display_name="Unit 1",
+            subsection_name="fake_subsection_name",
+            section_name="fake_section_name",
+            leaf_keys=("problem",),
+        )
+
+    @override_settings(ONTASK_DATA_SUMMARY_VECTORIZED=False)
+    @patch("platform_plugin_ontask.data_summary.backends.completion.get_course_outline")
+    @patch("platform_plugin_ontask.data_summary.lookups.get_block_completions")
+    def test_get_data_summary(self, mock_get_block_completions: Mock, mock_get_course_outline: Mock):
+        mock_get_course_outline.return_value = CourseOutline(version="1", units=(self.unit,), components=())
+        mock_get_block_completions.return_value = [(self.user.id, "problem")]
+
+        completion_data_summary = UnitCompletionDataSummary(self.course_id, [self.user])
         result = completion_data_summary.get_data_summary()
 
         self.assertEqual(result["user_id"][0], self.user.id)
         self.assertIn(self.block_id, list(result.keys())[1])
-        self.assertIn(self.unit.display_name_with_default, list(result.keys())[1])
+        self.assertIn(self.unit.display_name, list(result.keys())[1])
         self.assertTrue(result[f"fake_se..ame> fake_su..ame> Unit 1 {self.block_id} Completed"][0])
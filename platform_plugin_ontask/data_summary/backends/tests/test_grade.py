@@ -3,7 +3,11 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+from django.test.utils import override_settings
+
 from platform_plugin_ontask.data_summary.backends.grade import ComponentGradeDataSummary
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser
+from platform_plugin_ontask.data_summary.outline import CourseOutline, OutlineComponent
 
 
 class TestComponentGradeDataSummary(TestCase):
@@ -11,24 +15,45 @@ class TestComponentGradeDataSummary(TestCase):
 
     def setUp(self):
         self.course_id = "course-v1:edunext+ontask+demo"
-        self.user = Mock(id=1, email="john@doe.com", username="john_doe")
-        self.enrollment = Mock(user=self.user)
+        self.user = EnrolledUser(id=1, email="john@doe.com", username="john_doe", is_active=True)
         self.block_id = "6b7e4"
-        self.component = Mock(usage_key=Mock(block_id=self.block_id), display_name_with_default="fake_component_name")
-
-    @patch("platform_plugin_ontask.data_summary.backends.grade.get_user_enrollments")
-    @patch("platform_plugin_ontask.data_summary.backends.grade.get_course_components")
-    @patch("platform_plugin_ontask.data_summary.backends.grade.get_score")
-    def test_get_data_summary(
-        self, mock_get_score: Mock, mock_get_course_components: Mock, mock_get_user_enrollments: Mock
-    ):
-        mock_get_score.return_value = Mock(grade=1)
-        mock_get_user_enrollments.return_value = [self.enrollment]
-        mock_get_course_components.return_value = [(self.component, "fake_unit_blockid", "fake_unit_name")]
-
-        grade_data_summary = ComponentGradeDataSummary(self.course_id)
+        self.component = OutlineComponent(
+            usage_key="problem",
+            block_id=self.block_id,
+            display_name="fake_component_name",
+            unit_key="unit",
+            unit_block_id="fake_unit_blockid",
+            unit_name="fake_unit_name",
+        )
+
+    @override_settings(ONTASK_DATA_SUMMARY_VECTORIZED=False)
+    @patch("platform_plugin_ontask.data_summary.backends.grade.get_course_outline")
+    @patch("platform_plugin_ontask.data_summary.lookups.get_student_module_grades")
+    def test_get_data_summary(self, mock_get_student_module_grades: Mock, mock_get_course_outline: Mock):
+        mock_get_student_module_grades.return_value = [(self.user.id, self.component.usage_key, 1)]
+        mock_get_course_outline.return_value = CourseOutline(version="1", units=(), components=(self.component,))
+
+        grade_data_summary = ComponentGradeDataSummary(self.course_id, [self.user])
         result = grade_data_summary.get_data_summary()
 
         self.assertEqual(result["user_id"][0], self.user.id)
         self.assertIn("fake_unit_name", list(result.keys())[1])
         self.assertIn("fake_component_name", list(result.keys())[1])
+        self.assertEqual(result[list(result.keys())[1]][0], 1)
+
+    @override_settings(ONTASK_DATA_SUMMARY_VECTORIZED=False)
+    @patch("platform_plugin_ontask.data_summary.backends.grade.get_course_outline")
+    @patch("platform_plugin_ontask.data_summary.lookups.get_student_module_grades")
+    def test_column_name_collision(self, mock_get_student_module_grades: Mock, mock_get_course_outline: Mock):
+        other_component = self.component._replace(usage_key="other-problem", block_id=f"other{self.block_id}")
+        mock_get_student_module_grades.return_value = [(self.user.id, other_component.usage_key, 1)]
+        mock_get_course_outline.return_value = CourseOutline(
+            version="1", units=(), components=(self.component, other_component)
+        )
+
+        grade_data_summary = ComponentGradeDataSummary(self.course_id, [self.user])
+        result = grade_data_summary.get_data_summary()
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result[f"fake_unit_name(ockid)> fake_component_name {self.block_id} Grade"][0], 0)
+        self.assertEqual(result[f"fake_unit_name(ockid)> fake_component_name other{self.block_id} Grade"][0], 1)
@@ -0,0 +1,38 @@
+"""Tests for the User backend module."""
+
+from unittest import TestCase
+
+from platform_plugin_ontask.data_summary.backends.user import UserDataSummary
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser
+
+
+class TestUserDataSummary(TestCase):
+    """Tests for the User data summary class."""
+
+    def setUp(self):
+        self.course_id = "course-v1:edunext+ontask+demo"
+
+    def test_get_data_summary(self):
+        """Test that the data summary has one row per user of the shared snapshot."""
+        enrollments = [
+            EnrolledUser(id=5, email="test@example.com", username="test", is_active=True),
+            EnrolledUser(id=6, email="author@courses.com", username="author", is_active=False),
+        ]
+
+        result = UserDataSummary(self.course_id, enrollments).get_data_summary()
+
+        self.assertEqual(
+            result,
+            {
+                "user_id": {0: 5, 1: 6},
+                "email": {0: "test@example.com", 1: "author@courses.com"},
+                "username": {0: "test", 1: "author"},
+            },
+        )
+
+    def test_get_data_summary_without_snapshot(self):
+        """Test that the enrollment snapshot is fetched when it is not provided."""
+        result = UserDataSummary(self.course_id).get_data_summary()
+
+        self.assertEqual(result["user_id"], {0: 1, 1: 2, 2: 3})
+        self.assertEqual(result["username"], {0: "user1", 1: "user2", 2: "user3"})
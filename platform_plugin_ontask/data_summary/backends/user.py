@@ -1,9 +1,7 @@
 """Data summary for completion data."""
 
-from collections import defaultdict
-
 from platform_plugin_ontask.data_summary.backends.base import DataSummary
-from platform_plugin_ontask.edxapp_wrapper.enrollments import get_user_enrollments
+from platform_plugin_ontask.data_summary.frame import ColumnarDataFrame, ObjectColumn
 
 
 class UserDataSummary(DataSummary):
@@ -39,19 +37,15 @@ class UserDataSummary(DataSummary):
     EMAIL_COLUMN_NAME = "email"
     USERNAME_COLUMN_NAME = "username"
 
-    def get_data_summary(self) -> dict:
+    def get_data_summary(self) -> ColumnarDataFrame:
         """
         Get the user data summary.
 
         Returns:
-            data_frame (dict): A dataframe with the user data summary
+            data_frame (ColumnarDataFrame): A dataframe with the user data summary
         """
-        enrollments = get_user_enrollments(self.course_id)
-
-        data_frame = defaultdict(dict)
-        for index, enrollment in enumerate(enrollments):
-            data_frame[self.USER_ID_COLUMN_NAME][index] = enrollment.user.id
-            data_frame[self.EMAIL_COLUMN_NAME][index] = enrollment.user.email
-            data_frame[self.USERNAME_COLUMN_NAME][index] = enrollment.user.username
+        data_frame = ColumnarDataFrame((user.id for user in self.enrollments), self.USER_ID_COLUMN_NAME)
+        data_frame.add_column(self.EMAIL_COLUMN_NAME, ObjectColumn(user.email for user in self.enrollments))
+        data_frame.add_column(self.USERNAME_COLUMN_NAME, ObjectColumn(user.username for user in self.enrollments))
 
         return data_frame
@@ -0,0 +1,85 @@
+"""Column naming shared by the data summary backends."""
+
+from __future__ import annotations
+
+import logging
+from typing import Hashable, Iterable
+
+log = logging.getLogger(__name__)
+
+
+def shorten(value: str, length: int) -> str:
+    """
+    Shorten a string to the given length, keeping its start and its end.
+
+    Args:
+        value (str): The string to shorten.
+        length (int): The maximum length of the string.
+
+    Returns:
+        str: The shortened string.
+    """
+    return value[:length - 5] + ".." + value[-3:] if len(value) > length else value
+
+
+class ColumnNamer:
+    """
+    Assign unique column names to the blocks of a data summary.
+
+    Column names are built from truncated display names and the last
+    characters of the block IDs, so two blocks of a large course can get the
+    same name and overwrite each other's column. The namer keeps the names in
+    use and, on a collision, gives the block its fallback name (built with the
+    full block ID) or, as a last resort, a numbered name.
+
+    Example usage:
+
+    ```python
+
+    namer = ColumnNamer(reserved=["user_id"])
+    column_name = namer.add(unit.usage_key, short_name, fallback=full_name)
+
+    ```
+    """
+
+    def __init__(self, reserved: Iterable[str] = ()):
+        """
+        Initialize the namer.
+
+        Args:
+            reserved (Iterable[str]): Column names already in use, such as the
+                user ID column.
+        """
+        self.columns = dict.fromkeys(reserved)
+        self.collisions = []
+
+    def add(self, key: Hashable, name: str, fallback: str | None = None) -> str:
+        """
+        Get a unique column name for a block.
+
+        Args:
+            key (Hashable): The block key.
+            name (str): The preferred column name.
+            fallback (str, optional): The column name to use if the preferred
+                one is already in use.
+
+        Returns:
+            str: The column name of the block.
+        """
+        if name not in self.columns:
+            self.columns[name] = key
+            return name
+
+        self.collisions.append((key, self.columns[name], name))
+        column_name = fallback if fallback is not None and fallback not in self.columns else None
+        counter = 2
+        while column_name is None:
+            candidate = f"{fallback or name} ({counter})"
+            column_name = candidate if candidate not in self.columns else None
+            counter += 1
+        log.warning(
+            f"Column name '{name}' of block {key} is already used by block {self.columns[name]}, "
+            f"using '{column_name}' instead."
+        )
+        self.columns[column_name] = key
+        return column_name
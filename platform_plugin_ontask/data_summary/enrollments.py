@@ -0,0 +1,36 @@
+"""Enrollment snapshot shared by the data summaries of a sync."""
+
+from __future__ import annotations
+
+from typing import Iterable, NamedTuple
+
+from platform_plugin_ontask.edxapp_wrapper.enrollments import get_enrolled_users
+
+
+class EnrolledUser(NamedTuple):
+    """User enrolled in a course, with the only columns used by the data summaries."""
+
+    id: int
+    email: str
+    username: str
+    is_active: bool
+
+
+def get_enrollment_snapshot(course_id: str, user_ids: Iterable[int] | None = None) -> list[EnrolledUser]:
+    """
+    Get the users enrolled in a course.
+
+    The snapshot is fetched once per sync and shared by all the data summaries,
+    instead of each data summary loading the enrollment and user objects.
+
+    Args:
+        course_id (str): The course ID.
+        user_ids (Iterable[int], optional): Only get these users, if they are
+            enrolled.
+
+    Returns:
+        list[EnrolledUser]: The enrolled users.
+    """
+    if user_ids is not None:
+        user_ids = list(user_ids)
+    return [EnrolledUser(*row) for row in get_enrolled_users(course_id, user_ids=user_ids)]
@@ -0,0 +1,609 @@
+"""Columnar data frame shared by the data summary backends."""
+
+from __future__ import annotations
+
+import mmap
+import sys
+import tempfile
+from abc import abstractmethod
+from array import array
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+from django.conf import settings
+
+
+def get_memory_budget() -> int | None:
+    """
+    Get the memory budget of the data frames of the data summaries.
+
+    Returns:
+        int | None: The `ONTASK_DATA_SUMMARY_MEMORY_BUDGET` setting, in bytes,
+            or None if the data frames are kept in memory.
+    """
+    return getattr(settings, "ONTASK_DATA_SUMMARY_MEMORY_BUDGET", None)
+
+
+def get_spill_file():
+    """
+    Open an anonymous temporary file to spill data to.
+
+    The file is created in the `ONTASK_DATA_SUMMARY_SPILL_DIR` directory, the
+    default temporary directory if it is not set, and deleted when it is closed.
+
+    Returns:
+        file: The temporary file, opened in binary mode.
+    """
+    return tempfile.TemporaryFile(prefix="ontask-", dir=getattr(settings, "ONTASK_DATA_SUMMARY_SPILL_DIR", None))
+
+
+class SpillFile:
+    """
+    Temporary file the columns of a data frame are spilled to.
+
+    Each buffer written is memory-mapped back read-only, so its pages are read
+    from the file when they are used and can be dropped by the kernel under
+    memory pressure, instead of being held in the worker memory. The mapped
+    buffers stay valid after the file is closed.
+    """
+
+    def __init__(self):
+        """Open the temporary file."""
+        self.file = get_spill_file()
+        self.size = 0
+
+    def write(self, buffer) -> memoryview:
+        """
+        Write a buffer to the file and map it back.
+
+        Args:
+            buffer: A non-empty bytes-like object, e.g. an `array` or `bytearray`.
+
+        Returns:
+            memoryview: The read-only bytes of the mapped buffer.
+        """
+        data = memoryview(buffer).cast("B")
+        offset = self.size
+        self.file.seek(offset)
+        self.file.write(data)
+        # The mappings must start at a multiple of the allocation granularity.
+        self.size = offset - (-data.nbytes // mmap.ALLOCATIONGRANULARITY) * mmap.ALLOCATIONGRANULARITY
+        self.file.truncate(self.size)
+        self.file.flush()
+        return memoryview(mmap.mmap(self.file.fileno(), data.nbytes, offset=offset, access=mmap.ACCESS_READ))
+
+
+class Column(Mapping):
+    """
+    Column of a `ColumnarDataFrame`.
+
+    A column is a read-only mapping of row index to value, the same shape as
+    the columns of the dict data frames, so it can be chunked and serialized
+    like them. Subclasses store the values in a compact array.
+    """
+
+    def __init__(self, values: Iterable = ()):
+        """
+        Initialize the column.
+
+        Args:
+            values (Iterable): The values of the column, by row.
+        """
+        self.size = 0
+        for value in values:
+            self.append(value)
+
+    @abstractmethod
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the column.
+
+        Args:
+            value: The value of the next row.
+        """
+
+    def extend(self, column: Column) -> None:
+        """
+        Append the rows of another column of the same type.
+
+        Args:
+            column (Column): The column.
+        """
+        for index in range(column.size):
+            self.append(column.get_value(index))
+
+    @property
+    @abstractmethod
+    def nbytes(self) -> int:
+        """The approximate bytes of the values held in memory."""
+
+    def spill(self, spill_file: SpillFile) -> None:
+        """
+        Move the values of the column to a spill file.
+
+        A spilled column is read-only. The columns that cannot be spilled keep
+        their values in memory.
+
+        Args:
+            spill_file (SpillFile): The spill file.
+        """
+
+    @abstractmethod
+    def get_value(self, index: int) -> Any:
+        """
+        Get the value of a row that is known to exist.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            The value of the row.
+        """
+
+    def __contains__(self, index: object) -> bool:
+        """Check whether a row exists."""
+        return isinstance(index, int) and 0 <= index < self.size
+
+    def __getitem__(self, index: int) -> Any:
+        """Get the value of a row."""
+        if index not in self:
+            raise KeyError(index)
+        return self.get_value(index)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the row indexes."""
+        return iter(range(self.size))
+
+    def __len__(self) -> int:
+        """Get the number of rows."""
+        return self.size
+
+    def to_dict(self, start: int = 0, stop: int | None = None) -> dict:
+        """
+        Get the column, or a range of its rows, as a dict of row index to value.
+
+        Args:
+            start (int): The first row index.
+            stop (int, optional): The row index after the last one. Defaults
+                to the number of rows.
+
+        Returns:
+            dict: The column.
+        """
+        stop = self.size if stop is None else min(stop, self.size)
+        return {index: self.get_value(index) for index in range(start, stop)}
+
+
+class BooleanColumn(Column):
+    """
+    Column of booleans, bit-packed.
+
+    Each row uses one bit for its value and one bit to mark it as null, so
+    `None` (e.g. completion tracking disabled) is kept apart from `False`.
+    """
+
+    def __init__(self, values: Iterable[bool | None] = ()):
+        """
+        Initialize the column.
+
+        Args:
+            values (Iterable[bool | None]): The values of the column, by row.
+        """
+        self.bits = bytearray()
+        self.null_bits = bytearray()
+        super().__init__(values)
+
+    @classmethod
+    def from_bits(cls, bits: bytes, size: int, null_bits: bytes | None = None) -> BooleanColumn:
+        """
+        Create a column from its packed bits, e.g. from `numpy.packbits(..., bitorder="little")`.
+
+        Args:
+            bits (bytes): The value bits, the bit `i % 8` of the byte `i // 8`
+                is the value of the row `i`.
+            size (int): The number of rows.
+            null_bits (bytes, optional): The null bits, in the same layout.
+                Defaults to no null values.
+
+        Returns:
+            BooleanColumn: The column.
+        """
+        column = cls()
+        column.bits = bytearray(bits)
+        column.null_bits = bytearray(null_bits) if null_bits is not None else bytearray(len(bits))
+        column.size = size
+        return column
+
+    def append(self, value: bool | None) -> None:
+        """
+        Append a value to the column.
+
+        Args:
+            value (bool | None): The value of the next row.
+        """
+        byte, bit = divmod(self.size, 8)
+        if bit == 0:
+            self.bits.append(0)
+            self.null_bits.append(0)
+        if value is None:
+            self.null_bits[byte] |= 1 << bit
+        elif value:
+            self.bits[byte] |= 1 << bit
+        self.size += 1
+
+    def extend(self, column: BooleanColumn) -> None:
+        """
+        Append the rows of another boolean column.
+
+        The bytes are copied as they are when the column ends on a byte
+        boundary, and the rows are appended one by one otherwise.
+
+        Args:
+            column (BooleanColumn): The column.
+        """
+        if self.size % 8:
+            super().extend(column)
+            return
+        self.bits += column.bits
+        self.null_bits += column.null_bits
+        self.size += column.size
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes of the bits held in memory."""
+        return 0 if isinstance(self.bits, memoryview) else len(self.bits) + len(self.null_bits)
+
+    def spill(self, spill_file: SpillFile) -> None:
+        """
+        Move the bits of the column to a spill file.
+
+        Args:
+            spill_file (SpillFile): The spill file.
+        """
+        if self.size and not isinstance(self.bits, memoryview):
+            self.bits = spill_file.write(self.bits)
+            self.null_bits = spill_file.write(self.null_bits)
+
+    def __getstate__(self) -> dict:
+        """Get the state to pickle, with the spilled bits read back in memory."""
+        return {**self.__dict__, "bits": bytearray(self.bits), "null_bits": bytearray(self.null_bits)}
+
+    def get_value(self, index: int) -> bool | None:
+        """
+        Get the value of a row that is known to exist.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            bool | None: The value of the row.
+        """
+        byte, bit = divmod(index, 8)
+        if self.null_bits[byte] >> bit & 1:
+            return None
+        return bool(self.bits[byte] >> bit & 1)
+
+
+class ArrayColumn(Column):
+    """Column of numbers stored in a typed `array`, see `TYPECODE`."""
+
+    TYPECODE: str
+
+    def __init__(self, values: Iterable = ()):
+        """
+        Initialize the column.
+
+        Args:
+            values (Iterable): The values of the column, by row.
+        """
+        self.values = array(self.TYPECODE)
+        super().__init__(values)
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes) -> ArrayColumn:
+        """
+        Create a column from the machine values of its rows, e.g. from a NumPy array.
+
+        Args:
+            buffer (bytes): The values, in the native byte order and the C type
+                of `TYPECODE`.
+
+        Returns:
+            ArrayColumn: The column.
+        """
+        column = cls()
+        column.values.frombytes(buffer)
+        column.size = len(column.values)
+        return column
+
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the column.
+
+        Args:
+            value: The value of the next row.
+        """
+        self.values.append(value)
+        self.size += 1
+
+    def extend(self, column: ArrayColumn) -> None:
+        """
+        Append the rows of another column of the same type.
+
+        Args:
+            column (ArrayColumn): The column.
+        """
+        self.values.frombytes(memoryview(column.values).cast("B"))
+        self.size += column.size
+
+    @property
+    def nbytes(self) -> int:
+        """The bytes of the values held in memory."""
+        return 0 if isinstance(self.values, memoryview) else self.values.itemsize * self.size
+
+    def spill(self, spill_file: SpillFile) -> None:
+        """
+        Move the values of the column to a spill file.
+
+        Args:
+            spill_file (SpillFile): The spill file.
+        """
+        if self.size and not isinstance(self.values, memoryview):
+            self.values = spill_file.write(self.values).cast(self.TYPECODE)
+
+    def __getstate__(self) -> dict:
+        """Get the state to pickle, with the spilled values read back in memory."""
+        return {**self.__dict__, "values": array(self.TYPECODE, self.values)}
+
+    def get_value(self, index: int) -> Any:
+        """
+        Get the value of a row that is known to exist.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            The value of the row.
+        """
+        return self.values[index]
+
+
+class FloatColumn(ArrayColumn):
+    """
+    Column of floats.
+
+    Values are stored as C doubles, the type of the grade fields, so they are
+    uploaded exactly as they are stored in the database.
+    """
+
+    TYPECODE = "d"
+
+
+class IntegerColumn(ArrayColumn):
+    """Column of 64-bit integers."""
+
+    TYPECODE = "q"
+
+
+class ObjectColumn(Column):
+    """Column of arbitrary values, such as strings."""
+
+    def __init__(self, values: Iterable = ()):
+        """
+        Initialize the column.
+
+        Args:
+            values (Iterable): The values of the column, by row.
+        """
+        self.values = []
+        super().__init__(values)
+
+    def append(self, value: Any) -> None:
+        """
+        Append a value to the column.
+
+        Args:
+            value: The value of the next row.
+        """
+        self.values.append(value)
+        self.size += 1
+
+    @property
+    def nbytes(self) -> int:
+        """The approximate bytes of the list and the values."""
+        return sys.getsizeof(self.values) + sum(sys.getsizeof(value) for value in self.values)
+
+    def get_value(self, index: int) -> Any:
+        """
+        Get the value of a row that is known to exist.
+
+        Args:
+            index (int): The row index.
+
+        Returns:
+            The value of the row.
+        """
+        return self.values[index]
+
+
+class ColumnarDataFrame(Mapping):
+    """
+    Data frame stored by columns, with a shared index of user IDs.
+
+    The dict data frames (`{column: {row_index: value}}`) store a Python int
+    key and a boxed value per cell. This frame stores the user IDs once, as
+    the index column, and each column in a typed array, so its memory grows
+    with the data and not with the Python object overhead.
+
+    The frame is a read-only mapping of column name to column, and each
+    column a read-only mapping of row index to value, so it has the same
+    shape as the dict data frames expected by `OnTaskClient`.
+
+    If the `ONTASK_DATA_SUMMARY_MEMORY_BUDGET` setting is set, the columns
+    added once the frame holds that many bytes in memory are spilled to a
+    temporary file, see `SpillFile`, and read back from it when they are
+    uploaded.
+
+    Example usage:
+
+    ```python
+
+    data_frame = ColumnarDataFrame([5, 6])
+    data_frame.add_column("Unit 1 Completed", BooleanColumn([True, None]))
+    data_frame.to_dict()
+
+    {
+        "user_id": {0: 5, 1: 6},
+        "Unit 1 Completed": {0: True, 1: None},
+    }
+
+    ```
+    """
+
+    def __init__(self, user_ids: Iterable[int], index_name: str = "user_id"):
+        """
+        Initialize the data frame.
+
+        Args:
+            user_ids (Iterable[int]): The user ID of each row.
+            index_name (str): The name of the user ID column.
+        """
+        self.index_name = index_name
+        self.columns = {index_name: IntegerColumn(user_ids)}
+        self.memory_budget = get_memory_budget()
+        self.memory_size = self.user_ids.nbytes
+        self.spill_file = None
+
+    @property
+    def user_ids(self) -> IntegerColumn:
+        """The user ID of each row."""
+        return self.columns[self.index_name]
+
+    def add_column(self, name: str, column: Column) -> Column:
+        """
+        Add a column to the data frame.
+
+        Args:
+            name (str): The column name.
+            column (Column): The column, with one value per row.
+
+        Returns:
+            Column: The column.
+        """
+        if name in self.columns:
+            raise ValueError(f"Column '{name}' already exists.")
+        if len(column) != len(self.user_ids):
+            raise ValueError(f"Column '{name}' has {len(column)} rows instead of {len(self.user_ids)}.")
+        if self.memory_budget is not None and self.memory_size + column.nbytes > self.memory_budget:
+            if self.spill_file is None:
+                self.spill_file = SpillFile()
+            column.spill(self.spill_file)
+        self.memory_size += column.nbytes
+        self.columns[name] = column
+        return column
+
+    def __getitem__(self, name: str) -> Column:
+        """Get a column by name."""
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the column names, starting with the index column."""
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        """Get the number of columns."""
+        return len(self.columns)
+
+    def to_dict(self) -> dict:
+        """
+        Get the data frame as a dict of columns.
+
+        Returns:
+            dict: The data frame, `{column: {row_index: value}}`.
+        """
+        return {name: column.to_dict() for name, column in self.columns.items()}
+
+    def __getstate__(self) -> dict:
+        """Get the state to pickle, without the spill file."""
+        return {**self.__dict__, "spill_file": None}
+
+
+def data_frame_to_dict(data_frame: Mapping) -> dict:
+    """
+    Get a data frame, or a chunk of one, as a dict of dict columns.
+
+    Args:
+        data_frame (Mapping): A `ColumnarDataFrame`, a dict data frame or a
+            dict of columns of any of them.
+
+    Returns:
+        dict: The data frame, `{column: {row_index: value}}`.
+    """
+    return {
+        name: column.to_dict() if isinstance(column, Column) else column
+        for name, column in data_frame.items()
+    }
+
+
+def concat_data_frames(data_frames: list[Mapping], index_name: str = "user_id") -> Mapping:
+    """
+    Concatenate the rows of several data frames of the same data summary.
+
+    The `ColumnarDataFrame` frames with the same columns are concatenated
+    column by column, in a `ColumnarDataFrame`. Other data frames are merged
+    with `merge_data_frames`.
+
+    Args:
+        data_frames (list[Mapping]): The data frames, in row order.
+        index_name (str): The name of the user ID column.
+
+    Returns:
+        Mapping: The data frame.
+    """
+    first = data_frames[0] if data_frames else {}
+    if not all(isinstance(data_frame, ColumnarDataFrame) for data_frame in data_frames) or any(
+        list(data_frame) != list(first) for data_frame in data_frames
+    ):
+        return merge_data_frames(data_frames, index_name)
+
+    concatenated = ColumnarDataFrame((), index_name)
+    for data_frame in data_frames:
+        concatenated.user_ids.extend(data_frame.user_ids)
+    for name, column in first.items():
+        if name == index_name:
+            continue
+        concatenated_column = type(column)()
+        for data_frame in data_frames:
+            concatenated_column.extend(data_frame[name])
+        concatenated.add_column(name, concatenated_column)
+    return concatenated
+
+
+def merge_data_frames(data_frames: Iterable[Mapping], index_name: str = "user_id") -> dict:
+    """
+    Merge the columns of several data frames in a single dict data frame, on the user ID.
+
+    The rows of the same user in different data frames are merged in one row.
+    A user missing from a data frame has no value in its columns.
+
+    Args:
+        data_frames (Iterable[Mapping]): The data frames.
+        index_name (str): The name of the user ID column.
+
+    Returns:
+        dict: The data frame, `{column: {row_index: value}}`.
+    """
+    positions = {}
+    merged = {index_name: {}}
+    for data_frame in data_frames:
+        user_ids = data_frame.get(index_name)
+        if not user_ids:
+            continue
+        columns = [(merged.setdefault(name, {}), column) for name, column in data_frame.items() if name != index_name]
+        for row_index in user_ids:
+            user_id = user_ids[row_index]
+            position = positions.setdefault(user_id, len(positions))
+            merged[index_name][position] = user_id
+            for merged_column, column in columns:
+                merged_column[position] = column[row_index]
+    return merged
@@ -0,0 +1,224 @@
+"""Bulk lookups shared by the data summary backends."""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey
+from xblock.completable import XBlockCompletionMode
+
+from platform_plugin_ontask.edxapp_wrapper.completion import completion_tracking_enabled, get_block_completions
+from platform_plugin_ontask.edxapp_wrapper.courseware import get_student_module_grades
+from platform_plugin_ontask.utils import chunked
+
+DEFAULT_QUERY_CHUNK_SIZE = 1000
+
+
+def get_query_chunk_size() -> int:
+    """
+    Get the maximum number of users included in a single `IN` query.
+
+    Returns:
+        int: The `ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE` setting.
+    """
+    return getattr(settings, "ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE", DEFAULT_QUERY_CHUNK_SIZE)
+
+
+def normalize_block_key(block_key, course_key: CourseKey) -> str:
+    """
+    Get the string form of a block key with the course run filled in.
+
+    Old mongo keys do not include the course run, see
+    `CompletionService.get_completions`.
+
+    Args:
+        block_key (UsageKey): The block key.
+        course_key (CourseKey): The course key.
+
+    Returns:
+        str: The normalized block key.
+    """
+    context_key = getattr(block_key, "context_key", None)
+    if getattr(context_key, "is_course", False) and context_key.run is None:
+        block_key = block_key.replace(course_key=course_key)
+    return str(block_key)
+
+
+def get_completable_children(node) -> list:
+    """
+    Get the completable leaf blocks of a node.
+
+    Same traversal as `CompletionService.get_completable_children`: it only
+    recurses into aggregator blocks and skips excluded ones.
+
+    Args:
+        node (XBlock): The block to traverse.
+
+    Returns:
+        list: The completable leaf blocks.
+    """
+    children = []
+    mode = XBlockCompletionMode.get_mode(node)
+    if mode == XBlockCompletionMode.AGGREGATOR:
+        node_children = (
+            (hasattr(node, "get_child_descriptors") and node.get_child_descriptors())
+            or (hasattr(node, "get_child_blocks") and node.get_child_blocks())
+            or (hasattr(node, "get_children") and node.get_children())
+            or []
+        )
+        for child in node_children:
+            children.extend(get_completable_children(child))
+    elif node and mode == XBlockCompletionMode.COMPLETABLE:
+        children = [node]
+    return children
+
+
+class CompletionLookup:
+    """
+    Bulk replacement of `CompletionService.vertical_is_complete`.
+
+    `CompletionService` queries the completions of a single user each time a
+    vertical is checked. This lookup loads the completed blocks of every user
+    of the course with one query per chunk of users, and then answers the
+    vertical checks in memory.
+
+    Every completable leaf block of the units gets a bit position. The leaf
+    blocks of each unit, and the blocks completed by each user, are stored as
+    integer bit masks, so a unit is complete when all its bits are set in the
+    user mask.
+
+    Example usage:
+
+    ```python
+
+    lookup = CompletionLookup(course_key, {unit.usage_key: unit.leaf_keys for unit in outline.units})
+    lookup.load(user_ids).vertical_is_complete(user_id, unit.usage_key)
+
+    ```
+    """
+
+    def __init__(self, course_key: CourseKey, unit_leaf_keys: dict[str, Iterable[str]]):
+        """
+        Initialize the lookup with the units of the course.
+
+        Args:
+            course_key (CourseKey): The course key.
+            unit_leaf_keys (dict[str, Iterable[str]]): The normalized keys of
+                the completable leaf blocks of each unit, by unit usage key.
+        """
+        self.course_key = course_key
+        self.block_bits = {}
+        self.unit_masks = {}
+        self.user_masks = {}
+        self.tracking_enabled = True
+        for unit_key, leaf_keys in unit_leaf_keys.items():
+            mask = 0
+            for leaf_key in leaf_keys:
+                mask |= self.block_bits.setdefault(leaf_key, 1 << len(self.block_bits))
+            self.unit_masks[unit_key] = mask
+
+    def load(self, user_ids: Iterable[int]) -> CompletionLookup:
+        """
+        Load the completed blocks of the given users.
+
+        Args:
+            user_ids (Iterable[int]): The user IDs.
+
+        Returns:
+            CompletionLookup: The lookup itself.
+        """
+        self.tracking_enabled = completion_tracking_enabled()
+        if not self.tracking_enabled:
+            return self
+
+        for user_ids_chunk in chunked(user_ids, get_query_chunk_size()):
+            for user_id, block_key in get_block_completions(self.course_key, user_ids_chunk):
+                bit = self.block_bits.get(normalize_block_key(block_key, self.course_key))
+                if bit:
+                    self.user_masks[user_id] = self.user_masks.get(user_id, 0) | bit
+        return self
+
+    def vertical_is_complete(self, user_id: int, unit_key: str) -> bool | None:
+        """
+        Check whether a user has completed a unit.
+
+        Args:
+            user_id (int): The user ID.
+            unit_key (str): The unit usage key.
+
+        Returns:
+            bool | None: Whether all the completable blocks of the unit are
+                completed, or None if completion tracking is disabled.
+        """
+        if not self.tracking_enabled:
+            return None
+        unit_mask = self.unit_masks[unit_key]
+        return self.user_masks.get(user_id, 0) & unit_mask == unit_mask
+
+
+class ScoreLookup:
+    """
+    Bulk replacement of `get_score` for the components of a course.
+
+    `get_score` runs one `StudentModule` query per user and component. This
+    lookup loads the grades of every user of the course with one query per
+    chunk of users, and indexes them by `(student_id, module_state_key)`.
+
+    Example usage:
+
+    ```python
+
+    lookup = ScoreLookup(course_key, [component.usage_key for component in outline.components])
+    lookup.load(user_ids).get_grade(user_id, component.usage_key)
+
+    ```
+    """
+
+    def __init__(self, course_key: CourseKey, component_keys: Iterable[str]):
+        """
+        Initialize the lookup with the components of the course.
+
+        Args:
+            course_key (CourseKey): The course key.
+            component_keys (Iterable[str]): The normalized usage keys of the
+                components of the course.
+        """
+        self.course_key = course_key
+        # The index keys share the component key strings instead of holding
+        # a new string per row.
+        self.component_keys = {component_key: component_key for component_key in component_keys}
+        self.grades = {}
+
+    def load(self, user_ids: Iterable[int]) -> ScoreLookup:
+        """
+        Load the grades of the given users.
+
+        Grades of blocks that are not components of the course are skipped.
+
+        Args:
+            user_ids (Iterable[int]): The user IDs.
+
+        Returns:
+            ScoreLookup: The lookup itself.
+        """
+        for user_ids_chunk in chunked(user_ids, get_query_chunk_size()):
+            for student_id, module_state_key, grade in get_student_module_grades(self.course_key, user_ids_chunk):
+                component_key = self.component_keys.get(normalize_block_key(module_state_key, self.course_key))
+                if component_key is not None:
+                    self.grades[(student_id, component_key)] = grade
+        return self
+
+    def get_grade(self, user_id: int, usage_key: str) -> float:
+        """
+        Get the grade of a user in a component.
+
+        Args:
+            user_id (int): The user ID.
+            usage_key (str): The normalized component usage key.
+
+        Returns:
+            float: The grade, or 0 if the user has no grade for the component.
+        """
+        grade = self.grades.get((user_id, usage_key))
+        return grade if grade is not None else 0
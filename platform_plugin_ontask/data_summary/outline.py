@@ -0,0 +1,193 @@
+"""Course outline shared by the data summaries."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.data_summary.lookups import get_completable_children, normalize_block_key
+from platform_plugin_ontask.edxapp_wrapper.modulestore import modulestore
+from platform_plugin_ontask.metrics import measure_stage
+
+CACHE_KEY_PREFIX = "platform_plugin_ontask"
+DEFAULT_CACHE_TIMEOUT = 60 * 60 * 24
+COURSE_VERSION_CACHE_TIMEOUT = 5 * 60
+
+
+class OutlineUnit(NamedTuple):
+    """Unit (vertical) of the course outline."""
+
+    usage_key: str
+    block_id: str
+    display_name: str
+    subsection_name: str
+    section_name: str
+    leaf_keys: tuple[str, ...]
+
+
+class OutlineComponent(NamedTuple):
+    """Component (direct child of a unit) of the course outline."""
+
+    usage_key: str
+    block_id: str
+    display_name: str
+    unit_key: str
+    unit_block_id: str
+    unit_name: str
+
+
+class CourseOutline(NamedTuple):
+    """Flat outline of a course, with the units and components used by the data summaries."""
+
+    version: str
+    units: tuple[OutlineUnit, ...]
+    components: tuple[OutlineComponent, ...]
+
+
+def get_course_outline_cache_key(course_key: CourseKey) -> str:
+    """
+    Get the cache key of the outline of a course.
+
+    Args:
+        course_key (CourseKey): The course key.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.course_outline.{course_key}"
+
+
+def get_course_version_cache_key(course_key: CourseKey) -> str:
+    """
+    Get the cache key of the published version of a course.
+
+    Args:
+        course_key (CourseKey): The course key.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.course_version.{course_key}"
+
+
+def get_course_version(course_key: CourseKey) -> str:
+    """
+    Get the published version of a course.
+
+    The version is cached for a few minutes, so the outlines of the data
+    summaries of a sync, and of the syncs close in time, do not read the
+    modulestore. Only the course block is loaded, without its children.
+
+    Args:
+        course_key (CourseKey): The course key.
+
+    Returns:
+        str: The course version, "None" for the modulestores without versions.
+    """
+    cache_key = get_course_version_cache_key(course_key)
+    version = cache.get(cache_key)
+    if version is None:
+        course = modulestore().get_course(course_key, depth=0)
+        version = str(getattr(course, "course_version", None))
+        cache.set(cache_key, version, timeout=COURSE_VERSION_CACHE_TIMEOUT)
+    return version
+
+
+def build_course_outline(course_key: CourseKey) -> CourseOutline:
+    """
+    Build the outline of a course from the modulestore.
+
+    The whole course tree is loaded at once, and only the fields used by the
+    data summaries are kept: usage keys, display names, parents and the
+    completable leaf blocks of each unit.
+
+    Args:
+        course_key (CourseKey): The course key.
+
+    Returns:
+        CourseOutline: The course outline.
+    """
+    course = modulestore().get_course(course_key, depth=None)
+    units = []
+    components = []
+    for section in course.get_children():
+        for subsection in section.get_children():
+            for unit in subsection.get_children():
+                unit_key = normalize_block_key(unit.usage_key, course_key)
+                unit_name = unit.display_name_with_default
+                units.append(
+                    OutlineUnit(
+                        usage_key=unit_key,
+                        block_id=unit.usage_key.block_id,
+                        display_name=unit_name,
+                        subsection_name=subsection.display_name_with_default,
+                        section_name=section.display_name_with_default,
+                        leaf_keys=tuple(
+                            normalize_block_key(child.scope_ids.usage_id, course_key)
+                            for child in get_completable_children(unit)
+                        ),
+                    )
+                )
+                components.extend(
+                    OutlineComponent(
+                        usage_key=normalize_block_key(component.usage_key, course_key),
+                        block_id=component.usage_key.block_id,
+                        display_name=component.display_name_with_default,
+                        unit_key=unit_key,
+                        unit_block_id=unit.usage_key.block_id,
+                        unit_name=unit_name,
+                    )
+                    for component in unit.get_children()
+                )
+    return CourseOutline(
+        version=str(getattr(course, "course_version", None)),
+        units=tuple(units),
+        components=tuple(components),
+    )
+
+
+def get_course_outline(course_key: CourseKey) -> CourseOutline:
+    """
+    Get the outline of a course.
+
+    The outline is built once and cached, so the data summaries of the same and
+    later syncs do not walk the modulestore again. The cached outline is deleted
+    when the course is published, see `clear_course_outline`, and rebuilt when
+    its version is not the cached published version of the course, in case the
+    publish signal was missed, see `get_course_version`. Building the outline
+    is measured as the `outline` stage.
+
+    Args:
+        course_key (CourseKey): The course key.
+
+    Returns:
+        CourseOutline: The course outline.
+    """
+    cache_key = get_course_outline_cache_key(course_key)
+    course_outline = cache.get(cache_key)
+    if course_outline is None or course_outline.version != get_course_version(course_key):
+        with measure_stage("outline", course_id=str(course_key)) as stage:
+            course_outline = build_course_outline(course_key)
+            stage.values.update(units=len(course_outline.units), components=len(course_outline.components))
+        cache.set(
+            cache_key,
+            course_outline,
+            timeout=getattr(settings, "ONTASK_COURSE_OUTLINE_CACHE_TIMEOUT", DEFAULT_CACHE_TIMEOUT),
+        )
+        cache.set(
+            get_course_version_cache_key(course_key), course_outline.version, timeout=COURSE_VERSION_CACHE_TIMEOUT
+        )
+    return course_outline
+
+
+def clear_course_outline(course_key: CourseKey) -> None:
+    """
+    Delete the cached outline and version of a course.
+
+    Args:
+        course_key (CourseKey): The course key.
+    """
+    cache.delete_many([get_course_outline_cache_key(course_key), get_course_version_cache_key(course_key)])
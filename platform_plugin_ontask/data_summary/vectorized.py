@@ -0,0 +1,216 @@
+"""
+Vectorized builders of the completion and grade columns, used when pandas is installed.
+
+The bulk lookups of `platform_plugin_ontask.data_summary.lookups` normalize
+the block key of every fetched row, and fill the columns cell by cell. These
+builders load the same rows, chunk of users by chunk of users, as pandas
+frames, normalize each distinct block key once, scatter the rows in a learner
+by block NumPy matrix, and reduce it to the unit or component columns, which
+are packed straight into the `ColumnarDataFrame` columns.
+
+The results are the same as the ones of the lookups, see
+`UnitCompletionDataSummary` and `ComponentGradeDataSummary`.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence
+
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.data_summary.frame import BooleanColumn, FloatColumn, get_memory_budget, get_spill_file
+from platform_plugin_ontask.data_summary.lookups import get_query_chunk_size, normalize_block_key
+from platform_plugin_ontask.edxapp_wrapper.completion import completion_tracking_enabled, get_block_completions
+from platform_plugin_ontask.edxapp_wrapper.courseware import get_student_module_grades
+
+try:
+    import numpy
+    import pandas
+except ImportError:  # pragma: no cover
+    numpy = pandas = None
+
+
+def is_vectorized_enabled() -> bool:
+    """
+    Check whether the data summaries use the vectorized builders.
+
+    Returns:
+        bool: Whether pandas is installed and the `ONTASK_DATA_SUMMARY_VECTORIZED`
+            setting is enabled.
+    """
+    return pandas is not None and getattr(settings, "ONTASK_DATA_SUMMARY_VECTORIZED", True)
+
+
+def allocate_matrix(shape: tuple[int, int], dtype) -> numpy.ndarray:
+    """
+    Allocate a matrix of zeros, memory-mapped to a temporary file if it exceeds the memory budget.
+
+    Args:
+        shape (tuple[int, int]): The shape of the matrix.
+        dtype: The NumPy type of the values.
+
+    Returns:
+        numpy.ndarray: The matrix, a `numpy.memmap` over a spill file if it is
+            larger than the `ONTASK_DATA_SUMMARY_MEMORY_BUDGET` setting.
+    """
+    memory_budget = get_memory_budget()
+    if memory_budget is None or not all(shape) or shape[0] * shape[1] * numpy.dtype(dtype).itemsize <= memory_budget:
+        return numpy.zeros(shape, dtype=dtype)
+    return numpy.memmap(get_spill_file(), dtype=dtype, mode="w+", shape=shape)
+
+
+def iter_query_chunks(query, course_key: CourseKey, user_ids: Sequence[int], columns: list[str]) -> Iterator[tuple]:
+    """
+    Load the rows of a backend query as pandas frames, one per chunk of users.
+
+    Args:
+        query: The backend function, called with the course key and the user
+            IDs of a chunk, e.g. `get_block_completions`.
+        course_key (CourseKey): The course key.
+        user_ids (Sequence[int]): The user IDs, one per row of the data summary.
+        columns (list[str]): The names of the columns of the query rows, the
+            user ID first and the block key second.
+
+    Yields:
+        tuple: The offset of the chunk in `user_ids`, the rows as a
+            `pandas.DataFrame`, the row of each query row in the chunk (-1 if
+            its user is not in the chunk), the code of the block key of each
+            query row, and the normalized block key of each code.
+    """
+    chunk_size = get_query_chunk_size()
+    for offset in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[offset:offset + chunk_size]
+        rows = pandas.DataFrame.from_records(list(query(course_key, chunk)), columns=columns)
+        block_keys = rows[columns[1]]
+        block_codes, _ = pandas.factorize(get_block_ids(block_keys), use_na_sentinel=False)
+        _, first_rows = numpy.unique(block_codes, return_index=True)
+        normalized_keys = [normalize_block_key(block_keys.iat[row], course_key) for row in first_rows]
+        user_rows = pandas.Index(chunk).get_indexer(rows[columns[0]])
+        yield offset, rows, user_rows, block_codes, normalized_keys
+
+
+def get_block_ids(block_keys) -> numpy.ndarray:
+    """
+    Get a string that identifies each block key of a course query.
+
+    Hashing the opaque keys, or getting their string form, is several times
+    slower than the whole vectorized build, and the rows of a query filtered by
+    course only differ by the block type and ID of their keys. Other keys are
+    identified by their string form.
+
+    Args:
+        block_keys (pandas.Series): The block keys of the rows.
+
+    Returns:
+        numpy.ndarray: The identifier of each block key.
+    """
+    try:
+        block_ids = [f"{block_key.block_type}@{block_key.block_id}" for block_key in block_keys]
+    except AttributeError:
+        block_ids = [str(block_key) for block_key in block_keys]
+    return numpy.array(block_ids, dtype=object)
+
+
+def get_block_columns(block_codes, normalized_keys: list[str], block_indexes: dict[str, int]):
+    """
+    Get the matrix column of each query row from the codes of its block key.
+
+    Args:
+        block_codes (numpy.ndarray): The code of the block key of each row.
+        normalized_keys (list[str]): The normalized block key of each code.
+        block_indexes (dict[str, int]): The matrix column of each block key.
+
+    Returns:
+        numpy.ndarray: The column of each row, -1 for the blocks not in the
+            matrix.
+    """
+    code_columns = numpy.array([block_indexes.get(key, -1) for key in normalized_keys], dtype=numpy.intp)
+    return code_columns[block_codes]
+
+
+def get_unit_completion_columns(
+    course_key: CourseKey, user_ids: Sequence[int], unit_leaf_keys: Sequence[Iterable[str]]
+) -> list[BooleanColumn]:
+    """
+    Get the completion column of each unit.
+
+    The completed leaf blocks of each chunk of users are scattered in a
+    learner by leaf boolean matrix, multiplied by the leaf by unit membership
+    matrix to count the completed leaves of each unit, and a unit is complete
+    when all its leaves are.
+
+    Args:
+        course_key (CourseKey): The course key.
+        user_ids (Sequence[int]): The user IDs, one per row.
+        unit_leaf_keys (Sequence[Iterable[str]]): The normalized keys of the
+            completable leaf blocks of each unit.
+
+    Returns:
+        list[BooleanColumn]: The columns, in the order of the units, None for
+            every row if completion tracking is disabled.
+    """
+    leaf_columns = {}
+    membership = []
+    for unit_index, leaf_keys in enumerate(unit_leaf_keys):
+        for leaf_key in leaf_keys:
+            membership.append((leaf_columns.setdefault(leaf_key, len(leaf_columns)), unit_index))
+    units = len(unit_leaf_keys)
+    byte_count = (len(user_ids) + 7) // 8
+
+    if not completion_tracking_enabled():
+        null_column = BooleanColumn.from_bits(bytes(byte_count), len(user_ids), null_bits=b"\xff" * byte_count)
+        return [null_column] * units
+
+    unit_leaves = numpy.zeros((len(leaf_columns), units), dtype=numpy.float32)
+    if membership:
+        leaf_indexes, unit_indexes = numpy.array(membership).T
+        unit_leaves[leaf_indexes, unit_indexes] = 1
+    unit_sizes = unit_leaves.sum(axis=0)
+
+    complete = allocate_matrix((len(user_ids), units), bool)
+    for offset, _, user_rows, block_codes, normalized_keys in iter_query_chunks(
+        get_block_completions, course_key, user_ids, ["user_id", "block_key"]
+    ):
+        chunk_size = min(get_query_chunk_size(), len(user_ids) - offset)
+        row_columns = get_block_columns(block_codes, normalized_keys, leaf_columns)
+        selected = (user_rows >= 0) & (row_columns >= 0)
+        completed = numpy.zeros((chunk_size, len(leaf_columns)), dtype=numpy.float32)
+        completed[user_rows[selected], row_columns[selected]] = 1
+        complete[offset:offset + chunk_size] = completed @ unit_leaves == unit_sizes
+
+    bits = numpy.packbits(complete.T, axis=1, bitorder="little")
+    return [BooleanColumn.from_bits(unit_bits.tobytes(), len(user_ids)) for unit_bits in bits]
+
+
+def get_component_grade_columns(
+    course_key: CourseKey, user_ids: Sequence[int], component_keys: Sequence[str]
+) -> Iterator[FloatColumn]:
+    """
+    Get the grade column of each component.
+
+    The grades of each chunk of users are scattered in a learner by component
+    matrix of zeros, so a user without a grade in a component gets 0.
+
+    Args:
+        course_key (CourseKey): The course key.
+        user_ids (Sequence[int]): The user IDs, one per row.
+        component_keys (Sequence[str]): The normalized usage keys of the
+            components.
+
+    Returns:
+        Iterator[FloatColumn]: The columns, in the order of the components,
+            created one at a time, so each one can be spilled before the next.
+    """
+    component_columns = {component_key: index for index, component_key in enumerate(component_keys)}
+    # Each column is stored contiguously, so it can be copied to its array.
+    grades = allocate_matrix((len(component_keys), len(user_ids)), numpy.float64)
+    for offset, rows, user_rows, block_codes, normalized_keys in iter_query_chunks(
+        get_student_module_grades, course_key, user_ids, ["student_id", "module_state_key", "grade"]
+    ):
+        row_columns = get_block_columns(block_codes, normalized_keys, component_columns)
+        row_grades = rows["grade"].to_numpy(dtype=numpy.float64, na_value=0)
+        selected = (user_rows >= 0) & (row_columns >= 0)
+        grades[row_columns[selected], offset + user_rows[selected]] = row_grades[selected]
+
+    return (FloatColumn.from_buffer(component_grades.tobytes()) for component_grades in grades)
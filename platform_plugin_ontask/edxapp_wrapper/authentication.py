@@ -2,17 +2,14 @@
 Authentication generalized definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_ontask.edxapp_wrapper.registry import get_backend
 
 
 def get_bearer_authentication_allow_inactive_user_class():
     """
     Wrapper for `openedx.core.lib.api.authentication.BearerAuthenticationAllowInactiveUser`.
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_AUTHENTICATION_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_AUTHENTICATION_BACKEND")
 
     return backend.BearerAuthenticationAllowInactiveUser
 
@@ -3,4 +3,45 @@ Completion service module definitions for Open edX Redwood release.
 """
 
 # pylint: disable=unused-import
+from completion.models import BlockCompletion
 from completion.services import CompletionService
+from completion.waffle import ENABLE_COMPLETION_TRACKING_SWITCH
+
+
+def get_block_completions(course_key, user_ids):
+    """
+    get_block_completions backend.
+
+    Returns an iterator of `(user_id, block_key)` tuples with the blocks the
+    given users have completed in the course. Only the two needed columns are
+    fetched, using the `(course_key, user)` part of the model indexes.
+    """
+    return (
+        BlockCompletion.objects.filter(
+            context_key=course_key,
+            user_id__in=user_ids,
+            completion__gte=1.0,
+        )
+        .values_list("user_id", "block_key")
+        .iterator()
+    )
+
+
+def get_users_with_completions_since(course_key, since):
+    """
+    get_users_with_completions_since backend.
+
+    Returns the IDs of the users with completions modified since the given date.
+    """
+    return (
+        BlockCompletion.objects.filter(context_key=course_key, modified__gte=since)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+def completion_tracking_enabled():
+    """
+    completion_tracking_enabled backend.
+    """
+    return ENABLE_COMPLETION_TRACKING_SWITCH.is_enabled()
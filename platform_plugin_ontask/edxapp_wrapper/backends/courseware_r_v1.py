@@ -4,3 +4,36 @@ Courseware definitions for Open edX Redwood release.
 
 # pylint: disable=import-error, unused-import
 from lms.djangoapps.courseware.model_data import get_score
+from lms.djangoapps.courseware.models import StudentModule
+from lms.djangoapps.grades.signals.signals import PROBLEM_WEIGHTED_SCORE_CHANGED
+
+
+def get_student_module_grades(course_key, user_ids):
+    """
+    get_student_module_grades backend.
+
+    Returns an iterator of `(student_id, module_state_key, grade)` tuples with
+    the non-null grades of the given users in the course.
+    """
+    return (
+        StudentModule.objects.filter(
+            course_id=course_key,
+            student_id__in=user_ids,
+            grade__isnull=False,
+        )
+        .values_list("student_id", "module_state_key", "grade")
+        .iterator()
+    )
+
+
+def get_users_with_student_modules_since(course_key, since):
+    """
+    get_users_with_student_modules_since backend.
+
+    Returns the IDs of the users with student modules modified since the given date.
+    """
+    return (
+        StudentModule.objects.filter(course_id=course_key, modified__gte=since)
+        .values_list("student_id", flat=True)
+        .distinct()
+    )
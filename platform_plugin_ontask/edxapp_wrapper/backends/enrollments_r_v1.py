@@ -2,5 +2,41 @@
 Enrollments definitions for Open edX Redwood release.
 """
 
-# pylint: disable=import-error, unused-import
+# pylint: disable=import-error
+from common.djangoapps.student.models import CourseEnrollment
+from opaque_keys.edx.keys import CourseKey
 from openedx.core.djangoapps.enrollments.data import get_user_enrollments
+
+
+def get_enrolled_users(course_id, user_ids=None):
+    """
+    get_enrolled_users backend.
+
+    Returns the `(user_id, email, username, is_active)` tuples of the users
+    enrolled in the course, or of the given users if they are enrolled. The
+    user columns are fetched with a single join instead of loading the
+    enrollment and user objects.
+    """
+    enrollments = get_user_enrollments(course_id)
+    if user_ids is not None:
+        enrollments = enrollments.filter(user_id__in=user_ids)
+    return enrollments.values_list(
+        "user_id",
+        "user__email",
+        "user__username",
+        "user__is_active",
+    )
+
+
+def get_users_with_enrollment_changes_since(course_id, since):
+    """
+    get_users_with_enrollment_changes_since backend.
+
+    Returns the IDs of the users whose enrollment was created, activated,
+    deactivated or changed since the given date, from the enrollment history.
+    """
+    return (
+        CourseEnrollment.history.filter(course_id=CourseKey.from_string(str(course_id)), history_date__gte=since)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
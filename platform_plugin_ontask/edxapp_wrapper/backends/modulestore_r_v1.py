@@ -2,9 +2,9 @@
 Modulestore definitions for Open edX Redwood release.
 """
 
-# pylint: disable=import-error
+# pylint: disable=import-error, unused-import
 from xmodule.modulestore import ModuleStoreEnum
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import SignalHandler, modulestore
 
 
 def update_item(course_key, course_block, user_id):
@@ -17,3 +17,12 @@ def update_item(course_key, course_block, user_id):
         with modulestore().branch_setting(ModuleStoreEnum.Branch.draft_preferred):
             modulestore().update_item(course_block, user_id)
         return modulestore().update_item(course_block, user_id)
+
+
+def get_courses(**kwargs):
+    """
+    get_courses backend.
+
+    Returns the course blocks of all the courses, without their children.
+    """
+    return modulestore().get_courses(**kwargs)
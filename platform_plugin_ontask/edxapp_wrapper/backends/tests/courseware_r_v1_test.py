@@ -2,4 +2,21 @@
 Courseware test definitions for Open edX Redwood release.
 """
 
+from django.dispatch import Signal
+
 get_score = object
+PROBLEM_WEIGHTED_SCORE_CHANGED = Signal()
+
+
+def get_student_module_grades(*args, **kwargs):
+    """
+    get_student_module_grades test backend.
+    """
+    return []
+
+
+def get_users_with_student_modules_since(*args, **kwargs):
+    """
+    get_users_with_student_modules_since test backend.
+    """
+    return []
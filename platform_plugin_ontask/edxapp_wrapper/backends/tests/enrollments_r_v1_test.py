@@ -14,3 +14,25 @@ def get_user_enrollments(*args, **kwargs):
         Mock(user=Mock(id=2)),
         Mock(user=Mock(id=3)),
     ]
+
+
+def get_enrolled_users(course_id, user_ids=None):  # pylint: disable=unused-argument
+    """
+    get_enrolled_users test backend.
+    """
+    return [
+        user
+        for user in [
+            (1, "user1@example.com", "user1", True),
+            (2, "user2@example.com", "user2", True),
+            (3, "user3@example.com", "user3", True),
+        ]
+        if user_ids is None or user[0] in user_ids
+    ]
+
+
+def get_users_with_enrollment_changes_since(*args, **kwargs):
+    """
+    get_users_with_enrollment_changes_since test backend.
+    """
+    return []
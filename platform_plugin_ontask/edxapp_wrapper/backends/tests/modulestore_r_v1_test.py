@@ -2,11 +2,28 @@
 Modulestore test definitions for Open edX Redwood release.
 """
 
+from django.dispatch import Signal
+
 modulestore = object
 
 
+class SignalHandler:
+    """
+    SignalHandler test backend.
+    """
+
+    course_published = Signal()
+
+
 def update_item(*args, **kwargs):
     """
     update_item test backend.
     """
     return True
+
+
+def get_courses(*args, **kwargs):
+    """
+    get_courses test backend.
+    """
+    return []
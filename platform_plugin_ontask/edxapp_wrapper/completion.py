@@ -2,19 +2,52 @@
 Completion Service module generalized definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_ontask.edxapp_wrapper.registry import get_backend
 
 
 def get_completion_service_class():
     """
     Wrapper for `completion.services.CompletionService`
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND")
 
     return backend.CompletionService
 
 
+def get_block_completion_model():
+    """
+    Wrapper for `completion.models.BlockCompletion`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND")
+
+    return backend.BlockCompletion
+
+
+def get_block_completions(*args, **kwargs):
+    """
+    Wrapper for the completed `completion.models.BlockCompletion` records of a course.
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND")
+
+    return backend.get_block_completions(*args, **kwargs)
+
+
+def get_users_with_completions_since(*args, **kwargs):
+    """
+    Wrapper for the users with `completion.models.BlockCompletion` records modified since a date.
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND")
+
+    return backend.get_users_with_completions_since(*args, **kwargs)
+
+
+def completion_tracking_enabled(*args, **kwargs):
+    """
+    Wrapper for `completion.waffle.ENABLE_COMPLETION_TRACKING_SWITCH.is_enabled`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COMPLETION_BACKEND")
+
+    return backend.completion_tracking_enabled(*args, **kwargs)
+
+
 CompletionService = get_completion_service_class()
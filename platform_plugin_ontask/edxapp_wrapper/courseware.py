@@ -2,16 +2,40 @@
 Courseware generalized definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_ontask.edxapp_wrapper.registry import get_backend
 
 
 def get_score(*args, **kwargs):
     """
     Wrapper for `openedx.lms.djangoapps.courseware.model_data.get_score`.
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND")
 
     return backend.get_score(*args, **kwargs)
+
+
+def get_student_module_grades(*args, **kwargs):
+    """
+    Wrapper for the graded `lms.djangoapps.courseware.models.StudentModule` records of a course.
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND")
+
+    return backend.get_student_module_grades(*args, **kwargs)
+
+
+def get_users_with_student_modules_since(*args, **kwargs):
+    """
+    Wrapper for the users with `lms.djangoapps.courseware.models.StudentModule` records modified since a date.
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND")
+
+    return backend.get_users_with_student_modules_since(*args, **kwargs)
+
+
+def get_problem_weighted_score_changed_signal():
+    """
+    Wrapper for `lms.djangoapps.grades.signals.signals.PROBLEM_WEIGHTED_SCORE_CHANGED`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND")
+
+    return backend.PROBLEM_WEIGHTED_SCORE_CHANGED
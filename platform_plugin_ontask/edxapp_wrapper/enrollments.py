@@ -2,16 +2,31 @@
 Enrollments generalized definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_ontask.edxapp_wrapper.registry import get_backend
 
 
 def get_user_enrollments(*args, **kwargs):
     """
     Wrapper for `openedx.core.djangoapps.enrollments.data.get_user_enrollments`
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_ENROLLMENTS_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_ENROLLMENTS_BACKEND")
 
     return backend.get_user_enrollments(*args, **kwargs)
+
+
+def get_enrolled_users(*args, **kwargs):
+    """
+    Wrapper for the user columns of `openedx.core.djangoapps.enrollments.data.get_user_enrollments`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_ENROLLMENTS_BACKEND")
+
+    return backend.get_enrolled_users(*args, **kwargs)
+
+
+def get_users_with_enrollment_changes_since(*args, **kwargs):
+    """
+    Wrapper for the users with `common.djangoapps.student.models.CourseEnrollment` changes since a date.
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_ENROLLMENTS_BACKEND")
+
+    return backend.get_users_with_enrollment_changes_since(*args, **kwargs)
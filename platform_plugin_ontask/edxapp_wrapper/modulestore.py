@@ -2,17 +2,14 @@
 Modulestore generalized definitions.
 """
 
-from importlib import import_module
-
-from django.conf import settings
+from platform_plugin_ontask.edxapp_wrapper.registry import get_backend
 
 
 def modulestore(*args, **kwargs):
     """
     Wrapper for `xmodule.modulestore.django.modulestore`
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND")
 
     return backend.modulestore(*args, **kwargs)
 
@@ -21,7 +18,24 @@ def update_item(*args, **kwargs):
     """
     Wrapper for `xmodule.modulestore.django.modulestore.update_item`
     """
-    backend_function = settings.PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND
-    backend = import_module(backend_function)
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND")
 
     return backend.update_item(*args, **kwargs)
+
+
+def get_course_published_signal():
+    """
+    Wrapper for `xmodule.modulestore.django.SignalHandler.course_published`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND")
+
+    return backend.SignalHandler.course_published
+
+
+def get_courses(*args, **kwargs):
+    """
+    Wrapper for `xmodule.modulestore.django.modulestore().get_courses`
+    """
+    backend = get_backend("PLATFORM_PLUGIN_ONTASK_MODULESTORE_BACKEND")
+
+    return backend.get_courses(*args, **kwargs)
@@ -0,0 +1,42 @@
+"""
+Registry of the resolved edxapp_wrapper backends.
+"""
+
+from importlib import import_module
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_backends = {}
+
+
+def get_backend(setting_name: str):
+    """
+    Get the backend module configured in a setting.
+
+    The module is imported the first time it is requested, and then served
+    from the registry until the setting changes.
+
+    Args:
+        setting_name (str): The name of the setting with the backend path.
+
+    Returns:
+        module: The backend module.
+    """
+    try:
+        return _backends[setting_name]
+    except KeyError:
+        backend = _backends[setting_name] = import_module(getattr(settings, setting_name))
+        return backend
+
+
+@receiver(setting_changed)
+def clear_backend(setting: str, **kwargs) -> None:
+    """
+    Forget the backend resolved for a setting when the setting changes.
+
+    Args:
+        setting (str): The name of the changed setting.
+    """
+    _backends.pop(setting, None)
@@ -0,0 +1,232 @@
+"""Streaming JSON encoding and compression of the OnTask request bodies."""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Iterable, Iterator, Mapping
+
+from django.core.exceptions import ImproperlyConfigured
+
+from platform_plugin_ontask.data_summary.frame import Column
+from platform_plugin_ontask.utils import chunked
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+DEFAULT_ITEMS_PER_BLOCK = 1000
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+GZIP_ENCODING = "gzip"
+ZSTD_ENCODING = "zstd"
+DEFAULT_COMPRESSION_LEVELS = {GZIP_ENCODING: 6, ZSTD_ENCODING: 3}
+SCALAR_TYPES = (bool, int, float, str, type(None))
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Encode a value as JSON.
+
+    `orjson` is used when it is installed, with the same output as `json` for
+    the values of the data frames: non-string keys are converted to strings.
+
+    Args:
+        value: The value to encode.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+def iter_json(value: Any, items_per_block: int = DEFAULT_ITEMS_PER_BLOCK) -> Iterator[bytes]:
+    """
+    Encode a value as JSON, piece by piece.
+
+    Mappings are written one item at a time, recursing into the values that
+    are mappings themselves (the data frame and its columns), and the other
+    values are encoded in blocks of `items_per_block` items. The columns of a
+    `ColumnarDataFrame` are encoded by row ranges. Only one block is held in
+    memory as JSON at a time.
+
+    Args:
+        value: The value to encode.
+        items_per_block (int): Maximum number of scalar items encoded at once.
+
+    Returns:
+        Iterator[bytes]: The pieces of the JSON document.
+    """
+    if not isinstance(value, Mapping):
+        yield dumps(value)
+        return
+
+    separator = b"{"
+    if isinstance(value, Column):
+        for start in range(0, len(value), items_per_block):
+            yield separator + dumps(value.to_dict(start, start + items_per_block))[1:-1]
+            separator = b","
+        yield b"{}" if separator == b"{" else b"}"
+        return
+
+    for items in chunked(value.items(), items_per_block):
+        block = {}
+        for key, item in items:
+            if type(item) in SCALAR_TYPES or not isinstance(item, Mapping):
+                block[key] = item
+                continue
+            if block:
+                yield separator + dumps(block)[1:-1]
+                separator = b","
+                block = {}
+            yield separator + dumps(str(key)) + b":"
+            yield from iter_json(item, items_per_block)
+            separator = b","
+        if block:
+            yield separator + dumps(block)[1:-1]
+            separator = b","
+    yield b"{}" if separator == b"{" else b"}"
+
+
+class JSONStream:
+    """
+    Request body that streams a value as JSON.
+
+    `requests` sends iterable bodies with chunked transfer encoding, so the
+    body is never held in memory as a whole. The pieces of `iter_json` are
+    buffered up to `chunk_size` bytes, to avoid sending tiny chunks.
+
+    The stream can be iterated more than once, so the request can be retried.
+    `size` is the number of bytes yielded by the last iteration.
+
+    Example usage:
+
+    ```python
+
+    session.put(url, data=JSONStream({"src_df": data_frame}), headers={"Content-Type": "application/json"})
+
+    ```
+    """
+
+    def __init__(self, value: Any, chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE):
+        """
+        Initialize the stream.
+
+        Args:
+            value: The value to encode.
+            chunk_size (int): Minimum size of the chunks, except the last one.
+        """
+        self.value = value
+        self.chunk_size = chunk_size
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over the chunks of the JSON document."""
+        self.size = 0
+        buffer = []
+        size = 0
+        for piece in iter_json(self.value):
+            buffer.append(piece)
+            size += len(piece)
+            if size >= self.chunk_size:
+                self.size += size
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+        if buffer:
+            self.size += size
+            yield b"".join(buffer)
+
+
+def get_compressor(encoding: str, level: int | None = None):
+    """
+    Get a streaming compressor for a content encoding.
+
+    Args:
+        encoding (str): `gzip` or `zstd`. `zstd` requires `zstandard`.
+        level (int, optional): The compression level. Defaults to 6 for gzip
+            and 3 for zstd.
+
+    Returns:
+        A compressor object with `compress` and `flush` methods.
+    """
+    if encoding not in DEFAULT_COMPRESSION_LEVELS:
+        raise ImproperlyConfigured(f"Unsupported compression: {encoding}.")
+    if level is None:
+        level = DEFAULT_COMPRESSION_LEVELS[encoding]
+    if encoding == GZIP_ENCODING:
+        return zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    if zstandard is None:
+        raise ImproperlyConfigured("zstd compression requires the zstandard package.")
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+class CompressedStream:
+    """
+    Request body that compresses a stream of chunks.
+
+    Each chunk is compressed as it is read, so neither the plain nor the
+    compressed body are held in memory as a whole. Like `JSONStream`, the
+    stream can be iterated more than once, and `size` is the number of bytes
+    yielded by the last iteration.
+
+    Example usage:
+
+    ```python
+
+    session.put(url, data=CompressedStream(JSONStream(payload), "gzip"), headers={"Content-Encoding": "gzip"})
+
+    ```
+    """
+
+    def __init__(self, chunks: Iterable[bytes], encoding: str, level: int | None = None):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks (Iterable[bytes]): The chunks to compress.
+            encoding (str): `gzip` or `zstd`.
+            level (int, optional): The compression level.
+        """
+        self.chunks = chunks
+        self.encoding = encoding
+        self.level = level
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over the compressed chunks."""
+        self.size = 0
+        compressor = get_compressor(self.encoding, self.level)
+        for chunk in self.chunks:
+            compressed_chunk = compressor.compress(chunk)
+            if compressed_chunk:
+                self.size += len(compressed_chunk)
+                yield compressed_chunk
+        compressed_chunk = compressor.flush()
+        self.size += len(compressed_chunk)
+        yield compressed_chunk
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """
+    Compress a request body.
+
+    Args:
+        data (bytes): The body to compress.
+        encoding (str): `gzip` or `zstd`.
+        level (int, optional): The compression level.
+
+    Returns:
+        bytes: The compressed body.
+    """
+    return b"".join(CompressedStream([data], encoding, level))
@@ -0,0 +1,251 @@
+"""Progress records of the course syncs, stored in the Django cache."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from platform_plugin_ontask.sync import CACHE_KEY_PREFIX
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_TIMEOUT = 60 * 60 * 24 * 7
+MAX_ERRORS = 10
+MAX_ERROR_LENGTH = 500
+
+
+def get_sync_job_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the sync job of a course.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.sync_job.{course_id}"
+
+
+class SyncJob:
+    """
+    Progress of the last sync of a course.
+
+    The job keeps, for each data summary, the rows and columns computed, the
+    time spent computing and uploading it, and the chunks uploaded or failed,
+    so the slow stage of a sync can be spotted from the dashboard.
+
+    Example usage:
+
+    ```python
+
+    job = SyncJob.get_or_create(course_id).start()
+    job.add_summary("UserDataSummary", rows=1000, columns=3, seconds=0.5)
+    job.add_chunk("UserDataSummary", response.ok, seconds=0.2, error=None)
+    job.finish(succeeded=True)
+
+    ```
+    """
+
+    def __init__(self, course_id: str, record: dict | None = None):
+        """
+        Initialize the job.
+
+        Args:
+            course_id (str): The course ID.
+            record (dict, optional): The stored record of the job.
+        """
+        self.course_id = course_id
+        self.record = record or {
+            "status": JOB_QUEUED,
+            "queued_at": timezone.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "summaries": {},
+            "errors": [],
+        }
+
+    @classmethod
+    def get(cls, course_id: str) -> SyncJob | None:
+        """
+        Get the stored job of a course.
+
+        Args:
+            course_id (str): The course ID.
+
+        Returns:
+            SyncJob | None: The job, or None if the course was never synced.
+        """
+        record = cache.get(get_sync_job_cache_key(course_id))
+        return cls(course_id, record) if record is not None else None
+
+    @classmethod
+    def create(cls, course_id: str) -> SyncJob:
+        """
+        Store a new queued job for a course, replacing the previous one.
+
+        Args:
+            course_id (str): The course ID.
+
+        Returns:
+            SyncJob: The job.
+        """
+        return cls(course_id).save()
+
+    @classmethod
+    def get_or_create(cls, course_id: str) -> SyncJob:
+        """
+        Get the queued job of a course, or create one.
+
+        Args:
+            course_id (str): The course ID.
+
+        Returns:
+            SyncJob: The job.
+        """
+        job = cls.get(course_id)
+        if job is None or job.status != JOB_QUEUED:
+            job = cls.create(course_id)
+        return job
+
+    @property
+    def status(self) -> str:
+        """`queued`, `running`, `succeeded` or `failed`."""
+        return self.record["status"]
+
+    def save(self) -> SyncJob:
+        """
+        Store the job.
+
+        Returns:
+            SyncJob: The job itself.
+        """
+        cache.set(get_sync_job_cache_key(self.course_id), self.record, timeout=JOB_TIMEOUT)
+        return self
+
+    def start(self) -> SyncJob:
+        """
+        Mark the job as running.
+
+        Returns:
+            SyncJob: The job itself.
+        """
+        self.record.update(status=JOB_RUNNING, started_at=timezone.now().isoformat(), summaries={}, errors=[])
+        return self.save()
+
+    def get_summary(self, name: str) -> dict:
+        """
+        Get the progress of a data summary, adding it if it is new.
+
+        Args:
+            name (str): The data summary name.
+
+        Returns:
+            dict: The progress of the data summary.
+        """
+        return self.record["summaries"].setdefault(
+            name,
+            {
+                "rows": 0,
+                "columns": 0,
+                "compute_seconds": 0.0,
+                "upload_seconds": 0.0,
+                "chunks_uploaded": 0,
+                "chunks_failed": 0,
+                "errors": [],
+            },
+        )
+
+    def add_summary(self, name: str, rows: int, columns: int, seconds: float) -> SyncJob:
+        """
+        Record a computed data frame of a data summary.
+
+        The rows and times of the data frames of the same data summary, e.g.
+        one per shard, are added up.
+
+        Args:
+            name (str): The data summary name.
+            rows (int): The rows of the data frame.
+            columns (int): The columns of the data frame.
+            seconds (float): The time spent computing it.
+
+        Returns:
+            SyncJob: The job itself.
+        """
+        summary = self.get_summary(name)
+        summary["rows"] += rows
+        summary["columns"] = max(summary["columns"], columns)
+        summary["compute_seconds"] += seconds
+        return self.save()
+
+    def add_chunk(self, name: str, ok: bool, seconds: float, error: str | None = None) -> SyncJob:
+        """
+        Record an upload request of a data summary.
+
+        Args:
+            name (str): The data summary name.
+            ok (bool): Whether the request succeeded.
+            seconds (float): The time spent sending it.
+            error (str, optional): The error of a failed request.
+
+        Returns:
+            SyncJob: The job itself.
+        """
+        summary = self.get_summary(name)
+        summary["upload_seconds"] += seconds
+        if ok:
+            summary["chunks_uploaded"] += 1
+        else:
+            summary["chunks_failed"] += 1
+            add_error(summary["errors"], error)
+        return self.save()
+
+    def finish(self, succeeded: bool, error: str | None = None) -> SyncJob:
+        """
+        Mark the job as finished.
+
+        Args:
+            succeeded (bool): Whether all the data was uploaded.
+            error (str, optional): The error that stopped the sync.
+
+        Returns:
+            SyncJob: The job itself.
+        """
+        if error:
+            add_error(self.record["errors"], error)
+        self.record.update(
+            status=JOB_SUCCEEDED if succeeded else JOB_FAILED,
+            finished_at=timezone.now().isoformat(),
+        )
+        return self.save()
+
+    def to_dict(self) -> dict:
+        """
+        Get the job as a dict, with the elapsed time of the sync.
+
+        Returns:
+            dict: The job.
+        """
+        elapsed_seconds = None
+        if self.record["started_at"]:
+            started_at = datetime.fromisoformat(self.record["started_at"])
+            finished_at = self.record["finished_at"]
+            finished_at = datetime.fromisoformat(finished_at) if finished_at else timezone.now()
+            elapsed_seconds = (finished_at - started_at).total_seconds()
+        return {"course_id": self.course_id, **self.record, "elapsed_seconds": elapsed_seconds}
+
+
+def add_error(errors: list, error: str | None) -> None:
+    """
+    Add an error to a list of errors, keeping it short.
+
+    Args:
+        errors (list): The errors.
+        error (str, optional): The error to add.
+    """
+    if len(errors) < MAX_ERRORS:
+        errors.append((error or "Unknown error")[:MAX_ERROR_LENGTH])
@@ -0,0 +1,312 @@
+"""
+Timing and size metrics of the stages of the course syncs.
+
+Each stage of a sync (enrollment fetch, outline walk, data summary computation,
+payload serialization and table requests) is measured with `measure_stage`,
+logged as a structured record, and sent to the metrics backend of the
+`ONTASK_METRICS_BACKEND` setting: `NullMetricsBackend` (the default),
+`StatsdMetricsBackend` or `PrometheusMetricsBackend`.
+
+Example usage:
+
+```python
+
+with measure_stage("compute", tags={"summary": "UserDataSummary"}, course_id=course_id) as stage:
+    data_frame = data_summary.get_data_summary()
+    stage.values.update(rows=len(data_frame["user_id"]), columns=len(data_frame))
+
+```
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+try:
+    import statsd
+except ImportError:  # pragma: no cover
+    statsd = None
+
+try:
+    import prometheus_client
+except ImportError:  # pragma: no cover
+    prometheus_client = None
+
+log = logging.getLogger(__name__)
+
+METRICS_SETTINGS_PREFIX = "ONTASK_METRICS_"
+DEFAULT_METRICS_BACKEND = "platform_plugin_ontask.metrics.NullMetricsBackend"
+DEFAULT_METRICS_PREFIX = "ontask"
+
+_backends = {}
+
+
+class NullMetricsBackend:
+    """
+    Metrics backend that discards the metrics.
+
+    The other backends implement the same two methods. The name of a metric is
+    the stage name, or the stage name and a value name joined by a dot, e.g.
+    `request` or `request.wire_bytes`. The tags of a stage have the same keys
+    every time the stage is measured.
+    """
+
+    def timing(self, name: str, seconds: float, tags: dict) -> None:
+        """
+        Record the duration of a stage.
+
+        Args:
+            name (str): The metric name.
+            seconds (float): The duration.
+            tags (dict): The tags of the stage.
+        """
+
+    def gauge(self, name: str, value: float, tags: dict) -> None:
+        """
+        Record a value measured in a stage.
+
+        Args:
+            name (str): The metric name.
+            value (float): The value.
+            tags (dict): The tags of the stage.
+        """
+
+
+class StatsdMetricsBackend(NullMetricsBackend):
+    """
+    Metrics backend that sends the metrics to statsd.
+
+    statsd has no tags, so the tag values are appended to the metric name, e.g.
+    `ontask.compute.UserDataSummary`. Requires the `statsd` package.
+    """
+
+    def __init__(
+        self, host: str = "localhost", port: int = 8125, prefix: str = DEFAULT_METRICS_PREFIX, client=None
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            host (str): The statsd host.
+            port (int): The statsd port.
+            prefix (str): The prefix of the metric names.
+            client (statsd.StatsClient, optional): The statsd client to use
+                instead of creating one.
+        """
+        if client is None:
+            if statsd is None:
+                raise ImproperlyConfigured("StatsdMetricsBackend requires the statsd package.")
+            client = statsd.StatsClient(host, port, prefix=prefix)
+        self.client = client
+
+    @staticmethod
+    def get_metric_name(name: str, tags: dict) -> str:
+        """
+        Get the statsd name of a metric, with its tag values.
+
+        Args:
+            name (str): The metric name.
+            tags (dict): The tags of the stage.
+
+        Returns:
+            str: The statsd metric name.
+        """
+        stage, _, value_name = name.partition(".")
+        parts = [stage, *(str(tag).replace(".", "_").replace(":", "_") for tag in tags.values()), value_name]
+        return ".".join(part for part in parts if part)
+
+    def timing(self, name: str, seconds: float, tags: dict) -> None:
+        """Send the duration of a stage, in milliseconds."""
+        self.client.timing(self.get_metric_name(name, tags), seconds * 1000)
+
+    def gauge(self, name: str, value: float, tags: dict) -> None:
+        """Send a value measured in a stage."""
+        self.client.gauge(self.get_metric_name(name, tags), value)
+
+
+class PrometheusMetricsBackend(NullMetricsBackend):
+    """
+    Metrics backend that records the metrics in a Prometheus registry.
+
+    The durations are recorded in histograms named `<namespace>_<stage>_seconds`
+    and the values in gauges named `<namespace>_<stage>_<value>`, labelled with
+    the tags of the stage. Exposing the registry is up to the deployment, e.g.
+    with the multiprocess mode of `prometheus_client` in the Celery workers.
+    Requires the `prometheus_client` package.
+    """
+
+    def __init__(self, namespace: str = DEFAULT_METRICS_PREFIX, registry=None):
+        """
+        Initialize the backend.
+
+        Args:
+            namespace (str): The prefix of the metric names.
+            registry (prometheus_client.CollectorRegistry, optional): The
+                registry of the metrics. Defaults to the global registry.
+        """
+        if prometheus_client is None:
+            raise ImproperlyConfigured("PrometheusMetricsBackend requires the prometheus_client package.")
+        self.namespace = namespace
+        self.registry = registry or prometheus_client.REGISTRY
+        self.metrics = {}
+
+    def get_metric(self, metric_class, name: str, tags: dict):
+        """
+        Get a metric of the registry, creating it the first time.
+
+        Args:
+            metric_class: `prometheus_client.Histogram` or `prometheus_client.Gauge`.
+            name (str): The Prometheus metric name, without the namespace.
+            tags (dict): The tags of the stage.
+
+        Returns:
+            The metric, with the labels of the tags.
+        """
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = metric_class(
+                name,
+                f"OnTask sync {name.replace('_', ' ')}.",
+                labelnames=list(tags),
+                namespace=self.namespace,
+                registry=self.registry,
+            )
+        return metric.labels(**tags) if tags else metric
+
+    def timing(self, name: str, seconds: float, tags: dict) -> None:
+        """Observe the duration of a stage."""
+        self.get_metric(prometheus_client.Histogram, f"{name}_seconds", tags).observe(seconds)
+
+    def gauge(self, name: str, value: float, tags: dict) -> None:
+        """Set a value measured in a stage."""
+        self.get_metric(prometheus_client.Gauge, name.replace(".", "_"), tags).set(value)
+
+
+def get_metrics_backend() -> NullMetricsBackend:
+    """
+    Get the metrics backend.
+
+    The backend is the class of the `ONTASK_METRICS_BACKEND` setting, created
+    once with the keyword arguments of the `ONTASK_METRICS_BACKEND_OPTIONS`
+    setting. Unlike the HTTP sessions, the backend is kept after a fork, so
+    the metrics of a Prometheus registry are not registered twice.
+
+    Returns:
+        NullMetricsBackend: The metrics backend.
+    """
+    backend = _backends.get("default")
+    if backend is None:
+        backend_class = import_string(getattr(settings, "ONTASK_METRICS_BACKEND", None) or DEFAULT_METRICS_BACKEND)
+        backend = _backends["default"] = backend_class(
+            **getattr(settings, "ONTASK_METRICS_BACKEND_OPTIONS", {})
+        )
+    return backend
+
+
+@receiver(setting_changed)
+def clear_metrics_backends(setting: str, **kwargs) -> None:
+    """
+    Discard the metrics backends when one of the `ONTASK_METRICS_*` settings changes.
+
+    Args:
+        setting (str): The name of the changed setting.
+    """
+    if setting.startswith(METRICS_SETTINGS_PREFIX):
+        _backends.clear()
+
+
+class Stage:
+    """
+    A measured stage of a sync.
+
+    Attributes:
+        name (str): The stage name.
+        tags (dict): The tags of the metrics, e.g. the data summary name.
+        fields (dict): Extra fields of the log record, e.g. the course ID.
+        values (dict): The numeric values measured in the stage, e.g. rows or
+            bytes, sent as gauges.
+        seconds (float): The duration of the stage, once it finished.
+    """
+
+    def __init__(self, name: str, tags: dict, fields: dict):
+        """
+        Initialize the stage.
+
+        Args:
+            name (str): The stage name.
+            tags (dict): The tags of the metrics.
+            fields (dict): Extra fields of the log record.
+        """
+        self.name = name
+        self.tags = tags
+        self.fields = fields
+        self.values = {}
+        self.seconds = None
+
+    def to_dict(self) -> dict:
+        """
+        Get the structured log record of the stage.
+
+        Returns:
+            dict: The stage name, duration, tags, fields and values.
+        """
+        return {"stage": self.name, "seconds": self.seconds, **self.tags, **self.fields, **self.values}
+
+
+@contextmanager
+def measure_stage(name: str, tags: dict | None = None, **fields) -> Iterator[Stage]:
+    """
+    Measure a stage of a sync.
+
+    When the block exits, the stage is logged with its record in the
+    `ontask_stage` attribute of the log record, for structured log formatters,
+    and its duration and values are sent to the metrics backend. A stage that
+    raises is logged with the exception class in the `error` field, and is not
+    sent to the metrics backend.
+
+    Args:
+        name (str): The stage name.
+        tags (dict, optional): The tags of the metrics. Keep them low
+            cardinality, the course ID belongs in the fields.
+        **fields: Extra fields of the log record.
+
+    Returns:
+        Iterator[Stage]: The stage, to add the values measured in it.
+    """
+    stage = Stage(name, tags or {}, fields)
+    started = time.monotonic()
+    try:
+        yield stage
+    except BaseException as error:
+        stage.fields["error"] = type(error).__name__
+        raise
+    finally:
+        stage.seconds = time.monotonic() - started
+        record_stage(stage)
+
+
+def record_stage(stage: Stage) -> None:
+    """
+    Log a measured stage and send it to the metrics backend.
+
+    Args:
+        stage (Stage): The stage.
+    """
+    record = stage.to_dict()
+    fields = " ".join(f"{key}={value}" for key, value in record.items() if key != "stage")
+    log.info(f"OnTask sync stage {stage.name}: {fields}", extra={"ontask_stage": record})
+    if "error" in stage.fields:
+        return
+    backend = get_metrics_backend()
+    backend.timing(stage.name, stage.seconds, stage.tags)
+    for value_name, value in stage.values.items():
+        backend.gauge(f"{stage.name}.{value_name}", value, stage.tags)
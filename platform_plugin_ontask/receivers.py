@@ -0,0 +1,112 @@
+"""Signal receivers for the OnTask plugin."""
+
+import logging
+
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.data_summary.outline import clear_course_outline
+from platform_plugin_ontask.schedule import clear_periodic_sync_courses
+from platform_plugin_ontask.sync import clear_high_water_marks, get_flush_countdown, is_course_synced, mark_user_dirty
+from platform_plugin_ontask.tasks import flush_dirty_users_task
+
+log = logging.getLogger(__name__)
+
+SOLO_POOL_MODULE = "celery.concurrency.solo"
+
+
+def course_published_handler(sender, course_key: CourseKey, **kwargs) -> None:  # pylint: disable=unused-argument
+    """
+    Invalidate the cached data of a course when it is published.
+
+    The cached outline is deleted, and the high-water marks of the incremental
+    sync are cleared, so the next sync adds the columns of new blocks for
+    every user. The courses of the periodic syncs are listed again, in case
+    the OnTask workflow of the course changed.
+
+    Args:
+        sender: The signal sender.
+        course_key (CourseKey): The key of the published course.
+    """
+    clear_course_outline(course_key)
+    clear_high_water_marks(str(course_key))
+    clear_periodic_sync_courses()
+
+
+def push_user_change(course_id: str, user_id: int) -> None:
+    """
+    Buffer a user whose row changed, and schedule the push of the course if needed.
+
+    Nothing is done unless the `ONTASK_EVENT_SYNC` setting is enabled and the
+    table of the course was synced, so the changes of the courses without an
+    OnTask workflow cost a single cache read. It runs in the request that
+    saved the change, so the errors of the buffer are logged instead of
+    failing the request.
+
+    Args:
+        course_id (str): The course ID.
+        user_id (int): The user ID.
+    """
+    if not getattr(settings, "ONTASK_EVENT_SYNC", False):
+        return
+    try:
+        if not is_course_synced(course_id):
+            return
+        bucket = mark_user_dirty(course_id, user_id)
+        if bucket is not None:
+            flush_dirty_users_task.apply_async((course_id, bucket), countdown=get_flush_countdown(bucket))
+    except Exception:  # pylint: disable=broad-exception-caught
+        log.exception(f"Unable to buffer the change of user {user_id} in {course_id}, it is left to the next sync.")
+
+
+def block_completion_saved_handler(  # pylint: disable=unused-argument
+    sender, instance, raw: bool = False, **kwargs
+) -> None:
+    """
+    Push the row of a user when one of its block completions is saved.
+
+    Args:
+        sender: The `BlockCompletion` model.
+        instance (BlockCompletion): The saved completion.
+        raw (bool): Whether the completion is loaded from a fixture.
+    """
+    if raw:
+        return
+    push_user_change(str(instance.context_key), instance.user_id)
+
+
+def problem_weighted_score_changed_handler(  # pylint: disable=unused-argument
+    sender, user_id: int, course_id: str, **kwargs
+) -> None:
+    """
+    Push the row of a user when its score of a problem changes.
+
+    Args:
+        sender: The signal sender.
+        user_id (int): The user ID.
+        course_id (str): The course ID.
+    """
+    push_user_change(str(course_id), user_id)
+
+
+def worker_started_handler(sender, instance, **kwargs) -> None:
+    """
+    Warn when a Celery worker cannot compute the data summaries in processes.
+
+    Only the workers of the `solo` pool fork the processes set by the
+    `ONTASK_DATA_SUMMARY_PROCESSES` setting: the processes of the `prefork`
+    pool are daemonic, so they cannot have children, and the workers of the
+    `threads` pool run other threads, so forking them is unsafe. The tasks of
+    those workers compute the data summaries in a single process.
+
+    Args:
+        sender (str): The hostname of the worker.
+        instance (celery.apps.worker.Worker): The started worker.
+    """
+    if getattr(settings, "ONTASK_DATA_SUMMARY_PROCESSES", 1) <= 1:
+        return
+    if instance.pool_cls.__module__ != SOLO_POOL_MODULE:
+        log.warning(
+            f"ONTASK_DATA_SUMMARY_PROCESSES is ignored by the {instance.pool_cls.__module__} pool of {sender}, "
+            "the data summaries are computed in a single process. Use the solo pool to compute them in processes."
+        )
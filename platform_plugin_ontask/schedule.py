@@ -0,0 +1,195 @@
+"""Periodic sync schedule of the courses, stored in the Django cache."""
+
+from __future__ import annotations
+
+import logging
+import random
+from typing import Iterable, NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.api.utils import get_api_auth_token
+from platform_plugin_ontask.edxapp_wrapper.modulestore import get_courses, modulestore
+from platform_plugin_ontask.exceptions import APIAuthTokenNotSetError
+from platform_plugin_ontask.sync import CACHE_KEY_PREFIX
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PERIODIC_SYNC_WINDOW = 15 * 60
+DEFAULT_PERIODIC_SYNC_MAX_SYNCS = 10
+SYNC_INTERVAL_SETTING = "ONTASK_SYNC_INTERVAL"
+PERIODIC_SYNC_COURSES_TIMEOUT = 60 * 60
+
+
+class PeriodicSync(NamedTuple):
+    """A course due for a periodic sync."""
+
+    course_id: str
+    workflow_id: str
+    api_auth_token: str
+    overdue: float
+
+
+def get_last_periodic_sync_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the last periodic sync of a course.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.last_periodic_sync.{course_id}"
+
+
+def get_last_periodic_sync(course_id: str) -> float | None:
+    """
+    Get the time a periodic sync of a course was last requested.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        float | None: The UNIX timestamp, or None if it was never requested.
+    """
+    return cache.get(get_last_periodic_sync_cache_key(course_id))
+
+
+def set_last_periodic_sync(course_id: str, timestamp: float) -> None:
+    """
+    Record the time a periodic sync of a course was requested.
+
+    Args:
+        course_id (str): The course ID.
+        timestamp (float): The UNIX timestamp.
+    """
+    cache.set(get_last_periodic_sync_cache_key(course_id), timestamp, timeout=None)
+
+
+def get_periodic_sync_courses_cache_key() -> str:
+    """
+    Get the cache key of the IDs of the courses with an OnTask workflow.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.periodic_sync_courses"
+
+
+def get_periodic_sync_course_blocks() -> list:
+    """
+    Get the course blocks of the courses with an OnTask workflow.
+
+    Listing the course blocks loads every course of the modulestore, so the
+    IDs of the courses with a workflow are cached for an hour, or until a
+    course is published, see `clear_periodic_sync_courses`. Until then, only
+    the blocks of those courses are loaded.
+
+    Returns:
+        list[CourseBlock]: The course blocks, without their children.
+    """
+    cache_key = get_periodic_sync_courses_cache_key()
+    course_ids = cache.get(cache_key)
+    if course_ids is None:
+        course_blocks = [
+            course_block
+            for course_block in get_courses()
+            if course_block.other_course_settings.get("ONTASK_WORKFLOW_ID") is not None
+        ]
+        course_ids = [str(course_block.id) for course_block in course_blocks]
+        cache.set(cache_key, course_ids, timeout=PERIODIC_SYNC_COURSES_TIMEOUT)
+        return course_blocks
+    course_blocks = (modulestore().get_course(CourseKey.from_string(course_id), depth=0) for course_id in course_ids)
+    return [course_block for course_block in course_blocks if course_block is not None]
+
+
+def clear_periodic_sync_courses() -> None:
+    """
+    Forget the cached IDs of the courses with an OnTask workflow.
+
+    It is called when a course is published, since its workflow may have been
+    set or removed in its Other Course Settings.
+    """
+    cache.delete(get_periodic_sync_courses_cache_key())
+
+
+def get_sync_interval(course_block) -> int | None:
+    """
+    Get the time between the periodic syncs of a course.
+
+    The `ONTASK_SYNC_INTERVAL` key of the Other Course Settings overrides the
+    `ONTASK_PERIODIC_SYNC_INTERVAL` setting for the course. An interval of 0
+    disables the periodic syncs of the course.
+
+    Args:
+        course_block (CourseBlock): The course block.
+
+    Returns:
+        int | None: The interval in seconds, or None if the course is not
+            synced periodically.
+    """
+    interval = getattr(settings, "ONTASK_PERIODIC_SYNC_INTERVAL", None)
+    course_interval = course_block.other_course_settings.get(SYNC_INTERVAL_SETTING)
+    if course_interval is not None:
+        try:
+            interval = int(course_interval)
+        except (TypeError, ValueError):
+            log.warning(f"Invalid {SYNC_INTERVAL_SETTING} {course_interval!r} of {course_block.id}, ignoring it.")
+    return interval or None
+
+
+def get_due_syncs(course_blocks: Iterable, now: float) -> list[PeriodicSync]:
+    """
+    Get the courses with an OnTask workflow whose periodic sync is due.
+
+    Args:
+        course_blocks (Iterable[CourseBlock]): The course blocks.
+        now (float): The current UNIX timestamp.
+
+    Returns:
+        list[PeriodicSync]: The due syncs, the most overdue first. A course
+            that was never synced periodically is the most overdue.
+    """
+    due_syncs = []
+    for course_block in course_blocks:
+        workflow_id = course_block.other_course_settings.get("ONTASK_WORKFLOW_ID")
+        interval = get_sync_interval(course_block) if workflow_id is not None else None
+        if interval is None:
+            continue
+        course_id = str(course_block.id)
+        last_sync = get_last_periodic_sync(course_id)
+        overdue = float("inf") if last_sync is None else now - last_sync - interval
+        if overdue < 0:
+            continue
+        try:
+            api_auth_token = get_api_auth_token(course_block)
+        except APIAuthTokenNotSetError:
+            log.warning(f"The OnTask API Auth token of {course_id} is not set, skipping its periodic sync.")
+            continue
+        due_syncs.append(PeriodicSync(course_id, workflow_id, api_auth_token, overdue))
+    return sorted(due_syncs, key=lambda due_sync: due_sync.overdue, reverse=True)
+
+
+def get_countdowns(count: int, window: float, rng: random.Random | None = None) -> list[float]:
+    """
+    Spread the start of a number of syncs across a window.
+
+    The window is split in `count` equal slots, and each sync starts at a
+    random time of its slot, so the syncs are spread evenly, without the
+    clusters of independent random delays, and do not start at the same
+    offset of every window.
+
+    Args:
+        count (int): The number of syncs.
+        window (float): The window in seconds.
+        rng (random.Random, optional): The random generator.
+
+    Returns:
+        list[float]: The delay of each sync, in seconds, in increasing order.
+    """
+    rng = rng or random
+    slot = window / count if count else 0
+    return [(index + rng.random()) * slot for index in range(count)]
@@ -57,3 +57,38 @@ def plugin_settings(settings):
         "platform_plugin_ontask.data_summary.backends.completion.UnitCompletionDataSummary",
         "platform_plugin_ontask.data_summary.backends.grade.ComponentGradeDataSummary",
     ]
+    settings.ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE = 1000
+    settings.ONTASK_API_TIMEOUT = 5
+    settings.ONTASK_UPLOAD_CHUNK_MODE = None
+    settings.ONTASK_UPLOAD_CHUNK_SIZE = 5000
+    settings.ONTASK_UPLOAD_CHUNK_TIMEOUT = 60
+    settings.ONTASK_UPLOAD_CHUNK_RETRIES = 2
+    settings.ONTASK_HTTP_POOL_CONNECTIONS = 10
+    settings.ONTASK_HTTP_POOL_MAXSIZE = 10
+    settings.ONTASK_HTTP_KEEP_ALIVE = True
+    settings.ONTASK_HTTP_MAX_RETRIES = 3
+    settings.ONTASK_HTTP_BACKOFF_FACTOR = 0.5
+    settings.ONTASK_DATA_SUMMARY_MAX_WORKERS = 1
+    settings.ONTASK_INCREMENTAL_SYNC = False
+    settings.ONTASK_COURSE_OUTLINE_CACHE_TIMEOUT = 86400
+    settings.ONTASK_UPLOAD_STREAMING = False
+    settings.ONTASK_UPLOAD_COMPRESSION = None
+    settings.ONTASK_UPLOAD_COMPRESSION_LEVEL = None
+    settings.ONTASK_SYNC_SHARDS = 1
+    settings.ONTASK_SYNC_LOCK_TIMEOUT = 3600
+    settings.ONTASK_METRICS_BACKEND = "platform_plugin_ontask.metrics.NullMetricsBackend"
+    settings.ONTASK_METRICS_BACKEND_OPTIONS = {}
+    settings.ONTASK_PERIODIC_SYNC_INTERVAL = None
+    settings.ONTASK_PERIODIC_SYNC_WINDOW = 900
+    settings.ONTASK_PERIODIC_SYNC_MAX_SYNCS = 10
+    settings.ONTASK_EVENT_SYNC = False
+    settings.ONTASK_EVENT_SYNC_FLUSH_INTERVAL = 5
+    settings.ONTASK_DATA_SUMMARY_VECTORIZED = True
+    # The processes are only forked by the workers of the Celery solo pool: the
+    # workers of the prefork pool are daemonic and cannot have children, and the
+    # workers of the threads pool run other threads, so forking them is unsafe.
+    # The other workers warn when they start and compute in a single process.
+    settings.ONTASK_DATA_SUMMARY_PROCESSES = 1
+    settings.ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS = 1000
+    settings.ONTASK_DATA_SUMMARY_MEMORY_BUDGET = None
+    settings.ONTASK_DATA_SUMMARY_SPILL_DIR = None
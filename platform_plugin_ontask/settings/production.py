@@ -27,3 +27,104 @@ def plugin_settings(settings):
     settings.ONTASK_DATA_SUMMARY_CLASSES = getattr(settings, "ENV_TOKENS", {}).get(
         "ONTASK_DATA_SUMMARY_CLASSES", settings.ONTASK_DATA_SUMMARY_CLASSES
     )
+    settings.ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE", settings.ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE
+    )
+    settings.ONTASK_API_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_API_TIMEOUT", settings.ONTASK_API_TIMEOUT
+    )
+    settings.ONTASK_UPLOAD_CHUNK_MODE = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_CHUNK_MODE", settings.ONTASK_UPLOAD_CHUNK_MODE
+    )
+    settings.ONTASK_UPLOAD_CHUNK_SIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_CHUNK_SIZE", settings.ONTASK_UPLOAD_CHUNK_SIZE
+    )
+    settings.ONTASK_UPLOAD_CHUNK_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_CHUNK_TIMEOUT", settings.ONTASK_UPLOAD_CHUNK_TIMEOUT
+    )
+    settings.ONTASK_UPLOAD_CHUNK_RETRIES = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_CHUNK_RETRIES", settings.ONTASK_UPLOAD_CHUNK_RETRIES
+    )
+    settings.ONTASK_HTTP_POOL_CONNECTIONS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_HTTP_POOL_CONNECTIONS", settings.ONTASK_HTTP_POOL_CONNECTIONS
+    )
+    settings.ONTASK_HTTP_POOL_MAXSIZE = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_HTTP_POOL_MAXSIZE", settings.ONTASK_HTTP_POOL_MAXSIZE
+    )
+    settings.ONTASK_HTTP_KEEP_ALIVE = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_HTTP_KEEP_ALIVE", settings.ONTASK_HTTP_KEEP_ALIVE
+    )
+    settings.ONTASK_HTTP_MAX_RETRIES = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_HTTP_MAX_RETRIES", settings.ONTASK_HTTP_MAX_RETRIES
+    )
+    settings.ONTASK_HTTP_BACKOFF_FACTOR = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_HTTP_BACKOFF_FACTOR", settings.ONTASK_HTTP_BACKOFF_FACTOR
+    )
+    settings.ONTASK_DATA_SUMMARY_MAX_WORKERS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_MAX_WORKERS", settings.ONTASK_DATA_SUMMARY_MAX_WORKERS
+    )
+    settings.ONTASK_INCREMENTAL_SYNC = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_INCREMENTAL_SYNC", settings.ONTASK_INCREMENTAL_SYNC
+    )
+    settings.ONTASK_COURSE_OUTLINE_CACHE_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_COURSE_OUTLINE_CACHE_TIMEOUT", settings.ONTASK_COURSE_OUTLINE_CACHE_TIMEOUT
+    )
+    settings.ONTASK_UPLOAD_STREAMING = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_STREAMING", settings.ONTASK_UPLOAD_STREAMING
+    )
+    settings.ONTASK_UPLOAD_COMPRESSION = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_COMPRESSION", settings.ONTASK_UPLOAD_COMPRESSION
+    )
+    settings.ONTASK_UPLOAD_COMPRESSION_LEVEL = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_UPLOAD_COMPRESSION_LEVEL", settings.ONTASK_UPLOAD_COMPRESSION_LEVEL
+    )
+    settings.ONTASK_SYNC_SHARDS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_SYNC_SHARDS", settings.ONTASK_SYNC_SHARDS
+    )
+    settings.ONTASK_SYNC_LOCK_TIMEOUT = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_SYNC_LOCK_TIMEOUT", settings.ONTASK_SYNC_LOCK_TIMEOUT
+    )
+    settings.ONTASK_METRICS_BACKEND = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_METRICS_BACKEND", settings.ONTASK_METRICS_BACKEND
+    )
+    settings.ONTASK_METRICS_BACKEND_OPTIONS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_METRICS_BACKEND_OPTIONS", settings.ONTASK_METRICS_BACKEND_OPTIONS
+    )
+    settings.ONTASK_PERIODIC_SYNC_INTERVAL = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_PERIODIC_SYNC_INTERVAL", settings.ONTASK_PERIODIC_SYNC_INTERVAL
+    )
+    settings.ONTASK_PERIODIC_SYNC_WINDOW = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_PERIODIC_SYNC_WINDOW", settings.ONTASK_PERIODIC_SYNC_WINDOW
+    )
+    settings.ONTASK_PERIODIC_SYNC_MAX_SYNCS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_PERIODIC_SYNC_MAX_SYNCS", settings.ONTASK_PERIODIC_SYNC_MAX_SYNCS
+    )
+    settings.ONTASK_EVENT_SYNC = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_EVENT_SYNC", settings.ONTASK_EVENT_SYNC
+    )
+    settings.ONTASK_EVENT_SYNC_FLUSH_INTERVAL = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_EVENT_SYNC_FLUSH_INTERVAL", settings.ONTASK_EVENT_SYNC_FLUSH_INTERVAL
+    )
+    settings.ONTASK_DATA_SUMMARY_VECTORIZED = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_VECTORIZED", settings.ONTASK_DATA_SUMMARY_VECTORIZED
+    )
+    settings.ONTASK_DATA_SUMMARY_PROCESSES = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_PROCESSES", settings.ONTASK_DATA_SUMMARY_PROCESSES
+    )
+    settings.ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS", settings.ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS
+    )
+    settings.ONTASK_DATA_SUMMARY_MEMORY_BUDGET = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_MEMORY_BUDGET", settings.ONTASK_DATA_SUMMARY_MEMORY_BUDGET
+    )
+    settings.ONTASK_DATA_SUMMARY_SPILL_DIR = getattr(settings, "ENV_TOKENS", {}).get(
+        "ONTASK_DATA_SUMMARY_SPILL_DIR", settings.ONTASK_DATA_SUMMARY_SPILL_DIR
+    )
+    if settings.ONTASK_PERIODIC_SYNC_INTERVAL:
+        settings.CELERY_BEAT_SCHEDULE = {
+            **getattr(settings, "CELERY_BEAT_SCHEDULE", {}),
+            "platform_plugin_ontask.periodic_sync": {
+                "task": "platform_plugin_ontask.tasks.schedule_periodic_syncs_task",
+                "schedule": settings.ONTASK_PERIODIC_SYNC_WINDOW,
+            },
+        }
@@ -62,6 +62,10 @@ TEMPLATES = [
 
 ROOT_URLCONF = "platform_plugin_ontask.urls"
 
+TIME_ZONE = "UTC"
+
+USE_TZ = True
+
 # Settings for the OnTask plugin
 
 ONTASK_URL = "http://localhost:8000"
@@ -40,6 +40,55 @@ createWorkflow.on('click', () => {
 });
 
 let timeoutId;
+const SYNC_JOB_POLL_INTERVAL = 3000;
+
+const syncStatusMessages = {
+  queued: gettext('Loading dataframe... Please wait a few minutes.'),
+  coalesced: gettext('A data load is already queued for this course. Please wait a few minutes.'),
+  running: gettext('A data load is in progress. The data will be loaded again when it finishes.'),
+};
+
+function formatSyncJob(job) {
+  const elapsed = job.elapsed_seconds === null ? '' : ` (${Math.round(job.elapsed_seconds)}s)`;
+  const lines = [`${gettext('Data load')}: ${gettext(job.status)}${elapsed}`];
+  Object.entries(job.summaries).forEach(([name, summary]) => {
+    lines.push(
+      `${name}: ${summary.rows} ${gettext('rows')}, `
+      + `${summary.compute_seconds.toFixed(1)}s ${gettext('computing')}, `
+      + `${summary.chunks_uploaded} ${gettext('chunks uploaded')} `
+      + `(${summary.upload_seconds.toFixed(1)}s), `
+      + `${summary.chunks_failed} ${gettext('failed')}`,
+    );
+    summary.errors.forEach((error) => lines.push(`  ${error}`));
+  });
+  job.errors.forEach((error) => lines.push(error));
+  return lines.join('\n');
+}
+
+function pollSyncJob(courseId) {
+  fetch(`platform-plugin-ontask/${courseId}/api/v1/table/sync/`, {
+    headers: { 'X-CSRFToken': getCookie('csrftoken') },
+  })
+    .then((response) => {
+      if (!response.ok) {
+        return;
+      }
+      response.json().then((job) => {
+        $('#sync-job-status').text(formatSyncJob(job)).removeClass('hidden');
+        clearTimeout(timeoutId);
+        if (job.status === 'queued' || job.status === 'running') {
+          timeoutId = setTimeout(() => pollSyncJob(courseId), SYNC_JOB_POLL_INTERVAL);
+        } else if (uploadDataframe.data('polling')) {
+          uploadDataframe.data('polling', false);
+          document.location.reload();
+        }
+      });
+    });
+}
+
+if (uploadDataframe.length) {
+  pollSyncJob(uploadDataframe.data('courseId'));
+}
 
 uploadDataframe.on('click', () => {
   const { courseId } = uploadDataframe.data();
@@ -57,14 +106,14 @@ uploadDataframe.on('click', () => {
         });
       }
 
-      $('#upload-dataframe-message').removeClass('hidden');
-
-      clearTimeout(timeoutId);
-      timeoutId = setTimeout(() => {
-        $('#upload-dataframe-message').text('');
-      }, 2000);
+      return response.json().then((data) => {
+        $('#upload-dataframe-message')
+          .text(syncStatusMessages[data.status] || syncStatusMessages.queued)
+          .removeClass('hidden');
 
-      document.location.reload();
+        uploadDataframe.data('polling', true);
+        pollSyncJob(courseId);
+      });
     })
     .catch((error) => {
       $('#upload-dataframe-message')
@@ -0,0 +1,441 @@
+"""Sync state of the OnTask tables, stored in the Django cache."""
+
+from __future__ import annotations
+
+import time
+from datetime import datetime
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.edxapp_wrapper.completion import get_users_with_completions_since
+from platform_plugin_ontask.edxapp_wrapper.courseware import get_users_with_student_modules_since
+from platform_plugin_ontask.edxapp_wrapper.enrollments import get_users_with_enrollment_changes_since
+
+CACHE_KEY_PREFIX = "platform_plugin_ontask"
+DEFAULT_SYNC_LOCK_TIMEOUT = 60 * 60
+SYNC_QUEUED = "queued"
+SYNC_COALESCED = "coalesced"
+SYNC_RUNNING = "running"
+DEFAULT_EVENT_SYNC_FLUSH_INTERVAL = 5
+DIRTY_USERS_TIMEOUT = 60 * 60
+DIRTY_USERS_FLUSH_DELAY = 1
+
+
+def get_high_water_mark_cache_key(course_id: str, workflow_id: str) -> str:
+    """
+    Get the cache key of the high-water mark of a course and workflow.
+
+    Args:
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.high_water_mark.{course_id}.{workflow_id}"
+
+
+def get_high_water_marks_cleared_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the time the high-water marks of a course were cleared.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.high_water_marks_cleared.{course_id}"
+
+
+def get_high_water_mark(course_id: str, workflow_id: str) -> datetime | None:
+    """
+    Get the start time of the last successful sync of a course and workflow.
+
+    Args:
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+
+    Returns:
+        datetime | None: The high-water mark, or None if the table was never
+            synced or the course changed since the sync started.
+    """
+    mark_cache_key = get_high_water_mark_cache_key(course_id, workflow_id)
+    cleared_cache_key = get_high_water_marks_cleared_cache_key(course_id)
+    values = cache.get_many([mark_cache_key, cleared_cache_key])
+    high_water_mark = values.get(mark_cache_key)
+    cleared = values.get(cleared_cache_key)
+    if high_water_mark is None or (cleared is not None and high_water_mark <= cleared):
+        return None
+    return high_water_mark
+
+
+def set_high_water_mark(course_id: str, workflow_id: str, high_water_mark: datetime) -> None:
+    """
+    Record the start time of a successful sync of a course and workflow.
+
+    Each workflow has its own cache key, so concurrent syncs of the workflows
+    of a course do not overwrite each other's marks.
+
+    Args:
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+        high_water_mark (datetime): The start time of the sync.
+    """
+    cache.set(get_high_water_mark_cache_key(course_id, workflow_id), high_water_mark, timeout=None)
+
+
+def clear_high_water_marks(course_id: str) -> None:
+    """
+    Forget the high-water marks of a course, so the next sync is a full sync.
+
+    The marks of every workflow are invalidated at once by recording the time
+    they were cleared: a mark set by a sync that started before it is ignored.
+
+    Args:
+        course_id (str): The course ID.
+    """
+    cache.set(get_high_water_marks_cleared_cache_key(course_id), timezone.now(), timeout=None)
+
+
+def get_changed_user_ids(course_id: str, since: datetime) -> set[int]:
+    """
+    Get the users whose completions, grades or enrollment changed since a date.
+
+    Args:
+        course_id (str): The course ID.
+        since (datetime): The high-water mark.
+
+    Returns:
+        set[int]: The user IDs.
+    """
+    course_key = CourseKey.from_string(course_id)
+    changed_user_ids = set(get_users_with_completions_since(course_key, since))
+    changed_user_ids.update(get_users_with_student_modules_since(course_key, since))
+    changed_user_ids.update(get_users_with_enrollment_changes_since(course_id, since))
+    return changed_user_ids
+
+
+def get_sync_lock_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the sync lock of a course.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.sync_lock.{course_id}"
+
+
+def get_sync_dirty_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the flag that marks a course for a follow-up sync.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.sync_dirty.{course_id}"
+
+
+def get_sync_lock_timeout() -> int:
+    """
+    Get the time after which the sync lock of a course expires.
+
+    It bounds how long a course stays locked if a sync dies without
+    releasing it.
+
+    Returns:
+        int: The `ONTASK_SYNC_LOCK_TIMEOUT` setting.
+    """
+    return getattr(settings, "ONTASK_SYNC_LOCK_TIMEOUT", DEFAULT_SYNC_LOCK_TIMEOUT)
+
+
+def request_sync(course_id: str) -> str:
+    """
+    Request a sync of a course, coalescing it with the sync in progress.
+
+    - If no sync of the course is queued or running, the lock is taken and
+      the caller must queue the sync.
+    - If a sync is queued but has not started yet, it will already pick up the
+      latest data, so nothing else is needed.
+    - If a sync is running, the course is marked dirty, and a single follow-up
+      sync is queued when it finishes.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: `queued`, `coalesced` or `running`.
+    """
+    timeout = get_sync_lock_timeout()
+    if cache.add(get_sync_lock_cache_key(course_id), SYNC_QUEUED, timeout=timeout):
+        return SYNC_QUEUED
+    if cache.get(get_sync_lock_cache_key(course_id)) == SYNC_RUNNING:
+        cache.set(get_sync_dirty_cache_key(course_id), True, timeout=timeout)
+        return SYNC_RUNNING
+    return SYNC_COALESCED
+
+
+def is_sync_pending(course_id: str) -> bool:
+    """
+    Check whether a sync of a course is queued or running.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        bool: Whether the sync lock of the course is taken.
+    """
+    return cache.get(get_sync_lock_cache_key(course_id)) is not None
+
+
+def get_pending_syncs(course_ids: Iterable[str]) -> set[str]:
+    """
+    Get the courses whose sync is queued or running, in a single cache read.
+
+    Args:
+        course_ids (Iterable[str]): The course IDs.
+
+    Returns:
+        set[str]: The IDs of the courses whose sync lock is taken.
+    """
+    cache_keys = {get_sync_lock_cache_key(course_id): course_id for course_id in course_ids}
+    return {cache_keys[cache_key] for cache_key in cache.get_many(cache_keys)}
+
+
+def try_start_sync(course_id: str) -> bool:
+    """
+    Take the sync lock of a course and mark its sync as running, unless a sync is queued or running.
+
+    The periodic syncs take the lock when they start instead of when they are
+    queued, so the **Load data** requests received while they wait for their
+    countdown are queued instead of coalesced with them.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        bool: Whether the lock was taken.
+    """
+    return cache.add(get_sync_lock_cache_key(course_id), SYNC_RUNNING, timeout=get_sync_lock_timeout())
+
+
+def start_sync(course_id: str) -> None:
+    """
+    Mark the sync of a course as running.
+
+    Args:
+        course_id (str): The course ID.
+    """
+    cache.set(get_sync_lock_cache_key(course_id), SYNC_RUNNING, timeout=get_sync_lock_timeout())
+
+
+def refresh_sync(course_id: str) -> None:
+    """
+    Extend the sync lock of a course while its sync makes progress.
+
+    The lock only expires when a sync stops making progress for
+    `ONTASK_SYNC_LOCK_TIMEOUT` seconds, not when a long sync outlives it, so
+    no other sync of the course starts meanwhile. The dirty flag is extended
+    with it, so the follow-up sync is not lost.
+
+    Args:
+        course_id (str): The course ID.
+    """
+    timeout = get_sync_lock_timeout()
+    cache.touch(get_sync_lock_cache_key(course_id), timeout)
+    cache.touch(get_sync_dirty_cache_key(course_id), timeout)
+
+
+def finish_sync(course_id: str) -> bool:
+    """
+    Release the sync lock of a course.
+
+    The lock is released before checking the dirty flag, so a request that
+    arrives meanwhile either takes the lock itself or is seen here, and is
+    never lost.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        bool: Whether the course was marked dirty during the sync and the lock
+            was taken again for the follow-up sync, which the caller must queue.
+    """
+    cache.delete(get_sync_lock_cache_key(course_id))
+    if not cache.delete(get_sync_dirty_cache_key(course_id)):
+        return False
+    return request_sync(course_id) == SYNC_QUEUED
+
+
+def get_table_state_cache_key(workflow_id: str) -> str:
+    """
+    Get the cache key of the table state of a workflow.
+
+    Args:
+        workflow_id (str): The OnTask workflow ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.table_initialized.{workflow_id}"
+
+
+def is_table_initialized(workflow_id: str) -> bool:
+    """
+    Check whether the table of a workflow is known to be initialized.
+
+    Only initialized tables are recorded: a table is never emptied by the
+    plugin, while an empty table could be filled in OnTask meanwhile, and the
+    update of a table that is not empty would replace its data.
+
+    Args:
+        workflow_id (str): The OnTask workflow ID.
+
+    Returns:
+        bool: Whether a table update or merge succeeded in the workflow.
+    """
+    return cache.get(get_table_state_cache_key(workflow_id), False)
+
+
+def set_table_initialized(workflow_id: str) -> None:
+    """
+    Record that the table of a workflow is initialized, so it can be merged.
+
+    Args:
+        workflow_id (str): The OnTask workflow ID.
+    """
+    cache.set(get_table_state_cache_key(workflow_id), True, timeout=None)
+
+
+def get_course_synced_cache_key(course_id: str) -> str:
+    """
+    Get the cache key of the flag that marks a course whose table was synced.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        str: The cache key.
+    """
+    return f"{CACHE_KEY_PREFIX}.course_synced.{course_id}"
+
+
+def is_course_synced(course_id: str) -> bool:
+    """
+    Check whether the table of a course was synced, so its changed users can be pushed.
+
+    It is a single cache read, cheap enough to be checked on every completion
+    and score change.
+
+    Args:
+        course_id (str): The course ID.
+
+    Returns:
+        bool: Whether a sync of the course succeeded.
+    """
+    return cache.get(get_course_synced_cache_key(course_id), False)
+
+
+def set_course_synced(course_id: str) -> None:
+    """
+    Record that the table of a course was synced.
+
+    Args:
+        course_id (str): The course ID.
+    """
+    cache.set(get_course_synced_cache_key(course_id), True, timeout=None)
+
+
+def get_dirty_users_cache_key(course_id: str, bucket: int) -> str:
+    """
+    Get the cache key prefix of the users of a course that changed in a flush interval.
+
+    Args:
+        course_id (str): The course ID.
+        bucket (int): The number of the flush interval since the epoch.
+
+    Returns:
+        str: The cache key prefix.
+    """
+    return f"{CACHE_KEY_PREFIX}.dirty_users.{course_id}.{bucket}"
+
+
+def get_event_sync_flush_interval() -> int:
+    """
+    Get the time the changed users of a course are buffered before being pushed.
+
+    Returns:
+        int: The `ONTASK_EVENT_SYNC_FLUSH_INTERVAL` setting.
+    """
+    return max(getattr(settings, "ONTASK_EVENT_SYNC_FLUSH_INTERVAL", DEFAULT_EVENT_SYNC_FLUSH_INTERVAL), 1)
+
+
+def get_flush_countdown(bucket: int) -> float:
+    """
+    Get the time until the users buffered in a flush interval can be pushed.
+
+    Args:
+        bucket (int): The number of the flush interval since the epoch.
+
+    Returns:
+        float: The seconds until the end of the interval, plus a short delay
+            for the changes buffered at its very end.
+    """
+    return max((bucket + 1) * get_event_sync_flush_interval() - time.time(), 0) + DIRTY_USERS_FLUSH_DELAY
+
+
+def mark_user_dirty(course_id: str, user_id: int) -> int | None:
+    """
+    Buffer a user of a course whose row changed, to be pushed by the flush of the current interval.
+
+    The changes are buffered in one bucket of cache keys per flush interval,
+    without locks, since this runs in the request that saved the change: each
+    user is added once per bucket with `cache.add`, and gets the next slot of
+    the bucket with an atomic `cache.incr`. Each change costs a few cache
+    operations, however many users are buffered.
+
+    Args:
+        course_id (str): The course ID.
+        user_id (int): The user ID.
+
+    Returns:
+        int | None: The bucket, if the user is the first one buffered in it,
+            in which case the caller must schedule its flush, see
+            `get_flush_countdown`.
+    """
+    bucket = int(time.time() // get_event_sync_flush_interval())
+    cache_key = get_dirty_users_cache_key(course_id, bucket)
+    if not cache.add(f"{cache_key}.user.{user_id}", True, timeout=DIRTY_USERS_TIMEOUT):
+        return None
+    cache.add(f"{cache_key}.count", 0, timeout=DIRTY_USERS_TIMEOUT)
+    slot = cache.incr(f"{cache_key}.count")
+    cache.set(f"{cache_key}.{slot}", user_id, timeout=DIRTY_USERS_TIMEOUT)
+    return bucket if slot == 1 else None
+
+
+def pop_dirty_users(course_id: str, bucket: int) -> set[int]:
+    """
+    Take the users of a course buffered in a flush interval, to push their rows.
+
+    Args:
+        course_id (str): The course ID.
+        bucket (int): The number of the flush interval since the epoch.
+
+    Returns:
+        set[int]: The user IDs.
+    """
+    cache_key = get_dirty_users_cache_key(course_id, bucket)
+    slot_keys = [f"{cache_key}.{slot}" for slot in range(1, cache.get(f"{cache_key}.count", 0) + 1)]
+    user_ids = set(cache.get_many(slot_keys).values())
+    cache.delete_many([f"{cache_key}.count", *slot_keys, *(f"{cache_key}.user.{user_id}" for user_id in user_ids)])
+    return user_ids
@@ -1,18 +1,392 @@
 """Celery tasks for the OnTask plugin."""
 
+from __future__ import annotations
+
 import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Iterable, Mapping, NamedTuple
 
-from celery import shared_task
+import billiard.process
+from celery import chord, shared_task
 from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, connections
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
 
-from platform_plugin_ontask.api.utils import get_data_summary_class
-from platform_plugin_ontask.client import OnTaskClient
+from platform_plugin_ontask.api.utils import (
+    get_api_auth_token,
+    get_course_block,
+    get_course_key,
+    get_data_summary_class,
+    get_workflow_id,
+)
+from platform_plugin_ontask.client import OnTaskClient, get_connection_stats, is_empty_table_response
+from platform_plugin_ontask.data_summary.backends.base import DataSummary
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser, get_enrollment_snapshot
+from platform_plugin_ontask.data_summary.frame import concat_data_frames, data_frame_to_dict, merge_data_frames
+from platform_plugin_ontask.data_summary.outline import get_course_outline
+from platform_plugin_ontask.exceptions import (
+    APIAuthTokenNotSetError,
+    CourseNotFoundError,
+    CustomInvalidKeyError,
+    WorkflowIDNotSetError,
+)
+from platform_plugin_ontask.jobs import JOB_RUNNING, SyncJob
+from platform_plugin_ontask.metrics import measure_stage
+from platform_plugin_ontask.schedule import (
+    DEFAULT_PERIODIC_SYNC_MAX_SYNCS,
+    DEFAULT_PERIODIC_SYNC_WINDOW,
+    get_countdowns,
+    get_due_syncs,
+    get_periodic_sync_course_blocks,
+    set_last_periodic_sync,
+)
+from platform_plugin_ontask.sync import (
+    finish_sync,
+    get_changed_user_ids,
+    get_high_water_mark,
+    get_pending_syncs,
+    is_table_initialized,
+    pop_dirty_users,
+    refresh_sync,
+    set_course_synced,
+    set_high_water_mark,
+    set_table_initialized,
+    start_sync,
+    try_start_sync,
+)
+from platform_plugin_ontask.utils import chunked
 
 log = logging.getLogger(__name__)
 
+DEFAULT_DATA_SUMMARY_PROCESS_MIN_ROWS = 1000
+
+# The inputs of the data summaries computed in a pool process, set by the pool
+# initializer in each forked process instead of being pickled for each range.
+_process_inputs = None
+
+
+class DataSummaryResult(NamedTuple):
+    """Data frame of a data summary, with the time spent computing it."""
+
+    name: str
+    data_frame: Mapping
+    seconds: float
+
+
+def compute_data_summary(
+    data_summary_class: DataSummary, course_id: str, enrollments: list[EnrolledUser]
+) -> DataSummaryResult:
+    """
+    Compute the data summary of a class.
+
+    The computation is measured as the `compute` stage, with the rows and
+    columns of the data frame, see `platform_plugin_ontask.metrics`.
+
+    Args:
+        data_summary_class (DataSummary): The data summary class.
+        course_id (str): The course ID.
+        enrollments (list[EnrolledUser]): The enrollment snapshot.
+
+    Returns:
+        DataSummaryResult: The data frame, with the time spent computing it.
+    """
+    name = data_summary_class.__name__
+    with measure_stage("compute", tags={"summary": name}, course_id=course_id) as stage:
+        data_frame = data_summary_class.create(course_id, enrollments).get_data_summary()
+        stage.values.update(rows=get_row_count(data_frame), columns=len(data_frame))
+    return DataSummaryResult(name, data_frame, stage.seconds)
+
+
+def get_row_count(data_frame: Mapping) -> int:
+    """
+    Get the number of rows of a data frame.
+
+    Args:
+        data_frame (Mapping): The data frame.
+
+    Returns:
+        int: The number of values of its `user_id` column.
+    """
+    return len(data_frame.get(OnTaskClient.MERGE_COLUMN, ()))
+
+
+def get_data_summary_in_thread(
+    data_summary_class: DataSummary, course_id: str, enrollments: list[EnrolledUser]
+) -> DataSummaryResult:
+    """
+    Compute the data summary of a class from a worker thread.
+
+    The database connection opened by the thread is closed before returning,
+    since Django does not close the connections of threads it did not create.
+
+    Args:
+        data_summary_class (DataSummary): The data summary class.
+        course_id (str): The course ID.
+        enrollments (list[EnrolledUser]): The enrollment snapshot.
+
+    Returns:
+        DataSummaryResult: The data frame, with the time spent computing it.
+    """
+    try:
+        return compute_data_summary(data_summary_class, course_id, enrollments)
+    finally:
+        connection.close()
+
+
+def get_data_summary_processes(rows: int) -> int:
+    """
+    Get the number of processes used to compute the data summaries of a sync.
+
+    The `ONTASK_DATA_SUMMARY_PROCESSES` setting is capped so each process
+    computes at least `ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS` rows. Processes
+    are only forked from a non-daemonic process, since a daemonic process,
+    such as a prefork Celery worker, is not allowed to have children, and
+    without other live threads, such as the ones of a Celery threads pool,
+    since a forked process would inherit the locks they hold. So only the
+    workers of the Celery `solo` pool fork them, and the other workers warn
+    once when they start, see `receivers.worker_started_handler`.
+
+    Args:
+        rows (int): The number of rows of the data summaries.
+
+    Returns:
+        int: The number of processes, 1 to compute them in this process.
+    """
+    processes = getattr(settings, "ONTASK_DATA_SUMMARY_PROCESSES", 1)
+    min_rows = max(getattr(settings, "ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS", DEFAULT_DATA_SUMMARY_PROCESS_MIN_ROWS), 1)
+    processes = min(processes, math.ceil(rows / min_rows))
+    if processes <= 1:
+        return 1
+    if "fork" not in multiprocessing.get_all_start_methods():
+        log.debug("The data summaries are computed in this process, processes cannot be forked.")
+        return 1
+    if multiprocessing.current_process().daemon or billiard.process.current_process().daemon:
+        log.debug("The data summaries are computed in this process, a daemonic worker cannot fork processes.")
+        return 1
+    if threading.active_count() > 1:
+        log.debug("The data summaries are computed in this process, it cannot fork while other threads run.")
+        return 1
+    return processes
+
+
+def set_process_inputs(course_id: str, data_summary_classes: list, enrollments: list[EnrolledUser]) -> None:
+    """
+    Set the inputs of the data summaries computed in a pool process.
+
+    It is the initializer of the pool processes. Its arguments are inherited
+    by the forked processes, so they are not pickled.
+
+    Args:
+        course_id (str): The course ID.
+        data_summary_classes (list): The data summary classes.
+        enrollments (list[EnrolledUser]): The enrollment snapshot.
+    """
+    global _process_inputs  # pylint: disable=global-statement
+    _process_inputs = (course_id, data_summary_classes, enrollments)
+
+
+def compute_data_summary_rows(class_index: int, start: int, stop: int) -> Mapping:
+    """
+    Compute the data summary of a class for a range of rows, in a pool process.
+
+    The course ID, data summary classes and enrollment snapshot are read from
+    the inputs set by `set_process_inputs`.
+
+    Args:
+        class_index (int): The index of the data summary class.
+        start (int): The first row.
+        stop (int): The row after the last one.
+
+    Returns:
+        Mapping: The data frame of the rows.
+    """
+    course_id, data_summary_classes, enrollments = _process_inputs
+    return data_summary_classes[class_index].create(course_id, enrollments[start:stop]).get_data_summary()
+
+
+def iter_data_summaries_in_processes(
+    course_id: str, data_summary_classes: list, enrollments: list[EnrolledUser], processes: int
+) -> Iterable[DataSummaryResult]:
+    """
+    Compute the data summaries of the data summary classes in a process pool, in the same order.
+
+    The rows of each data summary are split in one range per process, and the
+    data frames of the ranges are concatenated, see `concat_data_frames`. The
+    ranges are multiples of 8 rows, so the bit-packed columns are copied as
+    they are.
+
+    The enrollment snapshot and the classes are shared with the forked
+    processes copy-on-write, as the arguments of the pool initializer, and
+    the course outline is cached before forking, so only the range of rows is
+    sent to each process and only its data frame is sent back. The database and cache connections are closed before
+    forking, so each process opens its own.
+
+    Args:
+        course_id (str): The course ID.
+        data_summary_classes (list): The data summary classes.
+        enrollments (list[EnrolledUser]): The enrollment snapshot.
+        processes (int): The number of processes.
+
+    Returns:
+        Iterable[DataSummaryResult]: The data frames.
+    """
+    get_course_outline(CourseKey.from_string(course_id))
+    range_size = math.ceil(len(enrollments) / processes / 8) * 8
+    ranges = [(start, start + range_size) for start in range(0, len(enrollments), range_size)]
+    connections.close_all()
+    caches.close_all()
+    with ProcessPoolExecutor(
+        max_workers=len(ranges),
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=set_process_inputs,
+        initargs=(course_id, data_summary_classes, enrollments),
+    ) as executor:
+        for class_index, data_summary_class in enumerate(data_summary_classes):
+            name = data_summary_class.__name__
+            with measure_stage("compute", tags={"summary": name}, course_id=course_id, processes=len(ranges)) as stage:
+                futures = [
+                    executor.submit(compute_data_summary_rows, class_index, start, stop) for start, stop in ranges
+                ]
+                data_frame = concat_data_frames([future.result() for future in futures])
+                stage.values.update(rows=get_row_count(data_frame), columns=len(data_frame))
+            yield DataSummaryResult(name, data_frame, stage.seconds)
+
+
+def iter_data_summaries(
+    course_id: str, data_summary_classes: list, enrollments: list[EnrolledUser]
+) -> Iterable[DataSummaryResult]:
+    """
+    Compute the data summaries of the data summary classes, in the same order.
+
+    If the `ONTASK_DATA_SUMMARY_PROCESSES` setting is greater than 1, the rows of
+    each data summary are computed in a process pool, see
+    `iter_data_summaries_in_processes`. Otherwise, if the
+    `ONTASK_DATA_SUMMARY_MAX_WORKERS` setting is greater than 1, the data
+    summaries are computed concurrently in a bounded thread pool. Each data frame
+    is yielded as soon as it and all the previous ones are ready, so the merges
+    keep a deterministic order.
+
+    All the data summaries share the same enrollment snapshot.
+
+    Args:
+        course_id (str): The course ID.
+        data_summary_classes (list): The data summary classes.
+        enrollments (list[EnrolledUser]): The enrollment snapshot.
+
+    Returns:
+        Iterable[DataSummaryResult]: The data frames.
+    """
+    processes = get_data_summary_processes(len(enrollments)) if data_summary_classes else 1
+    if processes > 1:
+        yield from iter_data_summaries_in_processes(course_id, data_summary_classes, enrollments, processes)
+        return
+
+    max_workers = min(getattr(settings, "ONTASK_DATA_SUMMARY_MAX_WORKERS", 1), len(data_summary_classes))
+    if max_workers <= 1:
+        for data_summary_class in data_summary_classes:
+            yield compute_data_summary(data_summary_class, course_id, enrollments)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ontask-data-summary") as executor:
+        futures = [
+            executor.submit(get_data_summary_in_thread, data_summary_class, course_id, enrollments)
+            for data_summary_class in data_summary_classes
+        ]
+        for future in futures:
+            yield future.result()
+
+
+def get_data_summary_classes(data_summary_class_paths: list[str]) -> list:
+    """
+    Get the data summary classes of the given paths.
+
+    The paths that do not match a data summary class are logged and skipped.
+
+    Args:
+        data_summary_class_paths (list[str]): The data summary class paths.
+
+    Returns:
+        list: The data summary classes.
+    """
+    data_summary_classes = []
+    for data_summary_class_path in data_summary_class_paths:
+        data_summary_class = get_data_summary_class(data_summary_class_path)
+        if data_summary_class is None:
+            log.error(f"Data summary class {data_summary_class_path} not found.")
+            continue
+        data_summary_classes.append(data_summary_class)
+    return data_summary_classes
+
+
+def upload_data_summaries(
+    workflow_id: str, api_auth_token: str, results: Iterable[DataSummaryResult], job: SyncJob
+) -> bool:
+    """
+    Merge the data frame of each data summary in the OnTask table of a workflow, in order.
+
+    If the `ONTASK_UPLOAD_CHUNK_MODE` setting is set, each data frame is merged
+    in chunks of rows or columns. The progress of each data summary is recorded
+    in the sync job, and the sync lock of the course is extended as each data
+    summary is computed and after each upload request, see `refresh_sync`.
+
+    A merge rejected because the table of the workflow is empty is sent again
+    as a table update. Whether the table is initialized is recorded after the
+    first upload, or when the workflow is created, and is never probed, since
+    OnTask has no read-only way to tell an empty table.
+
+    Args:
+        workflow_id (str): The OnTask workflow ID.
+        api_auth_token (str): The OnTask API authentication token.
+        results (Iterable[DataSummaryResult]): The data frames.
+        job (SyncJob): The sync job.
+
+    Returns:
+        bool: Whether all the data frames were merged.
+    """
+    succeeded = True
+    table_initialized = is_table_initialized(workflow_id)
+    ontask_client = OnTaskClient(settings.ONTASK_INTERNAL_API, api_auth_token)
+    for name, data_frame, seconds in results:
+        refresh_sync(job.course_id)
+        job.add_summary(name, rows=get_row_count(data_frame), columns=len(data_frame), seconds=seconds)
+
+        def record_chunk(response, seconds, name=name):
+            """Record an upload request of the data summary in the sync job, and extend the sync lock."""
+            job.add_chunk(name, response.ok, seconds, error=None if response.ok else response.text)
+            refresh_sync(job.course_id)
+
+        if getattr(settings, "ONTASK_UPLOAD_CHUNK_MODE", None):
+            response = ontask_client.merge_table_in_chunks(workflow_id, data_frame, on_chunk=record_chunk)
+        else:
+            started = time.monotonic()
+            response = ontask_client.merge_table(workflow_id, data_frame)
+
+            # handle the exception when the workflow exists and the table is just empty
+            if is_empty_table_response(response):
+                log.info("Workflow appears emtpy, retrying ...")
+                response = ontask_client.update_table(workflow_id, data_frame)
+            record_chunk(response, time.monotonic() - started)
+        if response.ok and not table_initialized:
+            set_table_initialized(workflow_id)
+            table_initialized = True
+        succeeded = succeeded and response.ok
+        log.info(response.text)
+
+    log.debug(f"OnTask connection stats: {get_connection_stats()}")
+    return succeeded
+
 
 @shared_task
-def upload_dataframe_to_ontask_task(course_id: str, workflow_id: str, api_auth_token: str) -> None:
+def upload_dataframe_to_ontask_task(
+    course_id: str, workflow_id: str, api_auth_token: str, incremental: bool = False, periodic: bool = False
+) -> None:
     """
     Task to upload a dataframe to a OnTask workflow.
 
@@ -20,34 +394,355 @@ def upload_dataframe_to_ontask_task(course_id: str, workflow_id: str, api_auth_t
     error message and return.
 
     For each data summary class in the `ONTASK_DATA_SUMMARY_CLASSES` setting, the
-    task will create an instance of the class and call the `get_data_summary` method
-    to get the dataframe. The task will then merge the dataframe to the current
-    OnTask table.
+    task will create an instance of the class, sharing a single enrollment
+    snapshot, and call the `get_data_summary` method to get the dataframe. The
+    data summaries are computed concurrently if the `ONTASK_DATA_SUMMARY_MAX_WORKERS`
+    setting is greater than 1, or split by rows across a process pool if the
+    `ONTASK_DATA_SUMMARY_PROCESSES` setting is. The task will then merge each dataframe to the
+    current OnTask table, in the order of the setting. If the
+    `ONTASK_UPLOAD_CHUNK_MODE` setting is set, the dataframe is merged in chunks
+    of rows or columns.
+
+    In incremental mode, only the rows of the users whose completions, grades or
+    enrollment changed since the last successful sync of the course and workflow
+    are computed and merged. If there is no previous sync, all the users are
+    synced. The start time of each successful sync is recorded as the new
+    high-water mark.
+
+    If the `ONTASK_SYNC_SHARDS` setting is greater than 1, the users are split
+    in that many ranges, the data summaries of each range are computed by a
+    `compute_data_summaries_shard_task`, and `merge_data_summary_shards_task`
+    merges the results once all the shards are done. If a shard fails,
+    `fail_sharded_sync_task` finishes the sync instead.
+
+    The sync holds the lock of the course while it runs. Sync requests received
+    meanwhile mark the course dirty, and a single follow-up sync is queued when
+    it finishes, see `platform_plugin_ontask.sync.request_sync`. A periodic
+    sync takes the lock when it starts, and is skipped if a sync of the course
+    is already queued or running.
 
     Args:
         course_id (str): The course ID.
         workflow_id (str): The OnTask workflow ID.
         api_auth_token (str): The OnTask API authentication token.
+        incremental (bool): Whether to sync only the users that changed.
+        periodic (bool): Whether the sync was queued by
+            `schedule_periodic_syncs_task` without taking the lock.
+    """
+    if not periodic:
+        start_sync(course_id)
+    elif not try_start_sync(course_id):
+        log.info(f"A sync of {course_id} is already queued or running, skipping its periodic sync.")
+        return
+    job = SyncJob.get_or_create(course_id).start()
+    handed_off = False
+    try:
+        handed_off = sync_course(course_id, workflow_id, api_auth_token, incremental, job)
+    except Exception as error:
+        job.finish(succeeded=False, error=repr(error))
+        raise
+    finally:
+        if not handed_off:
+            release_sync(course_id, workflow_id, api_auth_token, incremental)
+
+
+def sync_course(course_id: str, workflow_id: str, api_auth_token: str, incremental: bool, job: SyncJob) -> bool:
     """
-    data_summary_classes = getattr(settings, "ONTASK_DATA_SUMMARY_CLASSES", [])
+    Compute the data summaries of a course and merge them in OnTask.
+
+    See `upload_dataframe_to_ontask_task`.
+
+    Args:
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+        api_auth_token (str): The OnTask API authentication token.
+        incremental (bool): Whether to sync only the users that changed.
+        job (SyncJob): The sync job.
 
-    if not data_summary_classes:
+    Returns:
+        bool: Whether the sync was handed off to the shard tasks, which
+            finish the sync job and release the sync lock when they are done.
+    """
+    sync_started = timezone.now()
+    data_summary_class_paths = getattr(settings, "ONTASK_DATA_SUMMARY_CLASSES", [])
+
+    if not data_summary_class_paths:
         log.info("ONTASK_DATA_SUMMARY_CLASSES is not set.")
 
-    ontask_client = OnTaskClient(settings.ONTASK_INTERNAL_API, api_auth_token)
-    for data_summary_class_path in data_summary_classes:
-        data_summary_class = get_data_summary_class(data_summary_class_path)
-        if data_summary_class is None:
-            log.error(f"Data summary class {data_summary_class_path} not found.")
+    data_summary_classes = get_data_summary_classes(data_summary_class_paths)
+    enrollments = []
+    if data_summary_classes:
+        with measure_stage("enrollments", course_id=course_id) as stage:
+            enrollments = get_enrollment_snapshot(course_id)
+            stage.values["users"] = len(enrollments)
+    high_water_mark = get_high_water_mark(course_id, workflow_id) if incremental else None
+    if high_water_mark is not None:
+        changed_user_ids = get_changed_user_ids(course_id, high_water_mark)
+        enrollments = [user for user in enrollments if user.id in changed_user_ids]
+        log.info(f"Incremental sync of {len(enrollments)} users changed since {high_water_mark.isoformat()}.")
+        if not enrollments:
+            set_high_water_mark(course_id, workflow_id, sync_started)
+            job.finish(succeeded=True)
+            return False
+
+    shards = min(getattr(settings, "ONTASK_SYNC_SHARDS", 1), len(enrollments))
+    if shards > 1:
+        shard_size = math.ceil(len(enrollments) / shards)
+        data_summary_class_paths = [f"{cls.__module__}.{cls.__qualname__}" for cls in data_summary_classes]
+        log.info(f"Sharded sync of {len(enrollments)} users in {shards} shards.")
+        chord(
+            compute_data_summaries_shard_task.s(course_id, data_summary_class_paths, shard)
+            for shard in chunked(enrollments, shard_size)
+        )(
+            merge_data_summary_shards_task.s(
+                course_id, workflow_id, api_auth_token, sync_started.isoformat(), incremental=incremental
+            ).on_error(
+                fail_sharded_sync_task.s(
+                    course_id,
+                    workflow_id=workflow_id,
+                    api_auth_token=api_auth_token,
+                    started_at=job.record["started_at"],
+                    incremental=incremental,
+                )
+            )
+        )
+        return True
+
+    results = iter_data_summaries(course_id, data_summary_classes, enrollments)
+    succeeded = upload_data_summaries(workflow_id, api_auth_token, results, job)
+    if succeeded and data_summary_classes:
+        set_high_water_mark(course_id, workflow_id, sync_started)
+        set_course_synced(course_id)
+    job.finish(succeeded=succeeded)
+    return False
+
+
+def release_sync(course_id: str, workflow_id: str, api_auth_token: str, incremental: bool) -> None:
+    """
+    Release the sync lock of a course, and queue the follow-up sync if needed.
+
+    Args:
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+        api_auth_token (str): The OnTask API authentication token.
+        incremental (bool): Whether to sync only the users that changed.
+    """
+    if finish_sync(course_id):
+        log.info(f"Queuing a follow-up sync of {course_id} for the requests received during the sync.")
+        upload_dataframe_to_ontask_task.delay(course_id, workflow_id, api_auth_token, incremental=incremental)
+
+
+@shared_task
+def compute_data_summaries_shard_task(
+    course_id: str, data_summary_class_paths: list[str], enrollments: list[list]
+) -> list[dict]:
+    """
+    Task to compute the data summaries of a range of users of a course.
+
+    The sync lock of the course is extended when the shard is computed.
+
+    Args:
+        course_id (str): The course ID.
+        data_summary_class_paths (list[str]): The data summary class paths.
+        enrollments (list[list]): The enrollment snapshot rows of the users of
+            the shard.
+
+    Returns:
+        list[list]: The name, data frame and computing time of each data
+            summary, in the same order.
+    """
+    enrollments = [EnrolledUser(*user) for user in enrollments]
+    data_summary_classes = get_data_summary_classes(data_summary_class_paths)
+    results = [
+        [name, data_frame_to_dict(data_frame), seconds]
+        for name, data_frame, seconds in iter_data_summaries(course_id, data_summary_classes, enrollments)
+    ]
+    refresh_sync(course_id)
+    return results
+
+
+@shared_task
+def merge_data_summary_shards_task(
+    shard_results: list[list[list]],
+    course_id: str,
+    workflow_id: str,
+    api_auth_token: str,
+    sync_started: str,
+    *,
+    incremental: bool = False,
+) -> None:
+    """
+    Task to merge the data frames of all the shards of a sync in OnTask.
+
+    The data frames of each shard are merged on `user_id` as separate merges,
+    shard by shard, so the OnTask table is only written by one task at a time.
+
+    Args:
+        shard_results (list[list[list]]): The data summaries of each shard.
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+        api_auth_token (str): The OnTask API authentication token.
+        sync_started (str): The start time of the sync, in ISO format.
+        incremental (bool): Whether the sync only includes the users that
+            changed, for the follow-up sync.
+    """
+    job = SyncJob.get(course_id) or SyncJob.create(course_id).start()
+    try:
+        results = (DataSummaryResult(*result) for results in shard_results for result in results)
+        succeeded = upload_data_summaries(workflow_id, api_auth_token, results, job)
+        if succeeded:
+            set_high_water_mark(course_id, workflow_id, datetime.fromisoformat(sync_started))
+            set_course_synced(course_id)
+        job.finish(succeeded=succeeded)
+    except Exception as error:
+        job.finish(succeeded=False, error=repr(error))
+        raise
+    finally:
+        release_sync(course_id, workflow_id, api_auth_token, incremental)
+
+
+@shared_task
+def fail_sharded_sync_task(  # pylint: disable=unused-argument
+    request,
+    exc: Exception,
+    traceback,
+    course_id: str,
+    *,
+    workflow_id: str,
+    api_auth_token: str,
+    started_at: str,
+    incremental: bool = False,
+) -> None:
+    """
+    Task to finish a sharded sync whose shards or merge failed.
+
+    It is the error callback of `merge_data_summary_shards_task`, which does not
+    run when a shard fails. The sync job is marked as failed and the sync lock
+    released, unless the job was already finished by the merge task, or is the
+    job of a later sync.
+
+    Args:
+        request: The request of the failed task.
+        exc (Exception): The error of the failed task.
+        traceback: The traceback of the error.
+        course_id (str): The course ID.
+        workflow_id (str): The OnTask workflow ID.
+        api_auth_token (str): The OnTask API authentication token.
+        started_at (str): The start time of the sync job, in ISO format.
+        incremental (bool): Whether the sync only includes the users that
+            changed, for the follow-up sync.
+    """
+    job = SyncJob.get(course_id)
+    if job is None or job.status != JOB_RUNNING or job.record["started_at"] != started_at:
+        return
+    log.error(f"Sharded sync of {course_id} failed in task {request.id}: {exc!r}")
+    job.finish(succeeded=False, error=repr(exc))
+    release_sync(course_id, workflow_id, api_auth_token, incremental)
+
+
+@shared_task
+def schedule_periodic_syncs_task() -> None:
+    """
+    Task to queue the periodic syncs of the courses with an OnTask workflow.
+
+    The task runs every `ONTASK_PERIODIC_SYNC_WINDOW` seconds from Celery beat.
+    Each run queues the syncs of the courses whose interval elapsed, see
+    `platform_plugin_ontask.schedule.get_sync_interval`, spread across the
+    window. At most `ONTASK_PERIODIC_SYNC_MAX_SYNCS` syncs of the courses
+    with an OnTask workflow are queued or running at once: the syncs that
+    still hold their lock are subtracted from it, the due syncs are queued
+    up to the rest, the most overdue first, and the remaining courses are
+    queued by the next runs.
+
+    A course whose sync is already queued or running is coalesced with it. The
+    queued syncs take the lock of their course when they start, not when they
+    are queued, so a **Load data** request received before then is not
+    coalesced with a sync that has not started, see
+    `platform_plugin_ontask.sync.try_start_sync`.
+    """
+    now = time.time()
+    window = getattr(settings, "ONTASK_PERIODIC_SYNC_WINDOW", DEFAULT_PERIODIC_SYNC_WINDOW)
+    max_syncs = getattr(settings, "ONTASK_PERIODIC_SYNC_MAX_SYNCS", DEFAULT_PERIODIC_SYNC_MAX_SYNCS)
+    course_blocks = get_periodic_sync_course_blocks()
+    pending_syncs = get_pending_syncs(
+        str(course_block.id)
+        for course_block in course_blocks
+        if course_block.other_course_settings.get("ONTASK_WORKFLOW_ID") is not None
+    )
+    due_syncs = []
+    for due_sync in get_due_syncs(course_blocks, now):
+        if due_sync.course_id in pending_syncs:
+            set_last_periodic_sync(due_sync.course_id, now)
+        else:
+            due_syncs.append(due_sync)
+    scheduled_syncs = due_syncs[: max(max_syncs - len(pending_syncs), 0)]
+    incremental = getattr(settings, "ONTASK_INCREMENTAL_SYNC", False)
+
+    for due_sync, countdown in zip(scheduled_syncs, get_countdowns(len(scheduled_syncs), window)):
+        try:
+            upload_dataframe_to_ontask_task.apply_async(
+                (due_sync.course_id, due_sync.workflow_id, due_sync.api_auth_token),
+                {"incremental": incremental, "periodic": True},
+                countdown=countdown,
+            )
+        except Exception:  # pylint: disable=broad-exception-caught
+            log.exception(f"Unable to queue the periodic sync of {due_sync.course_id}.")
             continue
+        set_last_periodic_sync(due_sync.course_id, now)
 
-        data_summary_instance = data_summary_class(course_id)
-        data_frame = data_summary_instance.get_data_summary()
+    log.info(
+        f"Queued {len(scheduled_syncs)} periodic syncs over {window} seconds, with {len(pending_syncs)} syncs "
+        f"in progress, {len(due_syncs) - len(scheduled_syncs)} due syncs postponed."
+    )
 
-        response = ontask_client.merge_table(workflow_id, data_frame)
 
-        # handle the exception when the workflow exists and the table is just empty
-        if response.status_code == 400 and "non-empty table" in response.text:
-            log.info("Workflow appears emtpy, retrying ...")
-            response = ontask_client.update_table(workflow_id, data_frame)
-        log.info(response.text)
+@shared_task
+def flush_dirty_users_task(course_id: str, bucket: int) -> None:
+    """
+    Task to push the rows of the users of a course that changed in a flush interval.
+
+    The users are buffered by the completion and grade signal receivers, see
+    `platform_plugin_ontask.receivers`, in one bucket per
+    `ONTASK_EVENT_SYNC_FLUSH_INTERVAL` seconds, and the first user buffered
+    in a bucket schedules this task for the end of its interval. The rows of
+    all the buffered users are computed by the data summaries, merged in a
+    single data frame and sent as one merge.
+
+    The push is skipped if the course has no OnTask workflow, or if its table
+    was never synced, since a merge needs a non-empty table. A failed push is
+    not retried, the next sync of the course includes the users.
+
+    Args:
+        course_id (str): The course ID.
+        bucket (int): The number of the flush interval since the epoch.
+    """
+    user_ids = pop_dirty_users(course_id, bucket)
+    if not user_ids:
+        return
+
+    try:
+        course_block = get_course_block(get_course_key(course_id))
+        api_auth_token = get_api_auth_token(course_block)
+        workflow_id = get_workflow_id(course_block)
+    except (CustomInvalidKeyError, CourseNotFoundError, APIAuthTokenNotSetError, WorkflowIDNotSetError) as error:
+        log.debug(f"Skipping the push of {len(user_ids)} users of {course_id}: {error}")
+        return
+    if not is_table_initialized(workflow_id):
+        log.info(f"Skipping the push of {len(user_ids)} users of {course_id}, the table was never synced.")
+        return
+
+    with measure_stage("enrollments", course_id=course_id) as stage:
+        enrollments = get_enrollment_snapshot(course_id, user_ids=user_ids)
+        stage.values["users"] = len(enrollments)
+    if not enrollments:
+        return
+
+    with measure_stage("push", course_id=course_id) as stage:
+        data_summary_classes = get_data_summary_classes(getattr(settings, "ONTASK_DATA_SUMMARY_CLASSES", []))
+        results = iter_data_summaries(course_id, data_summary_classes, enrollments)
+        data_frame = merge_data_frames(result.data_frame for result in results)
+        stage.values.update(users=len(enrollments), columns=len(data_frame))
+        response = OnTaskClient(settings.ONTASK_INTERNAL_API, api_auth_token).merge_table(workflow_id, data_frame)
+
+    if not response.ok:
+        log.error(f"Unable to push the rows of {len(enrollments)} users of {course_id}: {response.text}")
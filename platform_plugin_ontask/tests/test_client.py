@@ -0,0 +1,203 @@
+"""Tests for the OnTask API client."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import TestCase
+from unittest.mock import Mock, call, patch
+
+import requests
+from django.test.utils import override_settings
+from rest_framework import status
+
+from platform_plugin_ontask.client import (
+    OnTaskClient,
+    get_connection_stats,
+    get_session,
+    iter_column_chunks,
+    iter_row_chunks,
+)
+
+CLIENT_MODULE_PATH = "platform_plugin_ontask.client"
+
+
+class TestChunks(TestCase):
+    """Tests for the data frame chunk helpers."""
+
+    def setUp(self):
+        self.data_frame = {
+            "user_id": {0: 1, 1: 2, 2: 3},
+            "email": {0: "a@example.com", 1: "b@example.com", 2: "c@example.com"},
+            "grade": {0: 1, 2: 0.5},
+        }
+
+    def test_iter_row_chunks(self):
+        """Test that each chunk has every column for a range of rows."""
+        chunks = list(iter_row_chunks(self.data_frame, 2, "user_id"))
+
+        self.assertEqual(
+            chunks,
+            [
+                {"user_id": {0: 1, 1: 2}, "email": {0: "a@example.com", 1: "b@example.com"}, "grade": {0: 1}},
+                {"user_id": {2: 3}, "email": {2: "c@example.com"}, "grade": {2: 0.5}},
+            ],
+        )
+
+    def test_iter_column_chunks(self):
+        """Test that each chunk has the key column and a group of columns."""
+        chunks = list(iter_column_chunks(self.data_frame, 1, "user_id"))
+
+        self.assertEqual([list(chunk) for chunk in chunks], [["user_id", "email"], ["user_id", "grade"]])
+        self.assertIs(chunks[1]["grade"], self.data_frame["grade"])
+
+    def test_iter_column_chunks_only_key_column(self):
+        """Test that a data frame with only the key column is sent as a single chunk."""
+        chunks = list(iter_column_chunks({"user_id": {0: 1}}, 1, "user_id"))
+
+        self.assertEqual(chunks, [{"user_id": {0: 1}}])
+
+
+@patch(f"{CLIENT_MODULE_PATH}.time.sleep", Mock())
+class TestMergeTableInChunks(TestCase):
+    """Tests for the OnTaskClient.merge_table_in_chunks method."""
+
+    def setUp(self):
+        self.client = OnTaskClient("http://ontask", "api-key")
+        self.workflow_id = 1
+        self.data_frame = {"user_id": {0: 1, 1: 2, 2: 3}, "email": {0: "a", 1: "b", 2: "c"}}
+        self.ok_response = Mock(status_code=status.HTTP_200_OK, ok=True, text="ok")
+
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks(self, mock_merge_table: Mock):
+        """Test that each chunk is merged with its own request."""
+        mock_merge_table.return_value = self.ok_response
+
+        response = self.client.merge_table_in_chunks(
+            self.workflow_id, self.data_frame, mode="rows", chunk_size=2, timeout=30, retries=0
+        )
+
+        self.assertIs(response, self.ok_response)
+        self.assertEqual(
+            mock_merge_table.call_args_list,
+            [
+                call(self.workflow_id, {"user_id": {0: 1, 1: 2}, "email": {0: "a", 1: "b"}}, timeout=30),
+                call(self.workflow_id, {"user_id": {2: 3}, "email": {2: "c"}}, timeout=30),
+            ],
+        )
+
+    @patch.object(OnTaskClient, "update_table")
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks_empty_table(self, mock_merge_table: Mock, mock_update_table: Mock):
+        """Test that the first chunk initializes an empty table."""
+        empty_table_response = Mock(status_code=status.HTTP_400_BAD_REQUEST, ok=False, text="non-empty table")
+        mock_merge_table.side_effect = [empty_table_response, self.ok_response]
+        mock_update_table.return_value = self.ok_response
+
+        self.client.merge_table_in_chunks(
+            self.workflow_id, self.data_frame, mode="columns", chunk_size=1, timeout=30, retries=0
+        )
+
+        mock_update_table.assert_called_once_with(self.workflow_id, self.data_frame, timeout=30)
+        self.assertEqual(mock_merge_table.call_count, 1)
+
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks_without_rows(self, mock_merge_table: Mock):
+        """Test that a data frame without rows is still sent, and its response returned."""
+        mock_merge_table.return_value = self.ok_response
+
+        response = self.client.merge_table_in_chunks(
+            self.workflow_id, {"user_id": {}, "email": {}}, mode="rows", chunk_size=2, timeout=30, retries=0
+        )
+
+        self.assertIs(response, self.ok_response)
+        mock_merge_table.assert_called_once_with(self.workflow_id, {"user_id": {}, "email": {}}, timeout=30)
+
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks_retries(self, mock_merge_table: Mock):
+        """Test that a chunk is retried on connection and server errors."""
+        server_error_response = Mock(status_code=status.HTTP_502_BAD_GATEWAY, ok=False, text="error")
+        mock_merge_table.side_effect = [requests.ConnectionError(), server_error_response, self.ok_response]
+
+        response = self.client.merge_table_in_chunks(
+            self.workflow_id, self.data_frame, mode="rows", chunk_size=5, timeout=30, retries=2
+        )
+
+        self.assertIs(response, self.ok_response)
+        self.assertEqual(mock_merge_table.call_count, 3)
+
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks_stops_on_failure(self, mock_merge_table: Mock):
+        """Test that the upload stops at the first chunk that fails."""
+        server_error_response = Mock(status_code=status.HTTP_502_BAD_GATEWAY, ok=False, text="error")
+        mock_merge_table.return_value = server_error_response
+
+        response = self.client.merge_table_in_chunks(
+            self.workflow_id, self.data_frame, mode="rows", chunk_size=1, timeout=30, retries=1
+        )
+
+        self.assertIs(response, server_error_response)
+        self.assertEqual(mock_merge_table.call_count, 2)
+
+    @patch.object(OnTaskClient, "merge_table")
+    def test_merge_table_in_chunks_raises_after_retries(self, mock_merge_table: Mock):
+        """Test that connection errors are raised once the retries are exhausted."""
+        mock_merge_table.side_effect = requests.ConnectionError()
+
+        with self.assertRaises(requests.ConnectionError):
+            self.client.merge_table_in_chunks(
+                self.workflow_id, self.data_frame, mode="rows", chunk_size=5, timeout=30, retries=1
+            )
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 handler that answers every PUT with an empty JSON object."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):  # pylint: disable=invalid-name
+        """Read the request body and answer with an empty JSON object."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(status.HTTP_200_OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        """Do not log the requests."""
+
+
+class TestSession(TestCase):
+    """Tests for the pooled HTTP session."""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api_url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    @override_settings(ONTASK_HTTP_POOL_MAXSIZE=2)
+    def test_connections_are_reused(self):
+        """Test that the clients of a process share the connections of the session."""
+        for _ in range(3):
+            response = OnTaskClient(self.api_url, "api-key").merge_table(1, {"user_id": {0: 1}})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertEqual(get_connection_stats(), {"requests": 3, "connections": 1, "reused": 2})
+
+    def test_session_is_recreated_on_setting_change(self):
+        """Test that a new session is created when an HTTP setting changes."""
+        session = get_session()
+
+        with override_settings(ONTASK_HTTP_KEEP_ALIVE=False):
+            self.assertIsNot(get_session(), session)
+            self.assertEqual(get_session().headers["Connection"], "close")
+
+    def test_table_requests_are_not_retried_by_session(self):
+        """Test that the session leaves the retries of the table PUTs to the client."""
+        retry = get_session().get_adapter(self.api_url).max_retries
+
+        self.assertFalse(retry.is_retry("PUT", 503))
+        self.assertTrue(retry.is_retry("GET", 503))
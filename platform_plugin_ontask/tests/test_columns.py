@@ -0,0 +1,42 @@
+"""Tests for the column naming of the data summaries."""
+
+from unittest import TestCase
+
+from platform_plugin_ontask.data_summary.columns import ColumnNamer, shorten
+
+
+class TestColumnNamer(TestCase):
+    """Tests for the ColumnNamer class."""
+
+    def setUp(self):
+        self.column_namer = ColumnNamer(reserved=["user_id"])
+
+    def test_shorten(self):
+        """Test that long values keep their start and their end."""
+        self.assertEqual(shorten("Introduction", 16), "Introduction")
+        self.assertEqual(shorten("Introduction to the course", 16), "Introductio..rse")
+
+    def test_unique_names(self):
+        """Test that unique names are kept."""
+        self.assertEqual(self.column_namer.add("block-1", "Block 1"), "Block 1")
+        self.assertEqual(self.column_namer.add("block-2", "Block 2"), "Block 2")
+        self.assertEqual(self.column_namer.collisions, [])
+
+    def test_collision_uses_fallback(self):
+        """Test that a colliding block gets its fallback name."""
+        self.column_namer.add("block-1", "Block abcde", fallback="Block 1abcde")
+
+        with self.assertLogs("platform_plugin_ontask.data_summary.columns", "WARNING"):
+            column_name = self.column_namer.add("block-2", "Block abcde", fallback="Block 2abcde")
+
+        self.assertEqual(column_name, "Block 2abcde")
+        self.assertEqual(self.column_namer.collisions, [("block-2", "block-1", "Block abcde")])
+
+    def test_collision_without_fallback(self):
+        """Test that a colliding block without a free fallback gets a numbered name."""
+        self.column_namer.add("block-1", "Block")
+        self.column_namer.add("block-2", "Block (2)")
+
+        with self.assertLogs("platform_plugin_ontask.data_summary.columns", "WARNING"):
+            self.assertEqual(self.column_namer.add("block-3", "Block"), "Block (3)")
+            self.assertEqual(self.column_namer.add("block-4", "user_id"), "user_id (2)")
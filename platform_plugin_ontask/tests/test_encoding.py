@@ -0,0 +1,174 @@
+"""Tests for the streaming JSON encoding and compression of the OnTask request bodies."""
+
+import gzip
+import json
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.client import OnTaskClient
+from platform_plugin_ontask.data_summary.frame import BooleanColumn, ColumnarDataFrame, FloatColumn, ObjectColumn
+from platform_plugin_ontask.encoding import CompressedStream, JSONStream, compress, iter_json
+from test_utils.ontask_server import OnTaskServer
+
+ENCODING_MODULE_PATH = "platform_plugin_ontask.encoding"
+
+
+class TestJSONStream(TestCase):
+    """Tests for the JSONStream class."""
+
+    def setUp(self):
+        self.data_frame = ColumnarDataFrame(range(10))
+        self.data_frame.add_column("email", ObjectColumn(f"user{index}@example.com" for index in range(10)))
+        self.data_frame.add_column("completed", BooleanColumn([True, False, None] * 3 + [True]))
+        self.data_frame.add_column("grade", FloatColumn(index / 10 for index in range(10)))
+        self.payload = {"how": "outer", "left_on": "user_id", "right_on": "user_id", "src_df": self.data_frame}
+        self.expected_payload = {**self.payload, "src_df": self.data_frame.to_dict()}
+
+    def test_iter_json(self):
+        """Test that the pieces make the same document as the standard encoder."""
+        pieces = list(iter_json(self.payload, items_per_block=3))
+
+        self.assertGreater(len(pieces), 10)
+        self.assertEqual(json.loads(b"".join(pieces)), json.loads(json.dumps(self.expected_payload)))
+
+    def test_iter_json_empty(self):
+        """Test that empty mappings are encoded."""
+        self.assertEqual(json.loads(b"".join(iter_json({"src_df": {}, "user_id": {}}))), {"src_df": {}, "user_id": {}})
+
+    @patch(f"{ENCODING_MODULE_PATH}.orjson", None)
+    def test_iter_json_without_orjson(self):
+        """Test that the standard encoder is used when orjson is not installed."""
+        self.assertEqual(
+            json.loads(b"".join(iter_json(self.payload, items_per_block=3))),
+            json.loads(json.dumps(self.expected_payload)),
+        )
+
+    def test_stream_chunks(self):
+        """Test that the pieces are buffered and that the stream can be iterated again."""
+        stream = JSONStream(self.payload, chunk_size=100)
+
+        chunks = list(stream)
+
+        self.assertTrue(all(len(chunk) >= 100 for chunk in chunks[:-1]))
+        self.assertEqual(b"".join(stream), b"".join(chunks))
+
+
+class TestStreamingUpload(TestCase):
+    """Tests for the streaming upload of the OnTask client."""
+
+    def setUp(self):
+        self.client = OnTaskClient("https://ontask.example.com", "api-key")
+        self.client.session = Mock()
+        self.data_frame = {"user_id": {0: 1, 1: 2}}
+
+    def test_json_body(self):
+        """Test that the payload is encoded at once by default."""
+        self.client.merge_table(1, self.data_frame)
+
+        kwargs = self.client.session.put.call_args.kwargs
+        self.assertIsInstance(kwargs["data"], bytes)
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+        self.assertEqual(json.loads(kwargs["data"])["src_df"], {"user_id": {"0": 1, "1": 2}})
+
+    @override_settings(ONTASK_UPLOAD_STREAMING=True)
+    def test_streamed_body(self):
+        """Test that the payload is streamed when the setting is enabled."""
+        self.client.update_table(1, self.data_frame)
+
+        kwargs = self.client.session.put.call_args.kwargs
+        self.assertIsInstance(kwargs["data"], JSONStream)
+        self.assertEqual(kwargs["headers"]["Content-Type"], "application/json")
+        self.assertEqual(json.loads(b"".join(kwargs["data"])), {"data_frame": {"user_id": {"0": 1, "1": 2}}})
+        self.assertEqual(kwargs["data"].size, len(b"".join(kwargs["data"])))
+
+
+class TestCompression(TestCase):
+    """Tests for the compression of the request bodies."""
+
+    def setUp(self):
+        self.data_frame = {
+            "user_id": {index: index for index in range(1000)},
+            "completed": {index: index % 3 == 0 for index in range(1000)},
+        }
+
+    def test_compressed_stream(self):
+        """Test that the compressed chunks make a valid gzip document."""
+        stream = CompressedStream(JSONStream({"data_frame": self.data_frame}, chunk_size=1024), "gzip", 9)
+
+        self.assertEqual(
+            json.loads(gzip.decompress(b"".join(stream))),
+            json.loads(json.dumps({"data_frame": self.data_frame})),
+        )
+
+    def test_unsupported_compression(self):
+        """Test that an unknown encoding is rejected."""
+        with self.assertRaises(ImproperlyConfigured):
+            compress(b"{}", "br")
+
+    @patch(f"{ENCODING_MODULE_PATH}.zstandard", None)
+    def test_zstd_not_installed(self):
+        """Test that zstd compression requires zstandard."""
+        with self.assertRaises(ImproperlyConfigured):
+            compress(b"{}", "zstd")
+
+
+class TestOnTaskServer(TestCase):
+    """Tests for the uploads to the local OnTask server."""
+
+    def setUp(self):
+        self.data_frame = ColumnarDataFrame(range(1000))
+        self.data_frame.add_column("completed", BooleanColumn(index % 3 == 0 for index in range(1000)))
+        self.expected_data_frame = json.loads(json.dumps(self.data_frame.to_dict()))
+
+    def merge_table(self) -> OnTaskServer:
+        """Merge the data frame in the local server and return the server."""
+        with OnTaskServer() as server:
+            workflow_id = server.create_workflow(user_ids=range(1000))
+            response = OnTaskClient(server.url, "api-key").merge_table(workflow_id, self.data_frame)
+        self.assertTrue(response.ok)
+        self.assertEqual(server.requests[0].payload["src_df"], self.expected_data_frame)
+        return server
+
+    def test_plain_body(self):
+        """Test that the body is sent uncompressed by default."""
+        request = self.merge_table().requests[0]
+
+        self.assertNotIn("Content-Encoding", request.headers)
+        self.assertEqual(request.wire_size, request.body_size)
+
+    @override_settings(ONTASK_UPLOAD_COMPRESSION="gzip", ONTASK_UPLOAD_COMPRESSION_LEVEL=1)
+    def test_gzip_body(self):
+        """Test that the body is compressed when the setting is set."""
+        request = self.merge_table().requests[0]
+
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertLess(request.wire_size, request.body_size / 2)
+
+    @override_settings(ONTASK_UPLOAD_STREAMING=True, ONTASK_UPLOAD_COMPRESSION="gzip")
+    def test_streamed_gzip_body(self):
+        """Test that a streamed body is compressed chunk by chunk."""
+        request = self.merge_table().requests[0]
+
+        self.assertEqual(request.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(request.headers["Content-Encoding"], "gzip")
+        self.assertLess(request.wire_size, request.body_size / 2)
+
+    @override_settings(ONTASK_UPLOAD_COMPRESSION="zstd")
+    def test_zstd_body(self):
+        """Test that a zstd compressed body is decoded by the server."""
+        request = self.merge_table().requests[0]
+
+        self.assertEqual(request.headers["Content-Encoding"], "zstd")
+        self.assertLess(request.wire_size, request.body_size / 2)
+
+    @override_settings(ONTASK_UPLOAD_STREAMING=True, ONTASK_UPLOAD_COMPRESSION="zstd")
+    def test_streamed_zstd_body(self):
+        """Test that a streamed body is compressed with zstd chunk by chunk."""
+        request = self.merge_table().requests[0]
+
+        self.assertEqual(request.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(request.headers["Content-Encoding"], "zstd")
+        self.assertLess(request.wire_size, request.body_size / 2)
@@ -0,0 +1,181 @@
+"""Tests for the columnar data frame of the data summaries."""
+
+import json
+import pickle
+from array import array
+from unittest import TestCase
+
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.client import iter_column_chunks, iter_row_chunks
+from platform_plugin_ontask.data_summary.frame import (
+    BooleanColumn,
+    Column,
+    ColumnarDataFrame,
+    FloatColumn,
+    ObjectColumn,
+    concat_data_frames,
+    data_frame_to_dict,
+    merge_data_frames,
+)
+
+
+class TestColumns(TestCase):
+    """Tests for the column types."""
+
+    def test_column_is_abstract(self):
+        """Test that a column type must implement the storage of its values."""
+        with self.assertRaises(TypeError):
+            Column()  # pylint: disable=abstract-class-instantiated
+
+    def test_boolean_column(self):
+        """Test that the booleans are bit-packed and keep the null values."""
+        values = [True, False, None, True, False, False, True, None, True, None]
+
+        column = BooleanColumn(values)
+
+        self.assertEqual(len(column.bits), 2)
+        self.assertEqual(list(column.values()), values)
+        self.assertIsNone(column[9])
+
+    def test_float_column(self):
+        """Test that the floats are stored exactly."""
+        column = FloatColumn([0.1, 1, 1 / 3])
+
+        self.assertEqual(column.values.typecode, "d")
+        self.assertEqual(column.to_dict(), {0: 0.1, 1: 1.0, 2: 1 / 3})
+
+    def test_extend_columns(self):
+        """Test that the rows of a column are appended, on and off the byte boundary."""
+        values = [True, None, False, True, True, False, None, False, True]
+
+        for size in (8, 5):
+            column = BooleanColumn(values[:size])
+            column.extend(BooleanColumn(values[size:]))
+            self.assertEqual(list(column.to_dict().values()), values)
+        float_column = FloatColumn([1, 0.5])
+        float_column.extend(FloatColumn([0.25]))
+        self.assertEqual(float_column.to_dict(), {0: 1.0, 1: 0.5, 2: 0.25})
+        object_column = ObjectColumn(["a"])
+        object_column.extend(ObjectColumn(["b"]))
+        self.assertEqual(object_column.to_dict(), {0: "a", 1: "b"})
+
+    def test_missing_rows(self):
+        """Test that the columns behave like a mapping of row index to value."""
+        column = ObjectColumn(["a", "b"])
+
+        self.assertIn(1, column)
+        self.assertNotIn(2, column)
+        self.assertNotIn("0", column)
+        with self.assertRaises(KeyError):
+            column[-1]  # pylint: disable=pointless-statement
+
+
+class TestColumnarDataFrame(TestCase):
+    """Tests for the ColumnarDataFrame class."""
+
+    def setUp(self):
+        self.data_frame = ColumnarDataFrame([5, 6, 7])
+        self.data_frame.add_column("email", ObjectColumn(["a@example.com", "b@example.com", "c@example.com"]))
+        self.data_frame.add_column("completed", BooleanColumn([True, None, False]))
+        self.data_frame.add_column("grade", FloatColumn([1, 0, 0.5]))
+        self.expected_dict = {
+            "user_id": {0: 5, 1: 6, 2: 7},
+            "email": {0: "a@example.com", 1: "b@example.com", 2: "c@example.com"},
+            "completed": {0: True, 1: None, 2: False},
+            "grade": {0: 1.0, 1: 0.0, 2: 0.5},
+        }
+
+    def test_to_dict(self):
+        """Test that the frame has the shape of the dict data frames."""
+        self.assertEqual(list(self.data_frame), ["user_id", "email", "completed", "grade"])
+        self.assertEqual(self.data_frame.to_dict(), self.expected_dict)
+        self.assertEqual(
+            json.loads(json.dumps(data_frame_to_dict(self.data_frame))),
+            json.loads(json.dumps(self.expected_dict)),
+        )
+
+    def test_add_invalid_column(self):
+        """Test that duplicated columns and columns of the wrong length are rejected."""
+        with self.assertRaises(ValueError):
+            self.data_frame.add_column("email", ObjectColumn(["a", "b", "c"]))
+        with self.assertRaises(ValueError):
+            self.data_frame.add_column("username", ObjectColumn(["a"]))
+
+    def test_chunks(self):
+        """Test that the frame is split in the same chunks as a dict data frame."""
+        self.assertEqual(
+            [data_frame_to_dict(chunk) for chunk in iter_row_chunks(self.data_frame, 2, "user_id")],
+            list(iter_row_chunks(self.expected_dict, 2, "user_id")),
+        )
+        self.assertEqual(
+            [data_frame_to_dict(chunk) for chunk in iter_column_chunks(self.data_frame, 2, "user_id")],
+            list(iter_column_chunks(self.expected_dict, 2, "user_id")),
+        )
+
+    def test_merge_data_frames(self):
+        """Test that the columns of several data frames are merged on the user ID."""
+        other_data_frame = {"user_id": {"0": 7, "1": 8}, "score": {"0": 1.0, "1": 0.5}}
+
+        merged = merge_data_frames([self.data_frame, other_data_frame, {"user_id": {}}])
+
+        self.assertEqual(merged["user_id"], {0: 5, 1: 6, 2: 7, 3: 8})
+        self.assertEqual(merged["score"], {2: 1.0, 3: 0.5})
+        self.assertEqual(merged["grade"], self.expected_dict["grade"])
+
+    def test_concat_data_frames(self):
+        """Test that the rows of several columnar data frames are concatenated."""
+        other_data_frame = ColumnarDataFrame([8])
+        other_data_frame.add_column("email", ObjectColumn(["d@example.com"]))
+        other_data_frame.add_column("completed", BooleanColumn([True]))
+        other_data_frame.add_column("grade", FloatColumn([0.25]))
+
+        concatenated = concat_data_frames([self.data_frame, other_data_frame])
+
+        self.assertIsInstance(concatenated, ColumnarDataFrame)
+        self.assertEqual(
+            concatenated.to_dict(),
+            {
+                "user_id": {0: 5, 1: 6, 2: 7, 3: 8},
+                "email": {**self.expected_dict["email"], 3: "d@example.com"},
+                "completed": {**self.expected_dict["completed"], 3: True},
+                "grade": {**self.expected_dict["grade"], 3: 0.25},
+            },
+        )
+
+    def test_concat_dict_data_frames(self):
+        """Test that the dict data frames are merged on the user ID."""
+        other_data_frame = {"user_id": {"0": 8}, "grade": {"0": 0.25}}
+
+        concatenated = concat_data_frames([self.data_frame, other_data_frame])
+
+        self.assertEqual(concatenated["user_id"], {0: 5, 1: 6, 2: 7, 3: 8})
+        self.assertEqual(concatenated["grade"], {**self.expected_dict["grade"], 3: 0.25})
+
+    @override_settings(ONTASK_DATA_SUMMARY_MEMORY_BUDGET=100)
+    def test_spill_columns(self):
+        """Test that the columns added over the memory budget are spilled and read back from disk."""
+        user_ids = list(range(10, 20))
+        data_frame = ColumnarDataFrame(user_ids)
+        data_frame.add_column("email", ObjectColumn(f"{user_id}@example.com" for user_id in user_ids))
+        data_frame.add_column("completed", BooleanColumn(user_id % 3 == 0 or None for user_id in user_ids))
+        data_frame.add_column("grade", FloatColumn(user_id / 20 for user_id in user_ids))
+        expected_dict = {
+            "user_id": dict(enumerate(user_ids)),
+            "email": {index: f"{user_id}@example.com" for index, user_id in enumerate(user_ids)},
+            "completed": {index: user_id % 3 == 0 or None for index, user_id in enumerate(user_ids)},
+            "grade": {index: user_id / 20 for index, user_id in enumerate(user_ids)},
+        }
+
+        self.assertIsInstance(data_frame["completed"].bits, memoryview)
+        self.assertIsInstance(data_frame["grade"].values, memoryview)
+        self.assertEqual(data_frame.memory_size, data_frame.user_ids.nbytes + data_frame["email"].nbytes)
+        self.assertEqual(data_frame.to_dict(), expected_dict)
+        self.assertEqual(
+            [data_frame_to_dict(chunk) for chunk in iter_row_chunks(data_frame, 4, "user_id")],
+            list(iter_row_chunks(expected_dict, 4, "user_id")),
+        )
+        unpickled = pickle.loads(pickle.dumps(data_frame))
+        self.assertIsInstance(unpickled["grade"].values, array)
+        self.assertEqual(unpickled.to_dict(), expected_dict)
+        self.assertEqual(concat_data_frames([data_frame, data_frame])["grade"][10], 0.5)
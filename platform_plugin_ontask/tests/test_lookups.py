@@ -0,0 +1,128 @@
+"""Tests for the bulk lookups of the data summary backends."""
+
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.test.utils import override_settings
+from xblock.completable import XBlockCompletionMode
+
+from platform_plugin_ontask.data_summary.lookups import CompletionLookup, ScoreLookup, get_completable_children
+
+LOOKUPS_MODULE_PATH = "platform_plugin_ontask.data_summary.lookups"
+
+
+def make_block(usage_id: str, mode: str = XBlockCompletionMode.COMPLETABLE, children: list = None) -> Mock:
+    """Return a block mock with the given completion mode and children."""
+    return Mock(
+        spec=["usage_key", "scope_ids", "completion_mode", "get_child_descriptors"],
+        usage_key=usage_id,
+        scope_ids=Mock(usage_id=usage_id),
+        completion_mode=mode,
+        get_child_descriptors=Mock(return_value=children or []),
+    )
+
+
+class TestCompletionLookup(TestCase):
+    """Tests for the CompletionLookup class."""
+
+    def setUp(self):
+        self.course_key = Mock()
+        self.library = make_block(
+            "library",
+            XBlockCompletionMode.AGGREGATOR,
+            [make_block("problem-2"), make_block("discussion", XBlockCompletionMode.EXCLUDED)],
+        )
+        self.unit_1 = make_block("unit-1", XBlockCompletionMode.AGGREGATOR, [make_block("problem-1"), self.library])
+        self.unit_2 = make_block("unit-2", XBlockCompletionMode.AGGREGATOR, [make_block("html-1")])
+        self.empty_unit = make_block("unit-3", XBlockCompletionMode.AGGREGATOR)
+
+    def test_get_completable_children(self):
+        """Test that only the completable leaf blocks are returned."""
+        children = get_completable_children(self.unit_1)
+
+        self.assertEqual([child.scope_ids.usage_id for child in children], ["problem-1", "problem-2"])
+
+    @patch(f"{LOOKUPS_MODULE_PATH}.get_block_completions")
+    def test_vertical_is_complete(self, mock_get_block_completions: Mock):
+        """Test that a unit is complete only when all its leaf blocks are completed."""
+        mock_get_block_completions.return_value = [
+            (1, "problem-1"),
+            (1, "problem-2"),
+            (2, "problem-1"),
+            (2, "html-1"),
+            (2, "unknown-block"),
+        ]
+
+        unit_leaf_keys = {
+            unit.usage_key: [child.scope_ids.usage_id for child in get_completable_children(unit)]
+            for unit in (self.unit_1, self.unit_2, self.empty_unit)
+        }
+
+        lookup = CompletionLookup(self.course_key, unit_leaf_keys).load([1, 2, 3])
+
+        self.assertTrue(lookup.vertical_is_complete(1, "unit-1"))
+        self.assertFalse(lookup.vertical_is_complete(1, "unit-2"))
+        self.assertFalse(lookup.vertical_is_complete(2, "unit-1"))
+        self.assertTrue(lookup.vertical_is_complete(2, "unit-2"))
+        self.assertFalse(lookup.vertical_is_complete(3, "unit-1"))
+        self.assertTrue(lookup.vertical_is_complete(3, "unit-3"))
+
+    @override_settings(ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE=2)
+    @patch(f"{LOOKUPS_MODULE_PATH}.get_block_completions")
+    def test_load_in_chunks(self, mock_get_block_completions: Mock):
+        """Test that the completions are queried in chunks of users."""
+        mock_get_block_completions.return_value = []
+
+        CompletionLookup(self.course_key, {"unit-1": ["problem-1"]}).load([1, 2, 3, 4, 5])
+
+        self.assertEqual(
+            [call.args[1] for call in mock_get_block_completions.call_args_list],
+            [[1, 2], [3, 4], [5]],
+        )
+
+    @patch(f"{LOOKUPS_MODULE_PATH}.completion_tracking_enabled", Mock(return_value=False))
+    @patch(f"{LOOKUPS_MODULE_PATH}.get_block_completions")
+    def test_completion_tracking_disabled(self, mock_get_block_completions: Mock):
+        """Test that no completions are queried when completion tracking is disabled."""
+        lookup = CompletionLookup(self.course_key, {"unit-1": ["problem-1"]}).load([1])
+
+        self.assertIsNone(lookup.vertical_is_complete(1, "unit-1"))
+        mock_get_block_completions.assert_not_called()
+
+
+class TestScoreLookup(TestCase):
+    """Tests for the ScoreLookup class."""
+
+    def setUp(self):
+        self.course_key = Mock()
+        self.components = ["problem-1", "problem-2"]
+
+    @patch(f"{LOOKUPS_MODULE_PATH}.get_student_module_grades")
+    def test_get_grade(self, mock_get_student_module_grades: Mock):
+        """Test that the grades are served from the prefetched index."""
+        mock_get_student_module_grades.return_value = [
+            (1, "problem-1", 0.5),
+            (2, "problem-2", 1.0),
+            (2, "unknown-block", 1.0),
+        ]
+
+        lookup = ScoreLookup(self.course_key, self.components).load([1, 2])
+
+        self.assertEqual(lookup.get_grade(1, "problem-1"), 0.5)
+        self.assertEqual(lookup.get_grade(1, "problem-2"), 0)
+        self.assertEqual(lookup.get_grade(2, "problem-2"), 1.0)
+        self.assertEqual(lookup.get_grade(3, "problem-1"), 0)
+        self.assertNotIn((2, "unknown-block"), lookup.grades)
+
+    @override_settings(ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE=2)
+    @patch(f"{LOOKUPS_MODULE_PATH}.get_student_module_grades")
+    def test_load_in_chunks(self, mock_get_student_module_grades: Mock):
+        """Test that the grades are queried in chunks of users."""
+        mock_get_student_module_grades.return_value = []
+
+        ScoreLookup(self.course_key, self.components).load([1, 2, 3])
+
+        self.assertEqual(
+            [call.args[1] for call in mock_get_student_module_grades.call_args_list],
+            [[1, 2], [3]],
+        )
@@ -0,0 +1,156 @@
+"""Tests for the sync stage metrics."""
+
+import json
+from unittest import TestCase, skipIf
+from unittest.mock import Mock, call, patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.client import OnTaskClient
+from platform_plugin_ontask.metrics import (
+    NullMetricsBackend,
+    PrometheusMetricsBackend,
+    StatsdMetricsBackend,
+    clear_metrics_backends,
+    get_metrics_backend,
+    measure_stage,
+    prometheus_client,
+)
+
+METRICS_MODULE_PATH = "platform_plugin_ontask.metrics"
+
+
+class RecordingMetricsBackend(NullMetricsBackend):
+    """Metrics backend that keeps the metrics in a list."""
+
+    def __init__(self, **options):
+        self.options = options
+        self.metrics = []
+
+    def timing(self, name, seconds, tags):
+        self.metrics.append(("timing", name, tags))
+
+    def gauge(self, name, value, tags):
+        self.metrics.append(("gauge", name, value, tags))
+
+
+@override_settings(
+    ONTASK_METRICS_BACKEND="platform_plugin_ontask.tests.test_metrics.RecordingMetricsBackend",
+    ONTASK_METRICS_BACKEND_OPTIONS={"prefix": "test"},
+)
+class TestMeasureStage(SimpleTestCase):
+    """Tests for `measure_stage`."""
+
+    def setUp(self):
+        clear_metrics_backends(setting="ONTASK_METRICS_BACKEND")
+
+    def test_get_metrics_backend(self):
+        """Test that the backend of the setting is created once with its options."""
+        backend = get_metrics_backend()
+
+        self.assertIsInstance(backend, RecordingMetricsBackend)
+        self.assertEqual(backend.options, {"prefix": "test"})
+        self.assertIs(get_metrics_backend(), backend)
+
+    def test_measure_stage(self):
+        """Test that the stage is logged and sent to the metrics backend."""
+        with self.assertLogs(METRICS_MODULE_PATH) as logs:
+            with measure_stage("compute", tags={"summary": "UserDataSummary"}, course_id="course") as stage:
+                stage.values.update(rows=10, columns=3)
+
+        self.assertGreaterEqual(stage.seconds, 0)
+        self.assertEqual(
+            logs.records[0].ontask_stage,
+            {
+                "stage": "compute",
+                "seconds": stage.seconds,
+                "summary": "UserDataSummary",
+                "course_id": "course",
+                "rows": 10,
+                "columns": 3,
+            },
+        )
+        self.assertIn("course_id=course rows=10", logs.output[0])
+        tags = {"summary": "UserDataSummary"}
+        self.assertEqual(
+            get_metrics_backend().metrics,
+            [
+                ("timing", "compute", tags),
+                ("gauge", "compute.rows", 10, tags),
+                ("gauge", "compute.columns", 3, tags),
+            ],
+        )
+
+    def test_measure_stage_error(self):
+        """Test that a failed stage is logged with its error and not sent to the backend."""
+        with self.assertLogs(METRICS_MODULE_PATH) as logs, self.assertRaises(ValueError):
+            with measure_stage("outline"):
+                raise ValueError
+
+        self.assertEqual(logs.records[0].ontask_stage["error"], "ValueError")
+        self.assertEqual(get_metrics_backend().metrics, [])
+
+    def test_request_stages(self):
+        """Test that the client measures the serialization and request of a merge."""
+        client = OnTaskClient("https://ontask.example.com", "api-key")
+        client.session = Mock()
+        client.session.put.return_value.status_code = 200
+
+        with self.assertLogs(METRICS_MODULE_PATH) as logs:
+            client.merge_table(1, {"user_id": {0: 1}})
+
+        body = client.session.put.call_args.kwargs["data"]
+        self.assertEqual(json.loads(body)["src_df"], {"user_id": {"0": 1}})
+        self.assertEqual([record.ontask_stage["stage"] for record in logs.records], ["serialize", "request"])
+        self.assertEqual(logs.records[1].ontask_stage["status_code"], 200)
+        self.assertIn(("gauge", "request.wire_bytes", len(body), {"operation": "merge"}), get_metrics_backend().metrics)
+
+
+class TestStatsdMetricsBackend(TestCase):
+    """Tests for `StatsdMetricsBackend`."""
+
+    def test_metric_names(self):
+        """Test that the tag values are part of the metric names."""
+        client = Mock()
+        backend = StatsdMetricsBackend(client=client)
+
+        backend.timing("compute", 0.5, {"summary": "UserDataSummary"})
+        backend.gauge("request.wire_bytes", 100, {"operation": "merge"})
+        backend.gauge("enrollments.users", 10, {})
+
+        client.timing.assert_called_once_with("compute.UserDataSummary", 500)
+        self.assertEqual(
+            client.gauge.call_args_list,
+            [call("request.merge.wire_bytes", 100), call("enrollments.users", 10)],
+        )
+
+    @patch(f"{METRICS_MODULE_PATH}.statsd", None)
+    def test_statsd_not_installed(self):
+        """Test that the backend requires statsd to create its client."""
+        with self.assertRaises(ImproperlyConfigured):
+            StatsdMetricsBackend()
+
+
+class TestPrometheusMetricsBackend(TestCase):
+    """Tests for `PrometheusMetricsBackend`."""
+
+    @skipIf(prometheus_client is None, "prometheus_client is not installed.")
+    def test_metrics(self):  # pragma: no cover
+        """Test that the stages are recorded in histograms and gauges."""
+        registry = prometheus_client.CollectorRegistry()
+        backend = PrometheusMetricsBackend(registry=registry)
+
+        backend.timing("compute", 0.5, {"summary": "UserDataSummary"})
+        backend.gauge("compute.rows", 10, {"summary": "UserDataSummary"})
+
+        labels = {"summary": "UserDataSummary"}
+        self.assertEqual(registry.get_sample_value("ontask_compute_seconds_count", labels), 1)
+        self.assertEqual(registry.get_sample_value("ontask_compute_rows", labels), 10)
+
+    @patch(f"{METRICS_MODULE_PATH}.prometheus_client", None)
+    def test_prometheus_client_not_installed(self):
+        """Test that the backend requires prometheus_client."""
+        with self.assertRaises(ImproperlyConfigured):
+            PrometheusMetricsBackend()
@@ -0,0 +1,105 @@
+"""Tests for the local OnTask stand-in server."""
+
+import time
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.client import OnTaskClient
+from test_utils.ontask_server import NON_EMPTY_TABLE_ERROR, OnTaskServer
+
+CLIENT_MODULE_PATH = "platform_plugin_ontask.client"
+
+
+@override_settings(ONTASK_HTTP_MAX_RETRIES=0)
+class TestOnTaskServerAPI(SimpleTestCase):
+    """Tests for the OnTask client against the local server."""
+
+    def setUp(self):
+        self.data_frame = {
+            "user_id": {0: 1, 1: 2, 2: 3},
+            "email": {0: "a@example.com", 1: "b@example.com", 2: "c@example.com"},
+        }
+
+    def test_create_workflow(self):
+        """Test that a workflow is created with an empty table."""
+        with OnTaskServer() as server:
+            response = OnTaskClient(server.url, "api-key").create_workflow("course-v1:edX+DemoX+Demo_Course")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["id"], 1)
+        self.assertEqual(server.tables[1].name, "course-v1:edX+DemoX+Demo_Course")
+        self.assertEqual(server.tables[1].user_ids, set())
+
+    def test_merge_empty_table(self):
+        """Test that the first chunk initializes an empty table and the others are merged."""
+        with OnTaskServer() as server:
+            workflow_id = server.create_workflow()
+            response = OnTaskClient(server.url, "api-key").merge_table_in_chunks(
+                workflow_id, self.data_frame, mode="rows", chunk_size=2
+            )
+
+        self.assertTrue(response.ok)
+        self.assertEqual(
+            [(request.path, request.status) for request in server.requests],
+            [
+                (f"/table/{workflow_id}/merge/", 400),
+                (f"/table/{workflow_id}/ops/", 201),
+                (f"/table/{workflow_id}/merge/", 201),
+            ],
+        )
+        self.assertEqual(server.tables[workflow_id].user_ids, {1, 2, 3})
+        self.assertEqual(server.tables[workflow_id].columns, {"user_id", "email"})
+
+    def test_injected_empty_table_error(self):
+        """Test that the "non-empty table" error can be returned for a non-empty table."""
+        with OnTaskServer() as server:
+            workflow_id = server.create_workflow(user_ids=[1])
+            server.inject_empty_table_error()
+            response = OnTaskClient(server.url, "api-key").merge_table(workflow_id, self.data_frame)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(NON_EMPTY_TABLE_ERROR, response.text)
+
+    @patch(f"{CLIENT_MODULE_PATH}.time.sleep", Mock())
+    def test_injected_errors_are_retried(self):
+        """Test that the chunks failed with injected server errors are retried."""
+        with OnTaskServer() as server:
+            workflow_id = server.create_workflow(user_ids=[1])
+            server.inject_error(503, path="/merge/", count=2)
+            response = OnTaskClient(server.url, "api-key").merge_table_in_chunks(
+                workflow_id, self.data_frame, retries=2
+            )
+
+        self.assertTrue(response.ok)
+        stats = server.get_stats()
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["failed_requests"], 2)
+        self.assertEqual(stats["paths"], {f"/table/{workflow_id}/merge/": 3})
+        self.assertEqual(stats["body_bytes"], sum(request.body_size for request in server.requests))
+
+    def test_error_rate(self):
+        """Test that a share of the table requests fail at random."""
+        with OnTaskServer(error_rate=1) as server:
+            workflow_id = server.create_workflow(user_ids=[1])
+            response = OnTaskClient(server.url, "api-key").merge_table(workflow_id, self.data_frame)
+
+        self.assertEqual(response.status_code, 503)
+
+    def test_latency(self):
+        """Test that the responses are delayed by the latency."""
+        with OnTaskServer(latency=0.05, keep_payloads=False) as server:
+            workflow_id = server.create_workflow(user_ids=[1])
+            start = time.monotonic()
+            OnTaskClient(server.url, "api-key").merge_table(workflow_id, self.data_frame)
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+        self.assertIsNone(server.requests[0].payload)
+
+    def test_unknown_workflow(self):
+        """Test that the table requests of an unknown workflow are not found."""
+        with OnTaskServer() as server:
+            response = OnTaskClient(server.url, "api-key").merge_table(1, self.data_frame)
+
+        self.assertEqual(response.status_code, 404)
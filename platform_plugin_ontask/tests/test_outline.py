@@ -0,0 +1,104 @@
+"""Tests for the cached course outline."""
+
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+from xblock.completable import XBlockCompletionMode
+
+from platform_plugin_ontask.data_summary.outline import get_course_outline, get_course_version_cache_key
+from platform_plugin_ontask.edxapp_wrapper.modulestore import get_course_published_signal
+from platform_plugin_ontask.sync import get_high_water_mark, set_high_water_mark
+
+OUTLINE_MODULE_PATH = "platform_plugin_ontask.data_summary.outline"
+
+
+def make_block(block_id: str, display_name: str, mode: str, children: list = None) -> Mock:
+    """Return a block mock with the given completion mode and children."""
+    usage_key = Mock(block_id=block_id, context_key=None)
+    usage_key.__str__ = Mock(return_value=block_id)
+    return Mock(
+        spec=["usage_key", "scope_ids", "display_name_with_default", "completion_mode", "get_children"],
+        usage_key=usage_key,
+        scope_ids=Mock(usage_id=usage_key),
+        display_name_with_default=display_name,
+        completion_mode=mode,
+        get_children=Mock(return_value=children or []),
+    )
+
+
+class TestCourseOutline(TestCase):
+    """Tests for the course outline functions."""
+
+    def setUp(self):
+        cache.clear()
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        problem = make_block("problem", "Problem", XBlockCompletionMode.COMPLETABLE)
+        html = make_block("html", "Text", XBlockCompletionMode.COMPLETABLE)
+        discussion = make_block("discussion", "Discussion", XBlockCompletionMode.EXCLUDED)
+        unit = make_block("unit", "Unit", XBlockCompletionMode.AGGREGATOR, [problem, html, discussion])
+        subsection = make_block("subsection", "Subsection", XBlockCompletionMode.AGGREGATOR, [unit])
+        section = make_block("section", "Section", XBlockCompletionMode.AGGREGATOR, [subsection])
+        self.course = Mock(course_version="version-1", get_children=Mock(return_value=[section]))
+        self.modulestore = Mock(get_course=Mock(return_value=self.course))
+
+    def get_course_outline(self):
+        """Get the course outline with the modulestore mock."""
+        with patch(f"{OUTLINE_MODULE_PATH}.modulestore", Mock(return_value=self.modulestore)):
+            return get_course_outline(self.course_key)
+
+    def get_full_course_calls(self):
+        """Get the number of times the whole course tree was loaded."""
+        return self.modulestore.get_course.call_args_list.count(((self.course_key,), {"depth": None}))
+
+    def test_build_course_outline(self):
+        """Test that the outline keeps the units and components of the course."""
+        outline = self.get_course_outline()
+
+        self.assertEqual(outline.version, "version-1")
+        self.assertEqual(len(outline.units), 1)
+        unit = outline.units[0]
+        self.assertEqual(
+            (unit.usage_key, unit.block_id, unit.display_name, unit.subsection_name, unit.section_name),
+            ("unit", "unit", "Unit", "Subsection", "Section"),
+        )
+        self.assertEqual(unit.leaf_keys, ("problem", "html"))
+        self.assertEqual([component.usage_key for component in outline.components], ["problem", "html", "discussion"])
+        self.assertEqual(
+            {(component.unit_key, component.unit_block_id, component.unit_name) for component in outline.components},
+            {("unit", "unit", "Unit")},
+        )
+        self.modulestore.get_course.assert_called_with(self.course_key, depth=None)
+
+    def test_outline_is_cached(self):
+        """Test that the modulestore is only read once."""
+        first_outline = self.get_course_outline()
+        second_outline = self.get_course_outline()
+
+        self.assertEqual(first_outline, second_outline)
+        self.modulestore.get_course.assert_called_once_with(self.course_key, depth=None)
+
+    def test_outline_of_other_version_is_rebuilt(self):
+        """Test that a cached outline of another version of the course is rebuilt once the version expires."""
+        self.get_course_outline()
+        self.course.course_version = "version-2"
+        self.assertEqual(self.get_course_outline().version, "version-1")
+
+        cache.delete(get_course_version_cache_key(self.course_key))
+        outline = self.get_course_outline()
+
+        self.assertEqual(outline.version, "version-2")
+        self.assertEqual(self.get_full_course_calls(), 2)
+
+    def test_course_published(self):
+        """Test that publishing the course clears the outline and the high-water marks."""
+        self.get_course_outline()
+        set_high_water_mark(str(self.course_key), 1, timezone.now())
+
+        get_course_published_signal().send(sender=None, course_key=self.course_key)
+        self.get_course_outline()
+
+        self.assertEqual(self.get_full_course_calls(), 2)
+        self.assertIsNone(get_high_water_mark(str(self.course_key), 1))
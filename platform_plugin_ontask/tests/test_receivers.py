@@ -0,0 +1,126 @@
+"""Tests for the signal receivers of the OnTask plugin."""
+
+import time
+from unittest.mock import Mock, patch
+
+from celery.concurrency import get_implementation
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.edxapp_wrapper.completion import get_block_completion_model
+from platform_plugin_ontask.edxapp_wrapper.courseware import get_problem_weighted_score_changed_signal
+from platform_plugin_ontask.receivers import worker_started_handler
+from platform_plugin_ontask.sync import pop_dirty_users, set_course_synced
+
+RECEIVERS_MODULE_PATH = "platform_plugin_ontask.receivers"
+
+
+@override_settings(ONTASK_EVENT_SYNC=True, ONTASK_EVENT_SYNC_FLUSH_INTERVAL=5)
+@patch(f"{RECEIVERS_MODULE_PATH}.flush_dirty_users_task.apply_async")
+class TestEventSyncReceivers(SimpleTestCase):
+    """Tests for the completion and grade receivers."""
+
+    def setUp(self):
+        cache.clear()
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+        self.bucket = int(time.time() // 5)
+        set_course_synced(self.course_id)
+
+    @patch("platform_plugin_ontask.sync.time")
+    def test_changes_are_buffered(self, mock_time: Mock, mock_apply_async: Mock):
+        """Test that the completions and scores of a course schedule a single flush of their users."""
+        mock_time.time.return_value = 102
+        post_save.send(
+            sender=get_block_completion_model(),
+            instance=Mock(context_key=self.course_id, user_id=1),
+            created=True,
+        )
+        get_problem_weighted_score_changed_signal().send(sender=None, user_id=2, course_id=self.course_id)
+        get_problem_weighted_score_changed_signal().send(sender=None, user_id=1, course_id=self.course_id)
+
+        mock_apply_async.assert_called_once_with((self.course_id, 20), countdown=4)
+        self.assertEqual(pop_dirty_users(self.course_id, 20), {1, 2})
+
+    def test_raw_completions_are_ignored(self, mock_apply_async: Mock):
+        """Test that the completions loaded from fixtures are not buffered."""
+        post_save.send(
+            sender=get_block_completion_model(),
+            instance=Mock(context_key=self.course_id, user_id=1),
+            created=True,
+            raw=True,
+        )
+
+        mock_apply_async.assert_not_called()
+        self.assertEqual(pop_dirty_users(self.course_id, self.bucket), set())
+
+    @override_settings(ONTASK_EVENT_SYNC=False)
+    def test_event_sync_disabled(self, mock_apply_async: Mock):
+        """Test that nothing is buffered when the event sync is disabled."""
+        get_problem_weighted_score_changed_signal().send(sender=None, user_id=1, course_id=self.course_id)
+
+        mock_apply_async.assert_not_called()
+        self.assertEqual(pop_dirty_users(self.course_id, self.bucket), set())
+
+    @patch(f"{RECEIVERS_MODULE_PATH}.mark_user_dirty")
+    def test_course_not_synced(self, mock_mark_user_dirty: Mock, mock_apply_async: Mock):
+        """Test that the changes of a course whose table was never synced are not buffered."""
+        get_problem_weighted_score_changed_signal().send(
+            sender=None, user_id=1, course_id="course-v1:edX+DemoX+Other_Course"
+        )
+
+        mock_mark_user_dirty.assert_not_called()
+        mock_apply_async.assert_not_called()
+
+    @patch(f"{RECEIVERS_MODULE_PATH}.mark_user_dirty", Mock(side_effect=ConnectionError))
+    def test_buffer_error(self, mock_apply_async: Mock):
+        """Test that a change that cannot be buffered is logged and left to the next sync."""
+        with self.assertLogs(RECEIVERS_MODULE_PATH, "ERROR"):
+            get_problem_weighted_score_changed_signal().send(sender=None, user_id=1, course_id=self.course_id)
+
+        mock_apply_async.assert_not_called()
+
+
+@patch("django.db.models.signals.post_save.connect")
+class TestReceiversConnection(SimpleTestCase):
+    """Tests for the connection of the signal receivers."""
+
+    @override_settings(ROOT_URLCONF="cms.urls")
+    def test_cms_receivers(self, mock_post_save_connect: Mock):
+        """Test that the completion and score receivers are not connected in the CMS."""
+        with patch.object(get_problem_weighted_score_changed_signal(), "connect") as mock_score_connect:
+            apps.get_app_config("platform_plugin_ontask").ready()
+
+        mock_post_save_connect.assert_not_called()
+        mock_score_connect.assert_not_called()
+
+    def test_lms_receivers(self, mock_post_save_connect: Mock):
+        """Test that the completion and score receivers are connected in the LMS."""
+        with patch.object(get_problem_weighted_score_changed_signal(), "connect") as mock_score_connect:
+            apps.get_app_config("platform_plugin_ontask").ready()
+
+        mock_post_save_connect.assert_called_once()
+        mock_score_connect.assert_called_once()
+
+
+@override_settings(ONTASK_DATA_SUMMARY_PROCESSES=4)
+class TestWorkerStartedHandler(SimpleTestCase):
+    """Tests for the warning of the workers that cannot compute the data summaries in processes."""
+
+    def test_prefork_pool(self):
+        """Test that the workers of the prefork pool warn that the processes are ignored."""
+        with self.assertLogs(RECEIVERS_MODULE_PATH, "WARNING"):
+            worker_started_handler("worker@host", instance=Mock(pool_cls=get_implementation("prefork")))
+
+    def test_solo_pool(self):
+        """Test that the workers of the solo pool do not warn."""
+        with self.assertNoLogs(RECEIVERS_MODULE_PATH, "WARNING"):
+            worker_started_handler("worker@host", instance=Mock(pool_cls=get_implementation("solo")))
+
+    @override_settings(ONTASK_DATA_SUMMARY_PROCESSES=1)
+    def test_processes_disabled(self):
+        """Test that nothing is logged when the data summaries are not computed in processes."""
+        with self.assertNoLogs(RECEIVERS_MODULE_PATH, "WARNING"):
+            worker_started_handler("worker@host", instance=Mock(pool_cls=get_implementation("threads")))
@@ -0,0 +1,30 @@
+"""Tests for the registry of the edxapp_wrapper backends."""
+
+from unittest import TestCase
+
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.edxapp_wrapper.backends.tests import courseware_r_v1_test, modulestore_r_v1_test
+from platform_plugin_ontask.edxapp_wrapper.registry import _backends, get_backend
+
+BACKEND_SETTING = "PLATFORM_PLUGIN_ONTASK_COURSEWARE_BACKEND"
+
+
+class TestRegistry(TestCase):
+    """Tests for the get_backend function."""
+
+    def test_get_backend(self):
+        """Test that the backend module is resolved and kept in the registry."""
+        backend = get_backend(BACKEND_SETTING)
+
+        self.assertIs(backend, courseware_r_v1_test)
+        self.assertIs(_backends[BACKEND_SETTING], backend)
+
+    def test_get_backend_setting_changed(self):
+        """Test that the backend is resolved again when the setting changes."""
+        get_backend(BACKEND_SETTING)
+
+        with override_settings(**{BACKEND_SETTING: modulestore_r_v1_test.__name__}):
+            self.assertIs(get_backend(BACKEND_SETTING), modulestore_r_v1_test)
+
+        self.assertIs(get_backend(BACKEND_SETTING), courseware_r_v1_test)
@@ -0,0 +1,98 @@
+"""Tests for the periodic sync schedule of the courses."""
+
+import random
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from platform_plugin_ontask.schedule import (
+    clear_periodic_sync_courses,
+    get_countdowns,
+    get_due_syncs,
+    get_last_periodic_sync,
+    get_periodic_sync_course_blocks,
+    get_sync_interval,
+    set_last_periodic_sync,
+)
+
+SCHEDULE_MODULE_PATH = "platform_plugin_ontask.schedule"
+
+
+def make_course_block(course_id: str, **other_course_settings) -> SimpleNamespace:
+    """Make a course block with the given Other Course Settings."""
+    return SimpleNamespace(id=course_id, other_course_settings=other_course_settings)
+
+
+@override_settings(ONTASK_PERIODIC_SYNC_INTERVAL=3600, ONTASK_API_AUTH_TOKEN=None)
+class TestPeriodicSyncSchedule(SimpleTestCase):
+    """Tests for the courses due for a periodic sync."""
+
+    def setUp(self):
+        cache.clear()
+        self.now = 1_000_000.0
+
+    def test_get_sync_interval(self):
+        """Test that a course can override or disable the periodic sync interval."""
+        self.assertEqual(get_sync_interval(make_course_block("course-v1:a+b+c")), 3600)
+        self.assertEqual(get_sync_interval(make_course_block("course-v1:a+b+c", ONTASK_SYNC_INTERVAL="600")), 600)
+        self.assertIsNone(get_sync_interval(make_course_block("course-v1:a+b+c", ONTASK_SYNC_INTERVAL=0)))
+        self.assertEqual(get_sync_interval(make_course_block("course-v1:a+b+c", ONTASK_SYNC_INTERVAL="x")), 3600)
+
+    @override_settings(ONTASK_PERIODIC_SYNC_INTERVAL=None)
+    def test_get_sync_interval_disabled(self):
+        """Test that only the courses with their own interval are synced when the setting is not set."""
+        self.assertIsNone(get_sync_interval(make_course_block("course-v1:a+b+c")))
+        self.assertEqual(get_sync_interval(make_course_block("course-v1:a+b+c", ONTASK_SYNC_INTERVAL=600)), 600)
+
+    def test_get_due_syncs(self):
+        """Test that only the due courses with a workflow and a token are returned, the most overdue first."""
+        token = {"ONTASK_WORKFLOW_ID": 1, "ONTASK_API_AUTH_TOKEN": "token"}
+        course_blocks = [
+            make_course_block("course-v1:a+b+recent", **token),
+            make_course_block("course-v1:a+b+late", **token),
+            make_course_block("course-v1:a+b+new", **token),
+            make_course_block("course-v1:a+b+no_workflow", ONTASK_API_AUTH_TOKEN="token"),
+            make_course_block("course-v1:a+b+no_token", ONTASK_WORKFLOW_ID=2),
+            make_course_block("course-v1:a+b+disabled", ONTASK_SYNC_INTERVAL=0, **token),
+        ]
+        set_last_periodic_sync("course-v1:a+b+recent", self.now - 60)
+        set_last_periodic_sync("course-v1:a+b+late", self.now - 3700)
+
+        due_syncs = get_due_syncs(course_blocks, self.now)
+
+        self.assertEqual(
+            [(due_sync.course_id, due_sync.workflow_id, due_sync.api_auth_token) for due_sync in due_syncs],
+            [("course-v1:a+b+new", 1, "token"), ("course-v1:a+b+late", 1, "token")],
+        )
+        self.assertEqual(due_syncs[1].overdue, 100)
+        self.assertEqual(get_last_periodic_sync("course-v1:a+b+new"), None)
+
+    def test_get_countdowns(self):
+        """Test that each sync starts at a random time of its own slot of the window."""
+        countdowns = get_countdowns(4, 100, random.Random(0))
+
+        self.assertEqual(len(countdowns), 4)
+        for index, countdown in enumerate(countdowns):
+            self.assertGreaterEqual(countdown, index * 25)
+            self.assertLess(countdown, (index + 1) * 25)
+        self.assertEqual(get_countdowns(0, 100), [])
+
+    @patch(f"{SCHEDULE_MODULE_PATH}.modulestore")
+    @patch(f"{SCHEDULE_MODULE_PATH}.get_courses")
+    def test_get_periodic_sync_course_blocks(self, mock_get_courses: Mock, mock_modulestore: Mock):
+        """Test that only the courses with a workflow are loaded until a course is published."""
+        course_block = make_course_block("course-v1:a+b+c", ONTASK_WORKFLOW_ID=1)
+        mock_get_courses.return_value = [course_block, make_course_block("course-v1:a+b+d")]
+        mock_modulestore.return_value.get_course.return_value = course_block
+
+        self.assertEqual(get_periodic_sync_course_blocks(), [course_block])
+        self.assertEqual(get_periodic_sync_course_blocks(), [course_block])
+        clear_periodic_sync_courses()
+        get_periodic_sync_course_blocks()
+
+        self.assertEqual(mock_get_courses.call_count, 2)
+        mock_modulestore.return_value.get_course.assert_called_once()
+        self.assertEqual(mock_modulestore.return_value.get_course.call_args.kwargs, {"depth": 0})
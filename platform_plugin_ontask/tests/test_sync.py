@@ -0,0 +1,162 @@
+"""Tests for the sync state of the OnTask tables."""
+
+import time
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from django.core.cache import cache
+
+from platform_plugin_ontask.sync import (
+    SYNC_COALESCED,
+    SYNC_QUEUED,
+    SYNC_RUNNING,
+    clear_high_water_marks,
+    finish_sync,
+    get_changed_user_ids,
+    get_flush_countdown,
+    get_high_water_mark,
+    is_sync_pending,
+    mark_user_dirty,
+    pop_dirty_users,
+    refresh_sync,
+    request_sync,
+    set_high_water_mark,
+    start_sync,
+)
+
+SYNC_MODULE_PATH = "platform_plugin_ontask.sync"
+
+
+class TestHighWaterMarks(TestCase):
+    """Tests for the high-water marks of the incremental sync."""
+
+    def setUp(self):
+        cache.clear()
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+        self.high_water_mark = datetime(2024, 9, 1, tzinfo=timezone.utc)
+
+    def test_high_water_mark_per_workflow(self):
+        """Test that each workflow of a course has its own high-water mark."""
+        set_high_water_mark(self.course_id, 1, self.high_water_mark)
+
+        self.assertEqual(get_high_water_mark(self.course_id, 1), self.high_water_mark)
+        self.assertIsNone(get_high_water_mark(self.course_id, 2))
+
+    def test_clear_high_water_marks(self):
+        """Test that the high-water marks of a course can be cleared."""
+        set_high_water_mark(self.course_id, 1, self.high_water_mark)
+
+        clear_high_water_marks(self.course_id)
+
+        self.assertIsNone(get_high_water_mark(self.course_id, 1))
+
+    def test_high_water_mark_of_sync_started_before_clear(self):
+        """Test that a sync that started before the marks were cleared does not set a high-water mark."""
+        clear_high_water_marks(self.course_id)
+        set_high_water_mark(self.course_id, 1, self.high_water_mark)
+        set_high_water_mark(self.course_id, 2, datetime.now(timezone.utc))
+
+        self.assertIsNone(get_high_water_mark(self.course_id, 1))
+        self.assertIsNotNone(get_high_water_mark(self.course_id, 2))
+
+    @patch(f"{SYNC_MODULE_PATH}.get_users_with_enrollment_changes_since", Mock(return_value=[4]))
+    @patch(f"{SYNC_MODULE_PATH}.get_users_with_student_modules_since", Mock(return_value=[2, 3]))
+    @patch(f"{SYNC_MODULE_PATH}.get_users_with_completions_since", Mock(return_value=[1, 2]))
+    def test_get_changed_user_ids(self):
+        """Test that the changed users include completion, grade and enrollment changes."""
+        self.assertEqual(get_changed_user_ids(self.course_id, self.high_water_mark), {1, 2, 3, 4})
+
+
+class TestSyncLock(TestCase):
+    """Tests for the sync lock of the courses."""
+
+    def setUp(self):
+        cache.clear()
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+
+    def test_request_sync(self):
+        """Test that only the first request queues a sync."""
+        self.assertEqual(request_sync(self.course_id), SYNC_QUEUED)
+        self.assertEqual(request_sync(self.course_id), SYNC_COALESCED)
+        self.assertEqual(request_sync("course-v1:edX+Other+Course"), SYNC_QUEUED)
+
+    def test_finish_sync(self):
+        """Test that the lock is released when no request was received during the sync."""
+        request_sync(self.course_id)
+        start_sync(self.course_id)
+
+        self.assertFalse(finish_sync(self.course_id))
+        self.assertEqual(request_sync(self.course_id), SYNC_QUEUED)
+
+    def test_follow_up_sync(self):
+        """Test that the requests received during a sync are coalesced in one follow-up sync."""
+        request_sync(self.course_id)
+        start_sync(self.course_id)
+
+        self.assertEqual(request_sync(self.course_id), SYNC_RUNNING)
+        self.assertEqual(request_sync(self.course_id), SYNC_RUNNING)
+        self.assertTrue(finish_sync(self.course_id))
+        self.assertEqual(request_sync(self.course_id), SYNC_COALESCED)
+
+    @patch(f"{SYNC_MODULE_PATH}.get_sync_lock_timeout", Mock(return_value=60))
+    def test_refresh_sync(self):
+        """Test that a sync that makes progress keeps its lock and dirty flag past the lock timeout."""
+        started = time.time()
+        start_sync(self.course_id)
+        request_sync(self.course_id)
+        with patch("time.time", Mock(return_value=started + 50)):
+            refresh_sync(self.course_id)
+
+        with patch("time.time", Mock(return_value=started + 100)):
+            self.assertTrue(is_sync_pending(self.course_id))
+            self.assertTrue(finish_sync(self.course_id))
+
+    @patch(f"{SYNC_MODULE_PATH}.get_sync_lock_timeout", Mock(return_value=60))
+    def test_sync_lock_expires(self):
+        """Test that the lock of a sync that stops making progress expires."""
+        started = time.time()
+        start_sync(self.course_id)
+
+        with patch("time.time", Mock(return_value=started + 100)):
+            self.assertFalse(is_sync_pending(self.course_id))
+
+
+class TestDirtyUsers(TestCase):
+    """Tests for the buffer of the users whose rows changed."""
+
+    def setUp(self):
+        cache.clear()
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+
+    @patch(f"{SYNC_MODULE_PATH}.time")
+    def test_mark_user_dirty(self, mock_time: Mock):
+        """Test that each user is buffered once per interval, and only the first user schedules the flush."""
+        mock_time.time.return_value = 102
+
+        self.assertEqual(mark_user_dirty(self.course_id, 1), 20)
+        self.assertIsNone(mark_user_dirty(self.course_id, 2))
+        self.assertIsNone(mark_user_dirty(self.course_id, 1))
+        self.assertEqual(mark_user_dirty("course-v1:edX+Other+Course", 1), 20)
+
+        self.assertEqual(pop_dirty_users(self.course_id, 20), {1, 2})
+        self.assertEqual(pop_dirty_users(self.course_id, 20), set())
+
+    @patch(f"{SYNC_MODULE_PATH}.time")
+    def test_pop_dirty_users(self, mock_time: Mock):
+        """Test that the users buffered in the next interval are not popped with the current one."""
+        mock_time.time.return_value = 102
+        mark_user_dirty(self.course_id, 1)
+        mock_time.time.return_value = 105
+
+        self.assertEqual(mark_user_dirty(self.course_id, 1), 21)
+        self.assertEqual(pop_dirty_users(self.course_id, 20), {1})
+        self.assertEqual(pop_dirty_users(self.course_id, 21), {1})
+
+    @patch(f"{SYNC_MODULE_PATH}.time")
+    def test_get_flush_countdown(self, mock_time: Mock):
+        """Test that the flush of an interval is scheduled after its end."""
+        mock_time.time.return_value = 102
+
+        self.assertEqual(get_flush_countdown(20), 4)
+        self.assertEqual(get_flush_countdown(19), 1)
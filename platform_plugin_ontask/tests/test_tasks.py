@@ -1,13 +1,52 @@
 """Tests for the tasks module of the OnTask plugin."""
 
+import os
+import threading
+import time
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import ANY, Mock, patch
 
+from django.core.cache import cache
+from django.test import SimpleTestCase
 from django.test.utils import override_settings
 from rest_framework import status
 
-from platform_plugin_ontask.data_summary.backends.tests.dummy import DummyDataSummary
-from platform_plugin_ontask.tasks import upload_dataframe_to_ontask_task
+from platform_plugin_ontask import tasks
+from platform_plugin_ontask.data_summary.backends.tests.dummy import (
+    CourseOnlyDummyDataSummary,
+    DummyDataSummary,
+    ProcessDummyDataSummary,
+    SlowDummyDataSummary,
+)
+from platform_plugin_ontask.data_summary.backends.user import UserDataSummary
+from platform_plugin_ontask.data_summary.enrollments import EnrolledUser, get_enrollment_snapshot
+from platform_plugin_ontask.jobs import JOB_FAILED, JOB_SUCCEEDED, SyncJob
+from platform_plugin_ontask.schedule import get_last_periodic_sync, set_last_periodic_sync
+from platform_plugin_ontask.sync import (
+    SYNC_COALESCED,
+    SYNC_QUEUED,
+    SYNC_RUNNING,
+    finish_sync,
+    get_high_water_mark,
+    is_course_synced,
+    is_sync_pending,
+    is_table_initialized,
+    mark_user_dirty,
+    pop_dirty_users,
+    request_sync,
+    set_table_initialized,
+    try_start_sync,
+)
+from platform_plugin_ontask.tasks import (
+    compute_data_summaries_shard_task,
+    fail_sharded_sync_task,
+    flush_dirty_users_task,
+    get_data_summary_processes,
+    iter_data_summaries,
+    merge_data_summary_shards_task,
+    schedule_periodic_syncs_task,
+    upload_dataframe_to_ontask_task,
+)
 
 TASKS_MODULE_PATH = "platform_plugin_ontask.tasks"
 
@@ -16,9 +55,11 @@ class TestUploadDataframeOnTaskTask(TestCase):
     """Tests for the upload_dataframe_to_ontask_task task."""
 
     def setUp(self) -> None:
+        cache.clear()
         self.course_id = "course-v1:edX+DemoX+Demo_Course"
         self.workflow_id = 1
         self.api_auth_token = "test-api-auth-token"
+        set_table_initialized(self.workflow_id)
 
     @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
     @patch(f"{TASKS_MODULE_PATH}.log")
@@ -35,6 +76,141 @@ class TestUploadDataframeOnTaskTask(TestCase):
         mock_merge_table.assert_called_once_with(self.workflow_id, DummyDataSummary(self.course_id).get_data_summary())
         mock_log.info.assert_called_with("response")
 
+    @override_settings(ONTASK_UPLOAD_CHUNK_MODE="rows")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table_in_chunks")
+    @patch(f"{TASKS_MODULE_PATH}.log")
+    def test_upload_dataframe_to_ontask_in_chunks(self, mock_log: Mock, mock_merge_table_in_chunks: Mock):
+        """Test uploading a dataframe to OnTask in chunks."""
+        mock_merge_table_in_chunks.return_value = Mock(status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        mock_merge_table_in_chunks.assert_called_once_with(
+            self.workflow_id, DummyDataSummary(self.course_id).get_data_summary(), on_chunk=ANY
+        )
+        mock_log.info.assert_called_with("response")
+
+    @override_settings(
+        ONTASK_DATA_SUMMARY_MAX_WORKERS=3,
+        ONTASK_DATA_SUMMARY_CLASSES=[
+            "platform_plugin_ontask.data_summary.backends.tests.dummy.SlowDummyDataSummary",
+            "platform_plugin_ontask.data_summary.backends.tests.dummy.DummyDataSummary",
+        ],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_in_threads(self, mock_merge_table: Mock):
+        """Test that the data summaries computed concurrently are merged in the configured order."""
+        mock_merge_table.return_value = Mock(status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        self.assertEqual(
+            [merge_call.args[1] for merge_call in mock_merge_table.call_args_list],
+            [
+                SlowDummyDataSummary(self.course_id).get_data_summary(),
+                DummyDataSummary(self.course_id).get_data_summary(),
+            ],
+        )
+
+    @override_settings(
+        ONTASK_DATA_SUMMARY_CLASSES=[
+            "platform_plugin_ontask.data_summary.backends.user.UserDataSummary",
+            "platform_plugin_ontask.data_summary.backends.user.UserDataSummary",
+        ],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.get_enrollment_snapshot", wraps=get_enrollment_snapshot)
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_shared_enrollments(
+        self, mock_merge_table: Mock, mock_get_enrollment_snapshot: Mock
+    ):
+        """Test that the enrollment snapshot is fetched once and shared by the data summaries."""
+        mock_merge_table.return_value = Mock(status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        mock_get_enrollment_snapshot.assert_called_once_with(self.course_id)
+        self.assertEqual(mock_merge_table.call_count, 2)
+        self.assertEqual(mock_merge_table.call_args.args[1]["user_id"], {0: 1, 1: 2, 2: 3})
+
+    @override_settings(
+        ONTASK_DATA_SUMMARY_CLASSES=["platform_plugin_ontask.data_summary.backends.user.UserDataSummary"],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.get_changed_user_ids", Mock(return_value={2}))
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_incremental(self, mock_merge_table: Mock):
+        """Test that an incremental sync only merges the users changed since the last sync."""
+        mock_merge_table.return_value = Mock(status_code=status.HTTP_200_OK, ok=True, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token, incremental=True)
+        high_water_mark = get_high_water_mark(self.course_id, self.workflow_id)
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token, incremental=True)
+
+        first_data_frame, second_data_frame = (call.args[1] for call in mock_merge_table.call_args_list)
+        self.assertEqual(first_data_frame["user_id"], {0: 1, 1: 2, 2: 3})
+        self.assertEqual(second_data_frame["user_id"], {0: 2})
+        self.assertGreater(get_high_water_mark(self.course_id, self.workflow_id), high_water_mark)
+
+    @override_settings(
+        ONTASK_DATA_SUMMARY_CLASSES=[
+            "platform_plugin_ontask.data_summary.backends.user.UserDataSummary",
+            "platform_plugin_ontask.data_summary.backends.tests.dummy.DummyDataSummary",
+        ],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.update_table")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_empty_table(self, mock_merge_table: Mock, mock_update_table: Mock):
+        """Test that the first data frame rejected by an empty table initializes it, and the others are merged."""
+        cache.clear()
+        mock_merge_table.side_effect = [
+            Mock(ok=False, status_code=status.HTTP_400_BAD_REQUEST, text="non-empty table"),
+            Mock(ok=True, status_code=status.HTTP_200_OK, text="response"),
+        ]
+        mock_update_table.return_value = Mock(ok=True, status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        user_data_frame, dummy_data_frame = (merge_call.args[1] for merge_call in mock_merge_table.call_args_list)
+        self.assertEqual(user_data_frame["user_id"], {0: 1, 1: 2, 2: 3})
+        self.assertEqual(dummy_data_frame, DummyDataSummary(self.course_id).get_data_summary())
+        mock_update_table.assert_called_once_with(self.workflow_id, user_data_frame)
+        self.assertTrue(is_table_initialized(self.workflow_id))
+
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.update_table")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_unknown_table(self, mock_merge_table: Mock, mock_update_table: Mock):
+        """Test that a table of unknown state is merged without being probed."""
+        cache.clear()
+        mock_merge_table.return_value = Mock(ok=True, status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        data_frame = DummyDataSummary(self.course_id).get_data_summary()
+        self.assertEqual(
+            [merge_call.args[1] for merge_call in mock_merge_table.call_args_list],
+            [data_frame, data_frame],
+        )
+        mock_update_table.assert_not_called()
+
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.update_table")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_emptied_table(self, mock_merge_table: Mock, mock_update_table: Mock):
+        """Test that a merge rejected by a table emptied since the last sync is sent as an update."""
+        mock_merge_table.return_value = Mock(ok=False, status_code=status.HTTP_400_BAD_REQUEST, text="non-empty table")
+        mock_update_table.return_value = Mock(ok=True, status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        data_frame = DummyDataSummary(self.course_id).get_data_summary()
+        mock_merge_table.assert_called_once_with(self.workflow_id, data_frame)
+        mock_update_table.assert_called_once_with(self.workflow_id, data_frame)
+
     @override_settings(ONTASK_DATA_SUMMARY_CLASSES=[])
     @patch(f"{TASKS_MODULE_PATH}.log")
     def test_upload_dataframe_to_ontask_data_summary_classes_not_set(self, mock_log: Mock):
@@ -52,3 +228,384 @@ class TestUploadDataframeOnTaskTask(TestCase):
 
         mock_log.error.assert_called_with("Data summary class non.existent.path not found.")
         mock_merge_table.assert_not_called()
+
+    @override_settings(
+        ONTASK_SYNC_SHARDS=2,
+        ONTASK_DATA_SUMMARY_CLASSES=["platform_plugin_ontask.data_summary.backends.user.UserDataSummary"],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.chord")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_sharded(self, mock_merge_table: Mock, mock_chord: Mock):
+        """Test that a sharded sync computes each range of users in a task and merges them in the reducer."""
+        mock_merge_table.return_value = Mock(status_code=status.HTTP_200_OK, ok=True, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+        mock_merge_table.assert_not_called()
+        shard_signatures = list(mock_chord.call_args.args[0])
+        reducer_signature = mock_chord.return_value.call_args.args[0]
+        shard_data_frames = [compute_data_summaries_shard_task(*signature.args) for signature in shard_signatures]
+        merge_data_summary_shards_task(shard_data_frames, *reducer_signature.args)
+
+        self.assertEqual([len(signature.args[2]) for signature in shard_signatures], [2, 1])
+        self.assertEqual(
+            [merge_call.args[1]["user_id"] for merge_call in mock_merge_table.call_args_list],
+            [{0: 1, 1: 2}, {0: 3}],
+        )
+        self.assertIsNotNone(get_high_water_mark(self.course_id, self.workflow_id))
+        self.assertTrue(is_course_synced(self.course_id))
+
+    @override_settings(
+        ONTASK_SYNC_SHARDS=2,
+        ONTASK_DATA_SUMMARY_CLASSES=["platform_plugin_ontask.data_summary.backends.user.UserDataSummary"],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.delay")
+    @patch(f"{TASKS_MODULE_PATH}.chord")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_sharded_failure(self, mock_chord: Mock, mock_delay: Mock):
+        """Test that a failed shard finishes the sync job and releases the sync lock."""
+        request_sync(self.course_id)
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+        self.assertEqual(request_sync(self.course_id), SYNC_RUNNING)
+        reducer_signature = mock_chord.return_value.call_args.args[0]
+        errback = reducer_signature.options["link_error"][0]
+
+        fail_sharded_sync_task(Mock(id="shard-id"), ValueError("shard failed"), None, *errback.args, **errback.kwargs)
+        fail_sharded_sync_task(Mock(id="merge-id"), ValueError("merge failed"), None, *errback.args, **errback.kwargs)
+
+        job = SyncJob.get(self.course_id)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.record["errors"], ["ValueError('shard failed')"])
+        mock_delay.assert_called_once_with(self.course_id, self.workflow_id, self.api_auth_token, incremental=False)
+
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.delay")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_follow_up(self, mock_merge_table: Mock, mock_delay: Mock):
+        """Test that the requests received during a sync queue a single follow-up sync."""
+
+        def merge_table(*args):
+            """Request two syncs while the sync is running."""
+            request_sync(self.course_id)
+            request_sync(self.course_id)
+            return Mock(ok=True, text="response")
+
+        mock_merge_table.side_effect = merge_table
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        mock_delay.assert_called_once_with(self.course_id, self.workflow_id, self.api_auth_token, incremental=False)
+        mock_merge_table.side_effect = None
+        mock_merge_table.return_value = Mock(ok=True, text="response")
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+        mock_delay.assert_called_once()
+        self.assertEqual(request_sync(self.course_id), SYNC_QUEUED)
+
+    @override_settings(
+        ONTASK_UPLOAD_CHUNK_MODE="rows",
+        ONTASK_UPLOAD_CHUNK_SIZE=2,
+        ONTASK_DATA_SUMMARY_CLASSES=[
+            "platform_plugin_ontask.data_summary.backends.user.UserDataSummary",
+            "platform_plugin_ontask.data_summary.backends.tests.dummy.DummyDataSummary",
+        ],
+    )
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_job_progress(self, mock_merge_table: Mock):
+        """Test that the progress of each data summary is recorded in the sync job."""
+        mock_merge_table.side_effect = [
+            Mock(ok=True, status_code=status.HTTP_200_OK, text="response"),
+            Mock(ok=True, status_code=status.HTTP_200_OK, text="response"),
+            Mock(ok=False, status_code=status.HTTP_400_BAD_REQUEST, text="bad request"),
+        ]
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        job = SyncJob.get(self.course_id).to_dict()
+        self.assertEqual(job["status"], JOB_FAILED)
+        self.assertIsNotNone(job["elapsed_seconds"])
+        user_summary = job["summaries"]["UserDataSummary"]
+        self.assertEqual(
+            (user_summary["rows"], user_summary["columns"], user_summary["chunks_uploaded"]),
+            (3, 3, 2),
+        )
+        self.assertEqual(job["summaries"]["DummyDataSummary"]["chunks_failed"], 1)
+        self.assertEqual(job["summaries"]["DummyDataSummary"]["errors"], ["bad request"])
+
+    @override_settings(ONTASK_UPLOAD_CHUNK_MODE="rows", ONTASK_UPLOAD_CHUNK_SIZE=1)
+    @patch(f"{TASKS_MODULE_PATH}.refresh_sync")
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_refreshes_lock(self, mock_merge_table: Mock, mock_refresh_sync: Mock):
+        """Test that the sync lock is extended for each data summary and each uploaded chunk."""
+        mock_merge_table.return_value = Mock(ok=True, status_code=status.HTTP_200_OK, text="response")
+
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        self.assertEqual(mock_refresh_sync.call_count, 1 + mock_merge_table.call_count)
+        mock_refresh_sync.assert_called_with(self.course_id)
+
+    @patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+    @patch(f"{TASKS_MODULE_PATH}.log", Mock())
+    def test_upload_dataframe_to_ontask_job_error(self, mock_merge_table: Mock):
+        """Test that an error that stops the sync is recorded in the sync job."""
+        mock_merge_table.side_effect = ConnectionError("OnTask is down")
+
+        with self.assertRaises(ConnectionError):
+            upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+
+        job = SyncJob.get(self.course_id)
+        self.assertEqual(job.status, JOB_FAILED)
+        self.assertEqual(job.record["errors"], ["ConnectionError('OnTask is down')"])
+        mock_merge_table.side_effect = None
+        mock_merge_table.return_value = Mock(ok=True, text="response")
+        upload_dataframe_to_ontask_task(self.course_id, self.workflow_id, self.api_auth_token)
+        self.assertEqual(SyncJob.get(self.course_id).status, JOB_SUCCEEDED)
+
+
+@override_settings(ONTASK_DATA_SUMMARY_PROCESSES=3, ONTASK_DATA_SUMMARY_PROCESS_MIN_ROWS=4)
+class TestDataSummaryProcesses(SimpleTestCase):
+    """Tests for the data summaries computed in a process pool."""
+
+    def setUp(self) -> None:
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+        self.enrollments = [
+            EnrolledUser(user_id, f"user{user_id}@example.com", f"user{user_id}", True) for user_id in range(1, 21)
+        ]
+
+    @patch(f"{TASKS_MODULE_PATH}.get_course_outline")
+    def test_iter_data_summaries_in_processes(self, mock_get_course_outline: Mock):
+        """Test that the rows computed in the forked pool processes are concatenated in order."""
+        results = list(
+            iter_data_summaries(self.course_id, [ProcessDummyDataSummary, UserDataSummary], self.enrollments)
+        )
+
+        mock_get_course_outline.assert_called_once()
+        self.assertEqual([result.name for result in results], ["ProcessDummyDataSummary", "UserDataSummary"])
+        self.assertEqual(list(results[0].data_frame["user_id"].to_dict().values()), list(range(1, 21)))
+        pids = set(results[0].data_frame["pid"].to_dict().values())
+        self.assertEqual(len(pids), 3)
+        self.assertNotIn(os.getpid(), pids)
+        expected = UserDataSummary(self.course_id, self.enrollments).get_data_summary().to_dict()
+        self.assertEqual(results[1].data_frame.to_dict(), expected)
+        self.assertIsNone(tasks._process_inputs)  # pylint: disable=protected-access
+
+    @patch(f"{TASKS_MODULE_PATH}.log")
+    def test_other_threads(self, mock_log: Mock):
+        """Test that no processes are forked while other threads run."""
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            self.assertEqual(get_data_summary_processes(100), 1)
+        finally:
+            stop.set()
+            thread.join()
+
+        mock_log.debug.assert_called_once()
+
+    def test_processes_capped_by_rows(self):
+        """Test that each process computes at least the minimum rows."""
+        self.assertEqual(get_data_summary_processes(4), 1)
+        self.assertEqual(get_data_summary_processes(9), 3)
+        self.assertEqual(get_data_summary_processes(100), 3)
+
+    @patch(f"{TASKS_MODULE_PATH}.billiard.process.current_process", Mock(return_value=Mock(daemon=True)))
+    @patch(f"{TASKS_MODULE_PATH}.log")
+    def test_daemonic_worker(self, mock_log: Mock):
+        """Test that the data summaries are computed in a daemonic worker process."""
+        self.assertEqual(get_data_summary_processes(100), 1)
+        mock_log.debug.assert_called_once()
+
+        results = list(iter_data_summaries(self.course_id, [UserDataSummary], self.enrollments))
+
+        self.assertEqual(len(results[0].data_frame["user_id"]), 20)
+
+    @patch("platform_plugin_ontask.data_summary.backends.base.get_enrollment_snapshot")
+    def test_course_only_data_summary(self, mock_get_enrollment_snapshot: Mock):
+        """Test that a data summary initialized with only the course ID gets the enrollment snapshot."""
+        results = list(iter_data_summaries(self.course_id, [CourseOnlyDummyDataSummary], self.enrollments[:4]))
+
+        mock_get_enrollment_snapshot.assert_not_called()
+        self.assertEqual(results[0].data_frame["user_id"], {"0": 1, "1": 2, "2": 3, "3": 4})
+
+
+@override_settings(
+    ONTASK_PERIODIC_SYNC_INTERVAL=3600,
+    ONTASK_PERIODIC_SYNC_WINDOW=600,
+    ONTASK_PERIODIC_SYNC_MAX_SYNCS=2,
+)
+class TestSchedulePeriodicSyncsTask(SimpleTestCase):
+    """Tests for the schedule_periodic_syncs_task task."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.course_blocks = [
+            Mock(id=f"course-v1:edX+DemoX+{index}", other_course_settings={"ONTASK_WORKFLOW_ID": index})
+            for index in range(3)
+        ]
+
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.apply_async")
+    @patch(f"{TASKS_MODULE_PATH}.get_periodic_sync_course_blocks")
+    def test_schedule_periodic_syncs(self, mock_get_course_blocks: Mock, mock_apply_async: Mock):
+        """Test that at most the maximum syncs are queued, spread across the window."""
+        mock_get_course_blocks.return_value = self.course_blocks
+
+        schedule_periodic_syncs_task()
+
+        self.assertEqual(mock_apply_async.call_count, 2)
+        countdowns = []
+        for index, task_call in enumerate(mock_apply_async.call_args_list):
+            course_block = self.course_blocks[index]
+            self.assertEqual(
+                task_call.args,
+                ((course_block.id, index, "ontask-api-auth-token"), {"incremental": False, "periodic": True}),
+            )
+            countdowns.append(task_call.kwargs["countdown"])
+            self.assertIsNone(SyncJob.get(course_block.id))
+            self.assertEqual(request_sync(course_block.id), SYNC_QUEUED)
+            finish_sync(course_block.id)
+            self.assertIsNotNone(get_last_periodic_sync(course_block.id))
+        self.assertTrue(0 <= countdowns[0] < 300 <= countdowns[1] < 600)
+        self.assertIsNone(get_last_periodic_sync(self.course_blocks[2].id))
+
+        schedule_periodic_syncs_task()
+
+        self.assertEqual(mock_apply_async.call_count, 3)
+        self.assertEqual(mock_apply_async.call_args.args[0][0], self.course_blocks[2].id)
+
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.apply_async")
+    @patch(f"{TASKS_MODULE_PATH}.get_periodic_sync_course_blocks")
+    def test_schedule_periodic_syncs_coalesced(self, mock_get_course_blocks: Mock, mock_apply_async: Mock):
+        """Test that the periodic sync of a course with a sync in progress is coalesced with it."""
+        mock_get_course_blocks.return_value = self.course_blocks[:1]
+        request_sync(self.course_blocks[0].id)
+
+        schedule_periodic_syncs_task()
+
+        mock_apply_async.assert_not_called()
+        self.assertIsNotNone(get_last_periodic_sync(self.course_blocks[0].id))
+
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.apply_async")
+    @patch(f"{TASKS_MODULE_PATH}.get_periodic_sync_course_blocks")
+    def test_schedule_periodic_syncs_in_progress(self, mock_get_course_blocks: Mock, mock_apply_async: Mock):
+        """Test that the syncs still in progress count towards the maximum syncs."""
+        mock_get_course_blocks.return_value = self.course_blocks
+        set_last_periodic_sync(self.course_blocks[0].id, time.time())
+        try_start_sync(self.course_blocks[0].id)
+
+        schedule_periodic_syncs_task()
+
+        mock_apply_async.assert_called_once()
+        self.assertEqual(mock_apply_async.call_args.args[0][0], self.course_blocks[1].id)
+        self.assertIsNone(get_last_periodic_sync(self.course_blocks[2].id))
+
+    @patch(f"{TASKS_MODULE_PATH}.sync_course")
+    def test_periodic_sync_after_manual_request(self, mock_sync_course: Mock):
+        """Test that a manual request received before a periodic sync starts is queued and skips it."""
+        course_id = self.course_blocks[0].id
+
+        self.assertEqual(request_sync(course_id), SYNC_QUEUED)
+        upload_dataframe_to_ontask_task(course_id, 0, "ontask-api-auth-token", periodic=True)
+
+        mock_sync_course.assert_not_called()
+        self.assertEqual(request_sync(course_id), SYNC_COALESCED)
+
+    @patch(f"{TASKS_MODULE_PATH}.sync_course")
+    def test_periodic_sync_takes_lock(self, mock_sync_course: Mock):
+        """Test that a periodic sync holds the lock of the course while it runs."""
+        course_id = self.course_blocks[0].id
+        locked = []
+        mock_sync_course.side_effect = lambda *args: locked.append(is_sync_pending(course_id))
+
+        upload_dataframe_to_ontask_task(course_id, 0, "ontask-api-auth-token", periodic=True)
+
+        self.assertEqual(locked, [True])
+        self.assertFalse(is_sync_pending(course_id))
+
+    @patch(f"{TASKS_MODULE_PATH}.upload_dataframe_to_ontask_task.apply_async")
+    @patch(f"{TASKS_MODULE_PATH}.get_periodic_sync_course_blocks")
+    def test_schedule_periodic_syncs_queue_error(self, mock_get_course_blocks: Mock, mock_apply_async: Mock):
+        """Test that a sync that cannot be queued stays due."""
+        mock_get_course_blocks.return_value = self.course_blocks[:1]
+        mock_apply_async.side_effect = ConnectionError
+
+        with self.assertLogs(TASKS_MODULE_PATH, "ERROR"):
+            schedule_periodic_syncs_task()
+
+        self.assertEqual(request_sync(self.course_blocks[0].id), SYNC_QUEUED)
+        self.assertIsNone(get_last_periodic_sync(self.course_blocks[0].id))
+
+
+@override_settings(
+    ONTASK_DATA_SUMMARY_CLASSES=[
+        "platform_plugin_ontask.data_summary.backends.user.UserDataSummary",
+        "platform_plugin_ontask.data_summary.backends.tests.dummy.DummyDataSummary",
+    ],
+)
+@patch(f"{TASKS_MODULE_PATH}.get_course_block")
+@patch(f"{TASKS_MODULE_PATH}.OnTaskClient.merge_table")
+class TestFlushDirtyUsersTask(SimpleTestCase):
+    """Tests for the flush_dirty_users_task task."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+        self.workflow_id = 1
+        set_table_initialized(self.workflow_id)
+        with patch("platform_plugin_ontask.sync.time") as mock_time:
+            mock_time.time.return_value = 102
+            mark_user_dirty(self.course_id, 1)
+            mark_user_dirty(self.course_id, 3)
+
+    def test_flush_dirty_users(self, mock_merge_table: Mock, mock_get_course_block: Mock):
+        """Test that the rows of the buffered users are pushed in a single merge."""
+        mock_get_course_block.return_value.other_course_settings = {"ONTASK_WORKFLOW_ID": self.workflow_id}
+        mock_merge_table.return_value = Mock(ok=True, status_code=status.HTTP_200_OK)
+
+        flush_dirty_users_task(self.course_id, 20)
+
+        mock_merge_table.assert_called_once()
+        workflow_id, data_frame = mock_merge_table.call_args.args
+        self.assertEqual(workflow_id, self.workflow_id)
+        self.assertEqual(data_frame["user_id"], {0: 1, 1: 3})
+        self.assertEqual(data_frame["username"], {0: "john_doe", 1: "user3"})
+        self.assertEqual(data_frame["block_id_e1d8b56763fe48fbb935f9619220ab53_dummy"], {0: True})
+        self.assertEqual(pop_dirty_users(self.course_id, 20), set())
+
+    @patch(f"{TASKS_MODULE_PATH}.iter_data_summaries")
+    @patch(f"{TASKS_MODULE_PATH}.get_enrollment_snapshot", Mock(return_value=[]))
+    def test_flush_dirty_users_not_enrolled(
+        self, mock_iter_data_summaries: Mock, mock_merge_table: Mock, mock_get_course_block: Mock
+    ):
+        """Test that nothing is computed when none of the buffered users is enrolled."""
+        mock_get_course_block.return_value.other_course_settings = {"ONTASK_WORKFLOW_ID": self.workflow_id}
+
+        flush_dirty_users_task(self.course_id, 20)
+
+        mock_iter_data_summaries.assert_not_called()
+        mock_merge_table.assert_not_called()
+
+    def test_flush_dirty_users_without_workflow(self, mock_merge_table: Mock, mock_get_course_block: Mock):
+        """Test that the buffered users of a course without workflow are discarded."""
+        mock_get_course_block.return_value.other_course_settings = {}
+
+        flush_dirty_users_task(self.course_id, 20)
+
+        mock_merge_table.assert_not_called()
+        self.assertEqual(pop_dirty_users(self.course_id, 20), set())
+
+    def test_flush_dirty_users_table_not_synced(self, mock_merge_table: Mock, mock_get_course_block: Mock):
+        """Test that the buffered users are not pushed to a table that was never synced."""
+        mock_get_course_block.return_value.other_course_settings = {"ONTASK_WORKFLOW_ID": 2}
+
+        flush_dirty_users_task(self.course_id, 20)
+
+        mock_merge_table.assert_not_called()
+
+    def test_flush_dirty_users_empty(self, mock_merge_table: Mock, mock_get_course_block: Mock):
+        """Test that nothing is pushed when no user was buffered in the interval."""
+        flush_dirty_users_task(self.course_id, 21)
+
+        mock_merge_table.assert_not_called()
+        mock_get_course_block.assert_not_called()
@@ -0,0 +1,135 @@
+"""Tests for the vectorized builders of the data summary columns."""
+
+import random
+from unittest import skipIf
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+from opaque_keys.edx.keys import CourseKey
+
+from platform_plugin_ontask.data_summary.lookups import CompletionLookup, ScoreLookup
+from platform_plugin_ontask.data_summary.vectorized import (
+    allocate_matrix,
+    get_block_ids,
+    get_component_grade_columns,
+    get_unit_completion_columns,
+    is_vectorized_enabled,
+    numpy,
+    pandas,
+)
+
+LOOKUPS_MODULE_PATH = "platform_plugin_ontask.data_summary.lookups"
+VECTORIZED_MODULE_PATH = "platform_plugin_ontask.data_summary.vectorized"
+
+
+@skipIf(pandas is None, "pandas is not installed")
+@override_settings(ONTASK_DATA_SUMMARY_QUERY_CHUNK_SIZE=7)
+class TestVectorizedBuilders(SimpleTestCase):
+    """Tests that the vectorized builders match the bulk lookups."""
+
+    def setUp(self):
+        rng = random.Random(0)
+        self.course_key = CourseKey.from_string("course-v1:edX+DemoX+Demo_Course")
+        self.block_keys = [self.course_key.make_usage_key("problem", f"problem{index}") for index in range(12)]
+        leaf_keys = [str(block_key) for block_key in self.block_keys]
+        self.unit_leaf_keys = [leaf_keys[0:3], leaf_keys[3:4], [], leaf_keys[2:6], leaf_keys[6:11]]
+        self.user_ids = list(range(100, 150))
+        foreign_key = self.course_key.make_usage_key("problem", "foreign")
+        self.completions = [
+            (user_id, block_key)
+            for user_id in [*self.user_ids, 999]
+            for block_key in [*self.block_keys, foreign_key]
+            if rng.random() < 0.7
+        ]
+        self.grades = [
+            (user_id, block_key, rng.choice([0.0, 0.25, 1.0, None]))
+            for user_id, block_key in self.completions
+            if rng.random() < 0.5
+        ]
+
+    def get_rows(self, rows):
+        """Get a backend query mock that returns the rows of the given users."""
+        return Mock(side_effect=lambda course_key, user_ids: iter([row for row in rows if row[0] in user_ids]))
+
+    def test_get_unit_completion_columns(self):
+        """Test that the unit completion columns match the `CompletionLookup` checks."""
+        with patch(f"{LOOKUPS_MODULE_PATH}.get_block_completions", self.get_rows(self.completions)):
+            lookup = CompletionLookup(self.course_key, dict(enumerate(self.unit_leaf_keys))).load(self.user_ids)
+        with patch(f"{VECTORIZED_MODULE_PATH}.get_block_completions", self.get_rows(self.completions)):
+            columns = get_unit_completion_columns(self.course_key, self.user_ids, self.unit_leaf_keys)
+
+        self.assertEqual(
+            [list(column.to_dict().values()) for column in columns],
+            [
+                [lookup.vertical_is_complete(user_id, unit_index) for user_id in self.user_ids]
+                for unit_index in range(len(self.unit_leaf_keys))
+            ],
+        )
+        self.assertTrue(all(columns[2].to_dict().values()))
+
+    @patch(f"{VECTORIZED_MODULE_PATH}.completion_tracking_enabled", Mock(return_value=False))
+    def test_get_unit_completion_columns_tracking_disabled(self):
+        """Test that the units have no completion value when completion tracking is disabled."""
+        columns = get_unit_completion_columns(self.course_key, self.user_ids, self.unit_leaf_keys)
+
+        self.assertEqual(len(columns), len(self.unit_leaf_keys))
+        self.assertEqual(list(columns[0].to_dict().values()), [None] * len(self.user_ids))
+
+    def test_get_component_grade_columns(self):
+        """Test that the component grade columns match the `ScoreLookup` grades."""
+        component_keys = [str(block_key) for block_key in self.block_keys]
+        with patch(f"{LOOKUPS_MODULE_PATH}.get_student_module_grades", self.get_rows(self.grades)):
+            lookup = ScoreLookup(self.course_key, component_keys).load(self.user_ids)
+        with patch(f"{VECTORIZED_MODULE_PATH}.get_student_module_grades", self.get_rows(self.grades)):
+            columns = get_component_grade_columns(self.course_key, self.user_ids, component_keys)
+
+        self.assertEqual(
+            [list(column.to_dict().values()) for column in columns],
+            [
+                [lookup.get_grade(user_id, component_key) for user_id in self.user_ids]
+                for component_key in component_keys
+            ],
+        )
+
+    def test_no_users(self):
+        """Test that the columns of a course without users are empty."""
+        with patch(f"{VECTORIZED_MODULE_PATH}.get_block_completions", self.get_rows([])):
+            self.assertEqual(
+                [len(column) for column in get_unit_completion_columns(self.course_key, [], self.unit_leaf_keys)],
+                [0] * len(self.unit_leaf_keys),
+            )
+        self.assertEqual(list(get_component_grade_columns(self.course_key, [], [])), [])
+
+    def test_get_block_ids(self):
+        """Test that the block keys are identified by type and ID, or by their string form."""
+        self.assertEqual(list(get_block_ids(self.block_keys[:2])), ["problem@problem0", "problem@problem1"])
+        block_key = "block-v1:edX+DemoX+Demo_Course+type@html+block@intro"
+        self.assertEqual(list(get_block_ids([block_key])), [block_key])
+
+    @override_settings(ONTASK_DATA_SUMMARY_MEMORY_BUDGET=64)
+    def test_allocate_matrix(self):
+        """Test that the matrices over the memory budget are mapped to a spill file."""
+        self.assertNotIsInstance(allocate_matrix((2, 4), "float64"), numpy.memmap)
+        matrix = allocate_matrix((3, 4), "float64")
+        self.assertIsInstance(matrix, numpy.memmap)
+        self.assertFalse(matrix.any())
+
+    @override_settings(ONTASK_DATA_SUMMARY_MEMORY_BUDGET=0)
+    def test_spilled_matrices(self):
+        """Test that the columns built from spilled matrices are the same."""
+        with patch(f"{VECTORIZED_MODULE_PATH}.get_block_completions", self.get_rows(self.completions)):
+            spilled_columns = get_unit_completion_columns(self.course_key, self.user_ids, self.unit_leaf_keys)
+        with override_settings(ONTASK_DATA_SUMMARY_MEMORY_BUDGET=None), patch(
+            f"{VECTORIZED_MODULE_PATH}.get_block_completions", self.get_rows(self.completions)
+        ):
+            columns = get_unit_completion_columns(self.course_key, self.user_ids, self.unit_leaf_keys)
+
+        self.assertEqual(
+            [column.to_dict() for column in spilled_columns], [column.to_dict() for column in columns]
+        )
+
+    @override_settings(ONTASK_DATA_SUMMARY_VECTORIZED=False)
+    def test_vectorized_disabled(self):
+        """Test that the vectorized builders can be disabled."""
+        self.assertFalse(is_vectorized_enabled())
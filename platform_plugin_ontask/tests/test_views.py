@@ -2,12 +2,15 @@
 
 from unittest.mock import Mock, patch
 
+from django.core.cache import cache
 from django.test import override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 
-from platform_plugin_ontask.api.v1.views import OnTaskTableAPIView, OnTaskWorkflowAPIView
+from platform_plugin_ontask.api.v1.views import OnTaskSyncJobAPIView, OnTaskTableAPIView, OnTaskWorkflowAPIView
+from platform_plugin_ontask.jobs import SyncJob
+from platform_plugin_ontask.sync import is_table_initialized, start_sync
 
 VIEWS_MODULE_PATH = "platform_plugin_ontask.api.v1.views"
 UTILS_MODULE_PATH = "platform_plugin_ontask.api.utils"
@@ -57,6 +60,7 @@ class OnTaskWorkflowAPIViewTest(APITestCase):
         response = self.post_request()
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_table_initialized("new_workflow_id"))
 
     def test_create_workflow_invalid_course_key(self):
         """Test POST request for creating a new workflow with invalid course key."""
@@ -138,6 +142,7 @@ class OnTaskTableAPIViewTest(APITestCase):
     """Tests for the OnTaskTableAPIView."""
 
     def setUp(self):
+        cache.clear()
         self.factory = APIRequestFactory()
         self.view = OnTaskTableAPIView.as_view()
         self.url = reverse("api:v1:table")
@@ -169,6 +174,48 @@ class OnTaskTableAPIViewTest(APITestCase):
         response = self.put_request()
 
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"status": "queued"})
+        task_mock.assert_called_once()
+        self.assertEqual(SyncJob.get(self.course_id).status, "queued")
+
+    @task_patch
+    @modulestore_patch
+    def test_upload_dataframe_coalesced(self, modulestore_mock: Mock, task_mock: Mock):
+        """Test that a request is coalesced with the sync already queued for the course."""
+        modulestore_mock.return_value.get_course.return_value = self.course
+
+        self.put_request()
+        response = self.put_request()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"status": "coalesced"})
+        task_mock.assert_called_once()
+
+    @task_patch
+    @modulestore_patch
+    def test_upload_dataframe_running(self, modulestore_mock: Mock, task_mock: Mock):
+        """Test that a request received while a sync is running does not queue another one."""
+        modulestore_mock.return_value.get_course.return_value = self.course
+        start_sync(self.course_id)
+
+        response = self.put_request()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"status": "running"})
+        task_mock.assert_not_called()
+
+    @task_patch
+    @modulestore_patch
+    def test_upload_dataframe_queue_error(self, modulestore_mock: Mock, task_mock: Mock):
+        """Test that the sync lock is released if the task cannot be queued."""
+        modulestore_mock.return_value.get_course.return_value = self.course
+        task_mock.side_effect = [ConnectionError, None]
+
+        with self.assertRaises(ConnectionError):
+            self.put_request()
+        response = self.put_request()
+
+        self.assertEqual(response.data, {"status": "queued"})
 
     def test_upload_dataframe_invalid_course_key(self):
         """Test PUT request for uploading a dataframe with invalid course key."""
@@ -219,3 +266,51 @@ class OnTaskTableAPIViewTest(APITestCase):
             "The OnTask Workflow ID is not set for this course. Please set "
             "it in the Advanced Settings of the course.",
         )
+
+
+class OnTaskSyncJobAPIViewTest(APITestCase):
+    """Tests for the OnTaskSyncJobAPIView."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = APIRequestFactory()
+        self.view = OnTaskSyncJobAPIView.as_view()
+        self.url = reverse("api:v1:table-sync")
+
+        self.request_user = Mock()
+        self.request_user.is_staff = True
+
+        self.course_id = "course-v1:edX+DemoX+Demo_Course"
+
+    def get_request(self):
+        """Return a GET request."""
+        request = self.factory.get(self.url)
+        force_authenticate(request, user=self.request_user)
+        return self.view(request, course_id=self.course_id)
+
+    def test_get_sync_job(self):
+        """Test GET request for the progress of the sync of the course."""
+        job = SyncJob.create(self.course_id).start()
+        job.add_summary("UserDataSummary", rows=3, columns=3, seconds=0.5)
+
+        response = self.get_request()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "running")
+        self.assertEqual(response.data["summaries"]["UserDataSummary"]["rows"], 3)
+        self.assertGreaterEqual(response.data["elapsed_seconds"], 0)
+
+    def test_get_sync_job_not_found(self):
+        """Test GET request for a course that was never synced."""
+        response = self.get_request()
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_get_sync_job_invalid_course_key(self):
+        """Test GET request with invalid course key."""
+        self.course_id = "invalid_course_key"
+
+        response = self.get_request()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["error"], "The course key is not valid.")
@@ -132,6 +132,11 @@ setup(
     ),
     include_package_data=True,
     install_requires=load_requirements("requirements/base.in"),
+    extras_require={
+        "orjson": ["orjson"],
+        "vectorized": ["numpy", "pandas>=1.5"],
+        "zstd": ["zstandard"],
+    },
     python_requires=">=3.8",
     license="AGPL 3.0",
     zip_safe=False,
@@ -0,0 +1,353 @@
+"""
+Local stand-in for the OnTask workflow and table API.
+
+The server implements the endpoints used by `OnTaskClient`:
+
+* `POST /workflow/workflows/` creates a workflow with an empty table.
+* `PUT /table/{id}/ops/` replaces the table of a workflow.
+* `PUT /table/{id}/merge/` merges a data frame in the table of a workflow on
+  `user_id`, and fails with the "non-empty table" 400 error of OnTask if the
+  table is empty.
+
+It accepts plain, chunked, gzip or zstd encoded bodies, keeps the columns and
+user IDs of each table, and a record of each request with its size, so the
+uploads can be tested, load-tested and measured without a live OnTask. The
+latency of the responses and the errors returned can be configured, to test
+the retries and throughput of the client.
+
+Example usage:
+
+```python
+
+with OnTaskServer(latency=0.05) as server:
+    workflow_id = server.create_workflow("course-v1:edX+DemoX+Demo_Course")
+    server.inject_error(503, path="/merge/")
+    OnTaskClient(server.url, "api-key").merge_table_in_chunks(workflow_id, data_frame)
+    server.get_stats()
+
+```
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+MERGE_COLUMN = "user_id"
+NON_EMPTY_TABLE_ERROR = "Unable to perform the merge operation: the workflow requires a non-empty table."
+WORKFLOWS_PATH = re.compile(r"^/workflow/workflows/$")
+TABLE_PATH = re.compile(r"^/table/(?P<workflow_id>\d+)/(?P<operation>ops|merge)/$")
+
+
+@dataclass
+class RecordedRequest:
+    """A request received by the `OnTaskServer`."""
+
+    method: str
+    path: str
+    headers: dict
+    wire_size: int
+    body_size: int
+    payload: dict | None = field(repr=False)
+    status: int = 200
+
+
+@dataclass
+class OnTaskTable:
+    """Columns and user IDs of the table of a workflow."""
+
+    name: str
+    columns: set = field(default_factory=set)
+    user_ids: set = field(default_factory=set)
+
+
+@dataclass
+class InjectedError:
+    """An error response returned instead of handling the matching requests."""
+
+    status: int
+    body: dict
+    path: str | None
+    count: int
+
+
+def decode_body(body: bytes, content_encoding: str | None) -> bytes:
+    """
+    Decode a request body with its `Content-Encoding`.
+
+    Args:
+        body (bytes): The body as received.
+        content_encoding (str, optional): The `Content-Encoding` header.
+
+    Returns:
+        bytes: The decoded body.
+    """
+    if content_encoding == "gzip":
+        return gzip.decompress(body)
+    if content_encoding == "zstd":
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+class OnTaskRequestHandler(BaseHTTPRequestHandler):
+    """Request handler of the `OnTaskServer`."""
+
+    protocol_version = "HTTP/1.1"
+
+    def read_body(self) -> bytes:
+        """
+        Read the request body, with or without chunked transfer encoding.
+
+        Returns:
+            bytes: The body as received, without the chunk framing.
+        """
+        if self.headers.get("Transfer-Encoding", "").lower() != "chunked":
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                self.rfile.readline()
+                return b"".join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def handle_request(self) -> None:
+        """Record the request, wait for the latency and send the response."""
+        body = self.read_body()
+        decoded_body = decode_body(body, self.headers.get("Content-Encoding"))
+        payload = json.loads(decoded_body) if decoded_body else None
+        status, response_body = self.server.handle_api_request(self.command, self.path, payload)
+        self.server.record_request(
+            RecordedRequest(
+                method=self.command,
+                path=self.path,
+                headers=dict(self.headers),
+                wire_size=len(body),
+                body_size=len(decoded_body),
+                payload=payload if self.server.keep_payloads else None,
+                status=status,
+            )
+        )
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        content = json.dumps(response_body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    do_POST = do_PUT = handle_request
+
+    def log_message(self, *args):
+        """Do not log the requests."""
+
+
+class OnTaskServer(ThreadingHTTPServer):
+    """
+    OnTask API stand-in, served from a background thread.
+
+    Attributes:
+        requests (list[RecordedRequest]): The requests received.
+        tables (dict[int, OnTaskTable]): The table of each workflow.
+        latency (float): Seconds to wait before each response.
+        error_rate (float): Share of the table requests that fail with a 503
+            error, chosen at random.
+        keep_payloads (bool): Whether to keep the decoded payload of each
+            request, disable it for load tests.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency: float = 0,
+        error_rate: float = 0,
+        keep_payloads: bool = True,
+        seed: int = 0,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            host (str): The host to listen on.
+            port (int): The port to listen on, a free one by default.
+            latency (float): Seconds to wait before each response.
+            error_rate (float): Share of the table requests that fail with a
+                503 error.
+            keep_payloads (bool): Whether to keep the payload of each request.
+            seed (int): The random seed of the failed requests.
+        """
+        super().__init__((host, port), OnTaskRequestHandler)
+        self.requests = []
+        self.tables = {}
+        self.latency = latency
+        self.error_rate = error_rate
+        self.keep_payloads = keep_payloads
+        self.injected_errors = []
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server."""
+        return f"http://{self.server_address[0]}:{self.server_port}"
+
+    def create_workflow(self, name: str = "", user_ids=(), columns=()) -> int:
+        """
+        Create a workflow, with an empty table unless user IDs are given.
+
+        Args:
+            name (str): The workflow name.
+            user_ids (Iterable[int]): The user IDs of the table.
+            columns (Iterable[str]): The columns of the table besides `user_id`.
+
+        Returns:
+            int: The workflow ID.
+        """
+        with self.lock:
+            workflow_id = len(self.tables) + 1
+            table = self.tables[workflow_id] = OnTaskTable(name, user_ids=set(user_ids))
+            if table.user_ids:
+                table.columns.update((MERGE_COLUMN, *columns))
+        return workflow_id
+
+    def inject_error(self, status: int, body: dict | None = None, *, path: str | None = None, count: int = 1) -> None:
+        """
+        Fail the next requests with an error response.
+
+        Args:
+            status (int): The status code.
+            body (dict, optional): The JSON body. Defaults to `{"detail": "Error"}`.
+            path (str, optional): Only fail the requests whose path contains it.
+            count (int): The number of requests to fail.
+        """
+        with self.lock:
+            self.injected_errors.append(InjectedError(status, body or {"detail": "Error"}, path, count))
+
+    def inject_empty_table_error(self, count: int = 1) -> None:
+        """
+        Fail the next merges with the "non-empty table" 400 error of OnTask.
+
+        Args:
+            count (int): The number of merges to fail.
+        """
+        self.inject_error(400, {"detail": NON_EMPTY_TABLE_ERROR}, path="/merge/", count=count)
+
+    def pop_injected_error(self, path: str) -> InjectedError | None:
+        """
+        Get the first injected error that matches a request path, if any.
+
+        Args:
+            path (str): The request path.
+
+        Returns:
+            InjectedError | None: The error, or None to handle the request.
+        """
+        for injected_error in self.injected_errors:
+            if injected_error.path is None or injected_error.path in path:
+                injected_error.count -= 1
+                if injected_error.count <= 0:
+                    self.injected_errors.remove(injected_error)
+                return injected_error
+        return None
+
+    def handle_api_request(self, method: str, path: str, payload: dict | None) -> tuple[int, dict]:
+        """
+        Handle an API request.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The request path.
+            payload (dict, optional): The decoded JSON payload.
+
+        Returns:
+            tuple[int, dict]: The status code and JSON body of the response.
+        """
+        with self.lock:
+            injected_error = self.pop_injected_error(path)
+            if injected_error is not None:
+                return injected_error.status, injected_error.body
+
+            table_path = TABLE_PATH.match(path)
+            if method == "POST" and WORKFLOWS_PATH.match(path):
+                workflow_id = len(self.tables) + 1
+                name = (payload or {}).get("name", "")
+                self.tables[workflow_id] = OnTaskTable(name)
+                return 201, {"id": workflow_id, "name": name}
+            if method != "PUT" or table_path is None:
+                return 404, {"detail": "Not found."}
+
+            table = self.tables.get(int(table_path["workflow_id"]))
+            if table is None:
+                return 404, {"detail": "Not found."}
+            if self.error_rate and self.random.random() < self.error_rate:
+                return 503, {"detail": "Service unavailable."}
+
+            if table_path["operation"] == "ops":
+                data_frame = (payload or {}).get("data_frame") or {}
+                table.columns = set(data_frame)
+                table.user_ids = set(data_frame.get(MERGE_COLUMN, {}).values())
+            else:
+                if not table.user_ids:
+                    return 400, {"detail": NON_EMPTY_TABLE_ERROR}
+                data_frame = (payload or {}).get("src_df") or {}
+                table.columns.update(data_frame)
+                table.user_ids.update(data_frame.get(MERGE_COLUMN, {}).values())
+            return 201, {"columns": len(table.columns), "rows": len(table.user_ids)}
+
+    def record_request(self, request: RecordedRequest) -> None:
+        """
+        Keep the record of a request.
+
+        Args:
+            request (RecordedRequest): The request.
+        """
+        with self.lock:
+            self.requests.append(request)
+
+    def get_stats(self) -> dict:
+        """
+        Get the totals of the requests received.
+
+        Returns:
+            dict: The number of requests, of failed requests and of requests of
+                each path, and the bytes received as sent and once decoded.
+        """
+        with self.lock:
+            requests = list(self.requests)
+        paths = {}
+        for request in requests:
+            paths[request.path] = paths.get(request.path, 0) + 1
+        return {
+            "requests": len(requests),
+            "failed_requests": sum(request.status >= 400 for request in requests),
+            "paths": paths,
+            "wire_bytes": sum(request.wire_size for request in requests),
+            "body_bytes": sum(request.body_size for request in requests),
+        }
+
+    def __enter__(self) -> OnTaskServer:
+        """Start serving from a background thread."""
+        threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()